@@ -1,91 +1,93 @@
 from .core import globals as mnsGlobals
-import os
+import os, time
 
 if mnsGlobals.GLOB_pyVer > 2:
 	from importlib import reload
 
-reload(mnsGlobals)
-
-from .core import prefixSuffix
-reload(prefixSuffix)
-from .core import string as mnsString
-reload(mnsString)
-from .core import arguments as mnsArgs
-reload(mnsArgs)
-from .core import meshUtility as mnsMeshUtils
-reload(mnsMeshUtils)
-from .core import log as mnsLog
-reload(mnsLog)
-from .core import utility as mnsUtils
-reload(mnsUtils)
-from .core import UIUtils as mnsUIUtils
-reload(mnsUIUtils)
-from .core import skinUtility as mnsSkinUtils
-reload(mnsSkinUtils)
-from .core import nodes as mnsNodes
-reload(mnsNodes)
-from .globalUtils import defSearch as mnsDefSearch
-reload(mnsDefSearch)
-from .globalUtils import dynUI as mnsDynUI
-reload(mnsDynUI)
-#from . import block as mnsBlock
-#reload(mnsBlock)
-from .block.core import buildModules as mnsBuildModules
-reload(mnsBuildModules)
-from .block import blockBuildUI as blkUI
-reload(blkUI)
-from .block.core import controlShapes as blkCtrlShps
-reload(blkCtrlShps)
-from .block.core import blockUtility as blkUtils
-reload(blkUtils)
-from .block.picker2 import picker2 as mnsPicker
-reload(mnsPicker)
-from .block.picker2 import plgSettings as mnsPlgSettings
-reload(mnsPlgSettings)
-from .preferences import preferences as mnsPreferences
-reload(mnsPreferences)
-from . import mnsMayaMenu as mnsMayaMenu
-reload(mnsMayaMenu)
-from .block.moduleVisUI import moduleVisUI as mnsModuleVisUI
-reload(mnsModuleVisUI)
-from .block.cnsTool import cnsTool as mnsCnsTool
-reload(mnsCnsTool)
-from .block.characterDefenition import characterDefenitionUI as mnsCharDef
-reload(mnsCharDef)
-from .block.springTool import mnsSpringTool
-reload(mnsSpringTool)
-from .block.spacesTool import mnsSpacesTool
-reload(mnsSpacesTool)
-from .block.LODsTool import LODsTool as mnsLODsTool
-reload(mnsLODsTool)
-from .block.modulePresetEditor import modulePresetEditor as mnsModulePresetEditor
-reload(mnsModulePresetEditor)
-from .globalUtils import facialMocap as mnsFacialMocap
-reload(mnsFacialMocap)
-from .globalUtils.facialMocap import facialMocapUtils as mnsFacialMocapUtils
-reload(mnsFacialMocapUtils)
-from .globalUtils.animationExporter import mnsAnimationExporter as mnsAnimExporter
-reload(mnsAnimExporter)
-from .globalUtils.jointRadiusTool import mnsJointRadiusTool
-reload(mnsJointRadiusTool)
-from .gui import gui as mnsGui
-reload(mnsGui)
-
-reload(mnsJointRadiusTool)
+from .core import lazyLoader as mnsLazyLoader
+
+#module reloading is only done in dev mode (MNS_DEV_MODE environment variable), or upon an explicit library reload request (mnsUtils.reloadLib)
+mnsReloadModules = mnsGlobals.GLOB_mnsDevMode or mnsLazyLoader.reloadRequested
+mnsLazyLoader.reloadRequested = False
+mnsStartTime = time.time()
+
+if mnsReloadModules: reload(mnsGlobals)
+
+def mnsLoadCore(moduleName):
+	#return; module
+	return mnsLazyLoader.loadModule(__name__ + "." + moduleName, mnsReloadModules)
+
+def mnsLazy(moduleName):
+	#return; MnsLazyModule
+	return mnsLazyLoader.MnsLazyModule(__name__ + "." + moduleName, mnsReloadModules)
+
+#core- loaded eagerly
+prefixSuffix = mnsLoadCore("core.prefixSuffix")
+mnsString = mnsLoadCore("core.string")
+mnsArgs = mnsLoadCore("core.arguments")
+mnsMeshUtils = mnsLoadCore("core.meshUtility")
+mnsAnimUtils = mnsLoadCore("core.animUtility")
+mnsLog = mnsLoadCore("core.log")
+mnsUtils = mnsLoadCore("core.utility")
+mnsUIUtils = mnsLoadCore("core.UIUtils")
+mnsSkinUtils = mnsLoadCore("core.skinUtility")
+mnsNodes = mnsLoadCore("core.nodes")
+
+#tools- loaded upon first use
+mnsBSFormat = mnsLazy("core.bsFormat")
+mnsDefSearch = mnsLazy("globalUtils.defSearch")
+mnsDefIndex = mnsLazy("globalUtils.defSearch.defIndex")
+mnsDynUI = mnsLazy("globalUtils.dynUI")
+mnsBuildModules = mnsLazy("block.core.buildModules")
+blkUI = mnsLazy("block.blockBuildUI")
+blkCtrlShps = mnsLazy("block.core.controlShapes")
+blkUtils = mnsLazy("block.core.blockUtility")
+mnsModuleCatalog = mnsLazy("block.core.moduleCatalog")
+mnsPicker = mnsLazy("block.picker2.picker2")
+mnsPlgSettings = mnsLazy("block.picker2.plgSettings")
+mnsPreferences = mnsLazy("preferences.preferences")
+mnsMayaMenu = mnsLazy("mnsMayaMenu")
+mnsModuleVisUI = mnsLazy("block.moduleVisUI.moduleVisUI")
+mnsCnsTool = mnsLazy("block.cnsTool.cnsTool")
+mnsCharDef = mnsLazy("block.characterDefenition.characterDefenitionUI")
+mnsSpringTool = mnsLazy("block.springTool.mnsSpringTool")
+mnsSpacesTool = mnsLazy("block.spacesTool.mnsSpacesTool")
+mnsLODsTool = mnsLazy("block.LODsTool.LODsTool")
+mnsModulePresetEditor = mnsLazy("block.modulePresetEditor.modulePresetEditor")
+mnsFacialMocap = mnsLazy("globalUtils.facialMocap")
+mnsPoseBlendEvaluator = mnsLazy("globalUtils.facialMocap.poseBlendEvaluator")
+mnsMocapTakeReader = mnsLazy("globalUtils.facialMocap.mocapTakeReader")
+mnsFMDFormat = mnsLazy("globalUtils.facialMocap.fmdFormat")
+mnsFacialMocapUtils = mnsLazy("globalUtils.facialMocap.facialMocapUtils")
+mnsAnimExporter = mnsLazy("globalUtils.animationExporter.mnsAnimationExporter")
+mnsJointRadiusTool = mnsLazy("globalUtils.jointRadiusTool.mnsJointRadiusTool")
+mnsGui = mnsLazy("gui.gui")
 
 mnsUtils.updateMansurPrefs()
-mnsUIUtils.readGuiStyle()
 
 from maya import cmds
-if int(cmds.about(version = True)) > 2024:
-	from PySide6 import QtGui
-else:
-	from PySide2 import QtGui
-
-fontsDir = os.path.dirname(__file__) + "/gui/fonts/"
-for font in os.listdir(fontsDir):
-	fontDir = fontsDir + font
-	QtGui.QFontDatabase.addApplicationFont(fontDir)
-
-from maya import mel
-mel.eval("help -popupMode true;windowPref -saveMainWindowState startupMainWindowState;")
\ No newline at end of file
+if not cmds.about(batch = True):
+	mnsUIUtils.readGuiStyle()
+
+	if int(cmds.about(version = True)) > 2024:
+		from PySide6 import QtGui
+	else:
+		from PySide2 import QtGui
+
+	fontsDir = os.path.dirname(__file__) + "/gui/fonts/"
+	for font in os.listdir(fontsDir):
+		fontDir = fontsDir + font
+		QtGui.QFontDatabase.addApplicationFont(fontDir)
+
+	from maya import mel
+	mel.eval("help -popupMode true;windowPref -saveMainWindowState startupMainWindowState;")
+
+mnsLazyLoader.startupTime = time.time() - mnsStartTime
+if mnsGlobals.GLOB_mnsDevMode: mnsLog.log(mnsLazyLoader.getLoadReport(), svr = 1)
+
+def startupReport():
+	"""Return the startup-time report- the package's startup time, and the load time of every module loaded so far (eager and lazy).
+	"""
+
+	#return; string (report)
+	return mnsLazyLoader.getLoadReport()
@@ -43,6 +43,7 @@ from .characterDefenition import characterDefenitionUI as mnsCharDef
 from .core import buildModules as mnsBuildModules
 from .core import controlShapes as blkCtrlShps
 from .core import blockUtility as blkUtils
+from .core import moduleCatalog as mnsModuleCatalog
 from ..core.globals import *
 
 #Qt dependencies
@@ -416,8 +417,8 @@ class MnsBlockBuildUI(form_class, base_class):
 		self.bodyFacialTgl_btn.released.connect(blkUtils.togglePickerCtrlBodyFacial)
 		self.matchTranslate_btn.released.connect(self.plgMatch)
 		self.matchScale_btn.released.connect(self.plgMatch)
-		self.exportPickerData_btn.released.connect(lambda: blkUtils.exportPickerData(mode = self.getPickerExportMode()))
-		self.importPickerData_btn.released.connect(blkUtils.importPickerData)
+		self.exportPickerData_btn.released.connect(lambda: blkUtils.exportPickerData(mode = self.getPickerExportMode(), progressBar = self.constructProg_pb))
+		self.importPickerData_btn.released.connect(lambda: blkUtils.importPickerData(progressBar = self.constructProg_pb))
 
 		## Mocap Tab ##
 		self.createOffsetRig_btn.released.connect(blkUtils.createOffsetSkeleton)
@@ -566,26 +567,22 @@ class MnsBlockBuildUI(form_class, base_class):
 		"""Define build module tabs, based on the collected valid build-modules directories.
 		If the directory in question is a valid directory for build modules:
 		for every folder containing modules within it, a new tab will be inserted and named based on it.
+		The modules are read from the module catalog, which is cached locally and only updated for changed directories (see moduleCatalog).
 		"""
 		mnsLog.log("BLOCK - initializing build modules UI", svr = 0)
 
 		self.bmLib = {}
-		moduleParentPaths = [dirname(__file__) + "/modules"] #+ self.gatherAdditionalModulePaths()
-
-		for path in moduleParentPaths:
-			if GLOB_moduleDirectoryFlag in os.listdir(path):
-				for name in os.listdir(path):
-					fullPath = path + "/" + name
-					if os.path.isdir(fullPath):
-						modDir = fullPath.replace("\\", "/")
-						listWidget = mnsUIUtils.buildStackedTabForModuleParentDir(name, self.tabIndex, self.moduleBtnsWidget)
-						self.bmCategory_cb.addItem(name)
-						self.tabIndex += 1
-						self.buildModulesDefine(modDir, listWidget)
-						listWidget.itemDoubleClicked.connect(self.moduleBuildGuide)
-				self.createAllModulesSection()
-			else:
-				mnsLog.log("The module path specefied - \'" + fullPath + "\' isn't an mns module directory. Skipping.", svr = 2)
+		moduleParentPaths = [dirname(__file__) + "/modules"] + self.initializeAdditionalModulePaths(query = True)
+
+		catalogData = mnsModuleCatalog.updateModuleCatalog(moduleParentPaths)
+		for parentPath, groups in catalogData:
+			for name, moduleEntries in groups:
+				listWidget = mnsUIUtils.buildStackedTabForModuleParentDir(name, self.tabIndex, self.moduleBtnsWidget)
+				self.bmCategory_cb.addItem(name)
+				self.tabIndex += 1
+				self.buildModulesDefine(parentPath + "/" + name, listWidget, moduleEntries = moduleEntries)
+				listWidget.itemDoubleClicked.connect(self.moduleBuildGuide)
+		if catalogData: self.createAllModulesSection()
 
 		self.bmCategory_cb.currentIndexChanged.connect(self.bmCategoryChangedTrigger)
 
@@ -622,57 +619,38 @@ class MnsBlockBuildUI(form_class, base_class):
 	def getToolTipForModule(self, buildModule):
 		formattedTooltip = "Module description wasn't created."
 		fullPath = buildModule.path + "/" + buildModule.moduleName + ".py"
-		if os.path.isfile(fullPath):
-			headerLines = mnsUtils.extractHeaderFromPath(fullPath)
-
-			author = ""
-			components = ""
-			synopsis = []
-
-			for line in headerLines:
-				if "Author: " in line: author = line.split(": ")[-1]
-				elif "Best used for: " in line: components = line.split(": ")[-1]
-				else:
-					synopsis.append(line)
-
-			if author or components or synopsis:
-				formattedTooltip = "<html><body><font size = 4><table width = 500>"
-				formattedTooltip += "<tr><td><b>Author:</b><td></tr>"
-				formattedTooltip += "<tr><td>" + author + "</td></tr>"
-				formattedTooltip += "<tr></tr>"
-				formattedTooltip += "<tr><td><b>Best For Components:</b><td></tr>"
-				formattedTooltip += "<tr><td>" + components + "</tr></td>"
-				formattedTooltip += "<tr></tr>"
-				formattedTooltip += "<tr><td><b>Synopsis:</b><td></tr>"
-				for line in synopsis: formattedTooltip += "<tr><td>" + line + "</tr></td>"
-				formattedTooltip += "</table></font></body></html>"
+		if os.path.isfile(fullPath): formattedTooltip = mnsModuleCatalog.formatModuleToolTip(mnsUtils.extractHeaderFromPath(fullPath))
 		
 		self.bmToolTips[buildModule.moduleName] = formattedTooltip
 		return formattedTooltip
 
-	def buildModulesDefine(self, modParentPath, listWidget):
+	def buildModulesDefine(self, modParentPath, listWidget, **kwargs):
 		"""Define all existing build-modules within a built tab's directory.
 		This mehthod will run for every valid build-module's directory folder, essentially building the actual build-module button in the UI.
 		These will all be stored in the 'buildModulesBtns' attribute of this class.
 		"""
 
+		moduleEntries = kwargs.get("moduleEntries", None) #arg; comment = module catalog entries for this directory. When not passed, the directory is read directly.
+
 		mnsLog.logCurrentFrame()
-		modules = [os.path.join(modParentPath, name).replace("\\", "/") for name in os.listdir(modParentPath) if os.path.isdir(os.path.join(modParentPath, name))]
+		if moduleEntries is None:
+			moduleEntries = [mnsModuleCatalog.buildModuleEntry(os.path.join(modParentPath, name).replace("\\", "/")) for name in os.listdir(modParentPath) if os.path.isdir(os.path.join(modParentPath, name))]
 		
+		boldFont=QtGui.QFont()
+		boldFont.setPixelSize(11)
+		icons = {}
+
 		k = 0
-		for mod in modules:
-			bm = mnsBuildModules.MnsBuildModuleBtn(mod)
+		for moduleEntry in moduleEntries:
+			bm = mnsBuildModules.MnsBuildModuleBtn(moduleEntry["path"], catalogEntry = moduleEntry)
 			addedItem = QtWidgets.QListWidgetItem(bm.moduleName, listWidget)
-			
-			boldFont=QtGui.QFont()
-			boldFont.setPixelSize(11)
 			addedItem.setFont(boldFont)
 
-			iconPath = GLOB_guiIconsDir + "/general/module.png"
-			icon = QtGui.QIcon(QtGui.QPixmap(iconPath))
-			addedItem.setIcon(icon)
+			if moduleEntry["icon"] not in icons: icons[moduleEntry["icon"]] = QtGui.QIcon(QtGui.QPixmap(moduleEntry["icon"]))
+			addedItem.setIcon(icons[moduleEntry["icon"]])
 			addedItem.setSizeHint(QtCore.QSize(60,22))
-			addedItem.setToolTip(self.getToolTipForModule(bm))
+			addedItem.setToolTip(moduleEntry["toolTip"])
+			self.bmToolTips[bm.moduleName] = moduleEntry["toolTip"]
 
 			if (k % 2) != 0: addedItem.setBackground(QtGui.QColor("#393939"))
 			self.bmLib.update({bm.moduleName: bm})
@@ -1148,6 +1126,7 @@ class MnsBlockBuildUI(form_class, base_class):
 		for settingsHolder in settingsHolders:
 			settingsHolder = mnsUtils.validateNameStd(settingsHolder).node
 			
+			blobSettings = {}
 			for attr in sorted(kwargs.keys()):
 				if settingsHolder.hasAttr(attr):
 					if "channelControl".lower() in attr.lower() and not attr in convertedChannelControlAttrs:
@@ -1161,6 +1140,7 @@ class MnsBlockBuildUI(form_class, base_class):
 								settingsHolder.attr(attr).setLocked(False)
 								pm.deleteAttr( settingsHolder + "." + attr)
 								mnsUtils.addAttrToObj(settingsHolder, name = attr , type = type(kwargs[attr]), value = kwargs[attr], locked = True, cb = False, keyable = False)
+								blobSettings[attr] = kwargs[attr]
 								if "colorScheme".lower() in attr.lower():
 									blkUtils.setgCtrlColorForRigTop(kwargs["rigTop"])
 								if "colOverride" in kwargs:
@@ -1172,12 +1152,14 @@ class MnsBlockBuildUI(form_class, base_class):
 								pm.deleteAttr( settingsHolder + "." + attr)
 								attrValue = mnsArgs.convertChannelControlDictToAttr(kwargs[attr])
 								mnsUtils.addAttrToObj(settingsHolder, name = attr , type = type(attrValue), value = attrValue, locked = True, cb = False, keyable = False)
+								blobSettings[attr] = kwargs[attr]
 						elif attr.lower() == "spaces" or (attr in origArgsPairing and origArgsPairing[attr].multiRowList) or (isRigSettings and attr == "preDefinedCnsCtrls"):
 							oldVals = mnsUtils.splitEnumToStringList(attr, settingsHolder)
 							if oldVals != kwargs[attr]:
 								settingsHolder.attr(attr).setLocked(False)
 								pm.deleteAttr( settingsHolder + "." + attr)
 								mnsUtils.addAttrToObj(settingsHolder, name = attr , type = type(kwargs[attr]), value = kwargs[attr], locked = True, cb = False, keyable = False)
+								blobSettings[attr] = kwargs[attr]
 						else:
 							locked = False
 							if settingsHolder.attr(attr).isLocked(): locked = True
@@ -1185,6 +1167,9 @@ class MnsBlockBuildUI(form_class, base_class):
 							settingsHolder.attr(attr).set(kwargs[attr])
 							if locked: settingsHolder.attr(attr).setLocked(True)
 
+			#typed settings blob
+			blkUtils.storeSettingsInBlob(settingsHolder, blobSettings)
+
 			#attr Host
 			status, doAttributeHostCtrl = mnsUtils.validateAttrAndGet(settingsHolder, "doAttributeHostCtrl", False)
 			customGuides = blkUtils.getModuleDecendentsWildcard(settingsHolder, customGuidesOnly = True)
@@ -15,6 +15,7 @@ import pymel.core as pm
 from inspect import getmembers, isfunction
 from maya import cmds
 import maya.mel as mel
+import maya.OpenMaya as OpenMaya
 
 #mns dependencies
 from ...core.prefixSuffix import *
@@ -23,6 +24,7 @@ from ...core import utility as mnsUtils
 from ...core import UIUtils as mnsUIUtils
 from ...core import log as mnsLog
 from ...core import nodes as mnsNodes
+from ...core import animUtility as mnsAnimUtils
 from ...core import meshUtility as mnsMeshUtils
 from . import controlShapes as blkCtrlShps
 mansur = __import__(__name__.split('.')[0])
@@ -295,27 +297,78 @@ def getSettings(settingsPath, node, blkType):
 	#return;list (optionalArgumentsFromFile), string (current side place holder)
 	return optArgsFromFile, sidePlaceHolder
 
+def getSettingEncodingType(settingName = "", multiRowList = False):
+	"""Return the encoding type for the given setting, for settings stored as enum attributes.
+	Returns None for natively stored (scalar) settings.
+	"""
+
+	if "colorScheme".lower() in settingName.lower() or "schemeOverride".lower() in settingName.lower(): return "colorScheme"
+	elif "channelControl".lower() in settingName.lower(): return "channelControl"
+	elif settingName.lower() == "spaces" or multiRowList: return "list"
+	
+	#return;string (encoding type)
+	return None
+
+def getEnumEncodedSetting(settingName, node, encodingType):
+	"""Read and decode an enum encoded setting from the given node, based on the encoding type.
+	"""
+
+	if encodingType == "colorScheme": return mnsUtils.splitEnumAttrToColorSchemeFloatTupleList(settingName, node)
+	elif encodingType == "channelControl": return mnsUtils.splitEnumAttrToChannelControlList(settingName, node)
+	
+	#return;list/dict (decoded setting value)
+	return mnsUtils.splitEnumToStringList(settingName, node)
+
+def decodeBlobSetting(value, encodingType):
+	"""Convert a typed settings blob value back into its native python type (json doesn't preserve tuples).
+	"""
+
+	if encodingType == "colorScheme": return [tuple(v) for v in value]
+
+	#return;list/dict (decoded setting value)
+	return value
+
+def storeSettingsInBlob(node, settings = {}):
+	"""Store the given (already decoded) typed settings in the node's settings blob.
+	Referenced nodes are skipped.
+	"""
+
+	nodeName = str(node)
+	if not settings or pm.referenceQuery(nodeName, isNodeReferenced = True): return
+
+	mnsUtils.writeSettingsBlob(nodeName, settings)
+
 def filterSettings(fileSettings, node):
-	"""Filter all pre-defined settings to their corresponding gathering methods, and re-collect
+	"""Filter all pre-defined settings to their corresponding gathering methods, and re-collect.
+	List, channel-control and color-scheme settings are read from the node's typed settings blob (single attribute read).
+	Settings missing from the blob (i.e. older, enum-encoded rigs) are decoded from their enum attributes and migrated into the blob.
 	"""
 
 	sidePlaceHolder = "center"
-	customAttrs = pm.listAttr(node, ud = 1)
+	node = mnsUtils.checkIfObjExistsAndSet(obj = node) or node
+	nodeName = str(node)
+	customAttrs = set(cmds.listAttr(nodeName, ud = 1) or [])
+	blobSettings = mnsUtils.readSettingsBlob(nodeName)
+	scalarValues = mnsUtils.getAttrValuesBulk(nodeName, [arg.name for arg in fileSettings if arg.name in customAttrs and not getSettingEncodingType(arg.name, arg.multiRowList)])
+
+	migratedSettings = {}
 	for arg in fileSettings:
 		if arg.name in customAttrs:
 			if  "side".lower() in arg.name.lower(): sidePlaceHolder = arg.default
-			if "colorScheme".lower() in arg.name.lower() or "schemeOverride".lower() in arg.name.lower():
-				values = mnsUtils.splitEnumAttrToColorSchemeFloatTupleList(arg.name, node)
-				arg.default = values
-			elif "channelControl".lower() in arg.name.lower():
-				returnDict = mnsUtils.splitEnumAttrToChannelControlList(arg.name, node)
-				arg.default = returnDict
-			elif arg.name.lower() == "spaces" or arg.multiRowList:
-				retList = mnsUtils.splitEnumToStringList(arg.name, node)
-				arg.default = retList
+			encodingType = getSettingEncodingType(arg.name, arg.multiRowList)
+			if encodingType:
+				if arg.name in blobSettings:
+					arg.default = decodeBlobSetting(blobSettings[arg.name], encodingType)
+				else:
+					arg.default = getEnumEncodedSetting(arg.name, node, encodingType)
+					migratedSettings[arg.name] = arg.default
+			elif arg.name in scalarValues:
+				arg.default = scalarValues[arg.name]
 			else:
 				arg.default = node.attr(arg.name).get()
 
+	storeSettingsInBlob(nodeName, migratedSettings)
+
 	#return;list (settings), string (current side place holder)
 	return fileSettings, sidePlaceHolder
 
@@ -420,22 +473,202 @@ def deconstructRig(fromNodes = [], mode = 0):
 	partialModules = collectPartialModules(fromNodes = fromNodes, mode = mode)
 	MnsRig.deconstructRig(partialModules = partialModules)
 
+###############################
+###### resolution cache #######
+###############################
+
+#module reload- remove the previous session callbacks before re-initializing the cache
+if "rigResolutionCache" in globals(): removeRigResolutionCacheCallbacks()
+
+rigResolutionCache = {"rigTop": {}, "moduleRoot": {}, "watchedNodes": {}, "callbackIDs": []}
+rigResolutionAttrs = ["blkClassID", "rigRootGuide", "guideAuthority"]
+
+def rigResolutionCacheInvalidateCB(*args, **kwargs):
+	"""Clear the rig-top/module-root resolution cache, and remove all per-node callbacks.
+	Registered against scene new/open.
+	"""
+
+	for watchedKey in rigResolutionCache["watchedNodes"]:
+		for callbackID in rigResolutionCache["watchedNodes"][watchedKey]["callbackIDs"]:
+			try: OpenMaya.MMessage.removeCallback(callbackID)
+			except: pass
+	rigResolutionCache["watchedNodes"].clear()
+	rigResolutionCache["rigTop"].clear()
+	rigResolutionCache["moduleRoot"].clear()
+
+def invalidateWatchedNode(watchedKey = None):
+	"""Remove all cache entries depending on the given watched node.
+	"""
+
+	watchData = rigResolutionCache["watchedNodes"].get(watchedKey)
+	if watchData:
+		for cacheKey, key in watchData["dependents"]:
+			rigResolutionCache[cacheKey].pop(key, None)
+		watchData["dependents"].clear()
+
+def watchedNodeDagChangedCB(child, parent, watchedKey):
+	invalidateWatchedNode(watchedKey)
+
+def watchedNodeNameChangedCB(node, previousName, watchedKey):
+	invalidateWatchedNode(watchedKey)
+
+def watchedNodeAttrChangedCB(msg, plug, otherPlug, watchedKey):
+	if msg & (OpenMaya.MNodeMessage.kConnectionMade | OpenMaya.MNodeMessage.kConnectionBroken):
+		invalidateWatchedNode(watchedKey)
+	elif msg & OpenMaya.MNodeMessage.kAttributeSet and plug.partialName(False, False, False, False, False, True).split(".")[-1] in rigResolutionAttrs:
+		invalidateWatchedNode(watchedKey)
+
+def watchNodeForResolution(node = None, dependent = None, **kwargs):
+	"""Register the given cache entry (dependent) as depending on the given node.
+	Per-node callbacks are registered once per node- re-parenting and renaming always, attribute changes (connections, and the attributes the resolution reads) if requested.
+	"""
+
+	attrChanges = kwargs.get("attrChanges", False) #arg; comment = watch the node's connections and resolution attributes as well
+
+	watchedKey, handle = getNodeHandleKey(node)
+	if watchedKey is None: return False
+
+	watchData = rigResolutionCache["watchedNodes"].get(watchedKey)
+	if not watchData or not watchData["handle"].isAlive():
+		if watchData:
+			for callbackID in watchData["callbackIDs"]:
+				try: OpenMaya.MMessage.removeCallback(callbackID)
+				except: pass
+		watchData = {"handle": handle, "callbackIDs": [], "attrChanges": False, "dependents": set()}
+		rigResolutionCache["watchedNodes"][watchedKey] = watchData
+		try:
+			mObj = handle.object()
+			watchData["callbackIDs"].append(OpenMaya.MNodeMessage.addNameChangedCallback(mObj, watchedNodeNameChangedCB, watchedKey))
+			if mObj.hasFn(OpenMaya.MFn.kDagNode):
+				dagPath = OpenMaya.MDagPath()
+				OpenMaya.MDagPath.getAPathTo(mObj, dagPath)
+				watchData["callbackIDs"].append(OpenMaya.MDagMessage.addParentAddedDagPathCallback(dagPath, watchedNodeDagChangedCB, watchedKey))
+				watchData["callbackIDs"].append(OpenMaya.MDagMessage.addParentRemovedDagPathCallback(dagPath, watchedNodeDagChangedCB, watchedKey))
+		except:
+			return False
+
+	if attrChanges and not watchData["attrChanges"]:
+		try:
+			watchData["callbackIDs"].append(OpenMaya.MNodeMessage.addAttributeChangedCallback(handle.object(), watchedNodeAttrChangedCB, watchedKey))
+			watchData["attrChanges"] = True
+		except:
+			return False
+
+	watchData["dependents"].add(dependent)
+
+	#return;bool (watch status)
+	return True
+
+def registerRigResolutionCacheCallbacks():
+	"""Register the scene new/open cache reset callbacks (once per session).
+	"""
+
+	if rigResolutionCache["callbackIDs"]: return True
+
+	try:
+		callbackIDs = [
+						OpenMaya.MSceneMessage.addCallback(OpenMaya.MSceneMessage.kBeforeNew, rigResolutionCacheInvalidateCB),
+						OpenMaya.MSceneMessage.addCallback(OpenMaya.MSceneMessage.kBeforeOpen, rigResolutionCacheInvalidateCB)
+						]
+		rigResolutionCache["callbackIDs"] = callbackIDs
+	except:
+		mnsLog.log("Couldn't register resolution cache callbacks. Resolution caching is disabled.", svr = 0)
+		return False
+
+	#return;bool (registration status)
+	return True
+
+def removeRigResolutionCacheCallbacks():
+	"""Remove all resolution cache callbacks, and clear the cache.
+	"""
+
+	for callbackID in rigResolutionCache["callbackIDs"]:
+		try: OpenMaya.MMessage.removeCallback(callbackID)
+		except: pass
+	rigResolutionCache["callbackIDs"] = []
+	rigResolutionCacheInvalidateCB()
+
+def getNodeHandleKey(node = None):
+	"""Return a (hash key, MObjectHandle) pair for the given PyNode, or (None, None) if it can't be aquired.
+	"""
+
+	try:
+		handle = OpenMaya.MObjectHandle(node.__apimobject__())
+		return handle.hashCode(), handle
+	except: return None, None
+
+def getCachedResolution(cacheKey = "rigTop", node = None):
+	"""Return the cached resolution entry (resolved PyNode, asNameStd flag) for the given node, or None on a cache miss.
+	"""
+
+	key, handle = getNodeHandleKey(node)
+	entry = rigResolutionCache[cacheKey].get(key)
+	if entry:
+		entryHandle, resolvedHandle, resolvedNode, asNameStd = entry
+		if entryHandle.isAlive() and resolvedHandle.isAlive() and entryHandle.object() == handle.object():
+			#return;tuple (resolved PyNode, asNameStd flag)
+			return resolvedNode, asNameStd
+		rigResolutionCache[cacheKey].pop(key)
+
+def storeCachedResolution(cacheKey = "rigTop", node = None, resolved = None):
+	"""Store a resolution result (MnsNameStd or PyNode) for the given node.
+	Only valid results are cached.
+	"""
+
+	if not resolved or not registerRigResolutionCacheCallbacks(): return
+
+	asNameStd = type(resolved).__name__ == "MnsNameStd"
+	resolvedNode = resolved.node if asNameStd else resolved
+	key, handle = getNodeHandleKey(node)
+	resolvedKey, resolvedHandle = getNodeHandleKey(resolvedNode)
+	if key is not None and resolvedHandle: 
+		#invalidation is scoped to the nodes the resolution depends on- the node, its parents up to the resolved node, and the resolved node
+		dependent = (cacheKey, key)
+		watchNodes = [node]
+		if isinstance(node, pm.nodetypes.DagNode):
+			for parent in node.getAllParents():
+				watchNodes.append(parent)
+				if parent == resolvedNode: break
+		if not resolvedNode in watchNodes: watchNodes.append(resolvedNode)
+
+		for k, watchNode in enumerate(watchNodes):
+			if not watchNodeForResolution(watchNode, dependent, attrChanges = (k == 0 or watchNode == resolvedNode)):
+				invalidateWatchedNode(getNodeHandleKey(node)[0])
+				return
+		rigResolutionCache[cacheKey][key] = (handle, resolvedHandle, resolvedNode, asNameStd)
+
+def getResolvedFromCache(cacheKey = "rigTop", node = None):
+	"""Return the cached resolution for the given node in it's original return type (a new MnsNameStd or PyNode), or None on a cache miss.
+	"""
+
+	cached = getCachedResolution(cacheKey, node)
+	if cached:
+		resolvedNode, asNameStd = cached
+		if asNameStd: return mnsUtils.validateNameStd(resolvedNode)
+		
+		#return;MnsNameStd/PyNode (resolved node)
+		return resolvedNode
+
 ###############################
 ###### rigTop #################
 ###############################
 
 def getRigTop(objectA):
 	"""Attempt to get a rigTop node from the passed in node to check.
+	Results are cached per node (see rigResolutionCache), the parent walk is only executed on a cache miss.
 	"""
 
 	objectA = mnsUtils.checkIfObjExistsAndSet(objectA)
 	if objectA:
-		_rigTop = None
+		_rigTop = getResolvedFromCache("rigTop", objectA)
+		if _rigTop: return _rigTop
+
 		firstLevelParent = mnsUtils.getFirstLevelParentForObject(objectA)
 		status, blkClassID = mnsUtils.validateAttrAndGet(firstLevelParent, "blkClassID", None)
 		if firstLevelParent.hasAttr("blkClassID"):
 			if blkClassID and blkClassID == mnsUtils.returnKeyFromElementTypeDict(mnsTypeDict, mnsPS_rigTop): 
 				_rigTop = mnsUtils.validateNameStd(firstLevelParent)
+				storeCachedResolution("rigTop", objectA, _rigTop)
 
 		if not _rigTop: mnsLog.log("Couldn't find rig top for selection.", svr = 2)
 
@@ -881,6 +1114,22 @@ def recSearchForGuideRootInParents(obj):
 
 def getModuleRoot(objectA):
 	"""Attempt to collect the root guide relative from the given node.
+	Results are cached per node (see rigResolutionCache), the search is only executed on a cache miss.
+	"""
+
+	node = mnsUtils.checkIfObjExistsAndSet(objectA)
+	if node:
+		moduleRoot = getResolvedFromCache("moduleRoot", node)
+		if moduleRoot: return moduleRoot
+
+	moduleRoot = resolveModuleRoot(objectA)
+	if node: storeCachedResolution("moduleRoot", node, moduleRoot)
+
+	#return;MnsNameStd/PyNode (rootGuide)
+	return moduleRoot
+
+def resolveModuleRoot(objectA):
+	"""Collect the root guide relative from the given node (uncached search).
 	"""
 
 	moduleRoot = None
@@ -2080,7 +2329,27 @@ def collectPlgsBasedOnMode(rigTop = None, mode = 0, **kwargs):
 
 	return returnList
 
-def collectPickerDataForRigTop(rigTop = None, mode = 0):
+def collectPickerDataForPlg(plgNode = None, skipList = []):
+	"""Collect all of the relevant data for a single PLG, using a single listAttr call and bulk attribute reads.
+	"""
+
+	attrDataDict = {}
+	if plgNode:
+		plgName = plgNode.longName()
+		attrNames = [attrName for attrName in (cmds.listAttr(plgName, ud = True) or []) if not attrName in skipList and attrName != "selectControls"]
+		attrDataDict = mnsUtils.getAttrValuesBulk(plgName, attrNames + ["tx", "ty", "sx", "sy"])
+
+		if "freePlg" in plgNode.nodeName():
+			#add plgColor
+			attrDataDict.update(mnsUtils.getAttrValuesBulk(plgNode.getShape().longName(), ["overrideColorRGB"]))
+
+			if plgNode.hasAttr("selectControls"):
+				attrDataDict.update({"selectControls": mnsUtils.splitEnumToStringList("selectControls", plgNode)})
+
+	#return; dict (attribute name: value)
+	return attrDataDict
+
+def collectPickerDataForRigTop(rigTop = None, mode = 0, **kwargs):
 	"""
 	mode 0 = All
 	mode 1 = Brnach
@@ -2088,35 +2357,23 @@ def collectPickerDataForRigTop(rigTop = None, mode = 0):
 	mode 3 = selected
 	"""
 
+	progressBar = kwargs.get("progressBar", None)
+
 	returnData = {}
 	if not rigTop: rigTop = getRigTopForSel()
 	if rigTop:
 		plgsList = collectPlgsBasedOnMode(rigTop, mode)
 		if plgsList:
 			skipList = ["blkClassID", "blkCtrlTypeID", "messageOut", "master", "ctrlType", "ctrlGrp", "deleteMaster"] 
-			for plgNode in plgsList:
-				plgKey = plgNode.nodeName()
-				
-				attrDataDict = {}
-				for attr in plgNode.listAttr(ud = True) + [plgNode.tx, plgNode.ty, plgNode.sx, plgNode.sy]:
-					if not attr.attrName() in skipList and not attr.attrName() == "selectControls":
-						attrDataDict.update({attr.attrName(): attr.get()})
-						
-					if "freePlg" in plgNode.nodeName():
-						#add plgColor
-						currentColor = plgNode.getShape().overrideColorRGB.get()
-						attrDataDict.update({"overrideColorRGB": currentColor})
+			for k, plgNode in enumerate(plgsList):
+				returnData.update({plgNode.nodeName(): collectPickerDataForPlg(plgNode, skipList)})
 
-						if attr.attrName() == "selectControls":
-							controlsList = mnsUtils.splitEnumToStringList("selectControls", plgNode)
-							attrDataDict.update({attr.attrName(): controlsList})
-
-				returnData.update({plgKey: attrDataDict})
+				if progressBar: progressBar.setValue(100.0 / len(plgsList) * float(k + 1))
 
 	#return; dict (plgs data)
 	return returnData
 
-def exportPickerData(rigTop = None, mode = 0):
+def exportPickerData(rigTop = None, mode = 0, **kwargs):
 	"""
 	mode 0 = All
 	mode 1 = Brnach
@@ -2124,13 +2381,16 @@ def exportPickerData(rigTop = None, mode = 0):
 	mode 3 = selected
 	"""
 
+	progressBar = kwargs.get("progressBar", None)
+
 	if not rigTop: rigTop = getRigTopForSel()
 	if rigTop:
 		filename = QtWidgets.QFileDialog.getSaveFileName(mnsUIUtils.get_maya_window(), "Export Picker Data", None, "Mns Picker Data (*.mnsPickerData)")
 		if filename: 
 			filename = filename[0]
 			if filename.endswith(".mnsPickerData"):
-				pickerData = collectPickerDataForRigTop(rigTop, mode)
+				pickerData = collectPickerDataForRigTop(rigTop, mode, progressBar = progressBar)
+				if progressBar: progressBar.setValue(0)
 				if pickerData:
 					mnsUtils.writeJsonPath(filename, pickerData)
 					pm.confirmDialog( title='Picker Data Exported.', message="Picker Data Exported successfully.", defaultButton='OK')
@@ -2143,25 +2403,37 @@ def exportPickerData(rigTop = None, mode = 0):
 		mnsLog.log("Couldn't find Rig-Top. Aborting.", svr = 1)
 
 def injectPlgPropertiesFromData(plg = None, data = {}):
+	"""Inject the given PLG data into the PLG.
+	All plain attribute values are written in bulk, skipping values which are already set.
+	"""
+
 	plg = mnsUtils.validateNameStd(plg)
+	setCount = 0
 	if plg and data:
+		plgName = plg.node.longName()
+		isFreePlg = "freePlg" in plg.node.nodeName()
+		if isFreePlg:
+			mnsUtils.addAttrToObj([plg.node], type = "list", value = [" "], name = "selectControls", locked = True)
+
+		existingAttrs = set((cmds.listAttr(plgName) or []) + (cmds.listAttr(plgName, sn = True) or []))
+		attrValues = {}
 		for attrKey in data:
-			if "freePlg" in plg.node.nodeName():
-				mnsUtils.addAttrToObj([plg.node], type = "list", value = [" "], name = "selectControls", locked = True)
+			value = data[attrKey]
+			if attrKey == "overrideColorRGB":
+				setCount += mnsUtils.setAttrValuesBulk(plg.node.getShape().longName(), {attrKey: value})
+			elif attrKey == "selectControls":
+				mnsUtils.addAttrToObj([plg], type = "list", value = value, name = "selectControls", locked = True, replace = True)
+			elif attrKey in existingAttrs:
+				attrValues[attrKey] = value
 
-			status, value = mnsUtils.validateAttrAndGet(plg, attrKey, None)
-			if status:
-				value = data[attrKey]
-				if attrKey == "overrideColorRGB":
-					mnsUtils.setAttr(plg.node.getShape().attr(attrKey), value)
-				elif attrKey == "selectControls":
-					mnsUtils.addAttrToObj([plg], type = "list", value = value, name = "selectControls", locked = True, replace = True)
-				elif attrKey == "isFacial" and "freePlg" in plg.node.nodeName():
-					mnsUtils.setAttr(plg.node.attr(attrKey), value)
-					plg.node.v.disconnect()
-					connectPlgToVisChannel(plg.node)
-				else:
-					mnsUtils.setAttr(plg.node.attr(attrKey), value)
+		setCount += mnsUtils.setAttrValuesBulk(plgName, attrValues)
+
+		if isFreePlg and "isFacial" in attrValues:
+			plg.node.v.disconnect()
+			connectPlgToVisChannel(plg.node)
+
+	#return; int (number of attributes written)
+	return setCount
 
 def importPickerData(**kwargs):
 	fromPath = kwargs.get("fromPath", None)
@@ -2192,7 +2464,10 @@ def importPickerData(**kwargs):
 					rigTop = existingTops[list(existingTops.keys())[0]]
 
 			if rigTop:
-				for plgName in pickerData.keys():
+				importTimer = pm.timerX()
+				setCount = 0
+				pm.undoInfo(openChunk=True)
+				for k, plgName in enumerate(pickerData.keys()):
 					override = False
 					plg = mnsUtils.validateNameStd(plgName)
 					freePlgIndex = 1
@@ -2217,7 +2492,12 @@ def importPickerData(**kwargs):
 						newPlg = createPickerLayoutGuide(ctrl, override, rigTop = rigTop, dontProject = True, freePlgIndex = freePlgIndex, side = side, isFacialInput = isFacialInput)
 	
 					if newPlg:
-						injectPlgPropertiesFromData(newPlg, pickerData[plgName])
+						setCount += injectPlgPropertiesFromData(newPlg, pickerData[plgName])
+
+					if progressBar: progressBar.setValue(100.0 / len(pickerData) * float(k + 1))
+				pm.undoInfo(closeChunk=True)
+				if progressBar: progressBar.setValue(0)
+				mnsLog.log("Imported Picker Data for " + str(len(pickerData)) + " PLGs (" + str(setCount) + " attributes set) in " + str(pm.timerX(st = importTimer)) + " seconds.", svr = 1)
 			else:
 				mnsLog.log("Can't find relevant Rig-Top. Aborting.", svr = 1)
 		else:
@@ -5146,10 +5426,11 @@ def extractSkeleton2(rigTop = None, mode = 0, **kwargs):
 				dupRootJnt.node.rename(rootJoint.nodeName().split(":")[-1])
 				mnsUtils.lockAndHideAllTransforms(dupRootJnt, lock = False, keyable = True, cb = True)
 
-				for joint in dupRootJnt.node.listRelatives(ad = True, type = "joint"):
+				dupJoints = dupRootJnt.node.listRelatives(ad = True, type = "joint")
+				for joint in dupJoints:
 					joint.overrideDisplayType.set(0)
 					joint.overrideEnabled.set(0)
-					mnsUtils.lockAndHideAllTransforms(joint, lock = False, keyable = True, cb = True)
+				mnsUtils.setChannelStateBulk(dupJoints, lock = False, keyable = True, cb = True)
 
 				if rotToJointOrient:
 					mnsUtils.jointRotationToOrient(dupRootJnt.node)
@@ -5770,6 +6051,203 @@ def limbMatchFkIK(limbCtrl, mode = 0, **kwargs):
 		#pm.dgdirty()
 		#pm.refresh()
 
+def getLimbMatchPairs(fkControls = {}, ikControls = {}, mode = 0):
+	"""Return the (control, reference) match pairs for the given limb controls, in hierarchy order, following limbMatchFkIK.
+	mode 0 - Match FK to IK
+	mode 1 - Match IK to FK
+	"""
+
+	pairs = []
+	if mode == 0:
+		fkRoot = fkControls.get("fkRoot", None)
+		fkRootRef = fkControls.get("fkRootRefA", None) or fkControls.get("fkRootRef", None)
+		fkMid = fkControls.get("fkMid", None)
+		fkMidRef = fkControls.get("fkMidRefA", None) or fkControls.get("fkMidRef", None)
+		fkMidB = fkControls.get("fkMidB", None)
+		fkMidBRef = fkControls.get("fkMidBRefA", None)
+		fkEnd = fkControls.get("fkEnd", None)
+		fkEndRef = fkControls.get("fkEndRefA", None) or fkControls.get("fkEndRef", None)
+
+		if fkRoot and fkMid and fkEnd:
+			pairs = [(fkRoot, fkRootRef), (fkMid, fkMidRef)]
+			if fkMidB and fkMidBRef: pairs.append((fkMidB, fkMidBRef)) #hindLimb case
+			pairs.append((fkEnd, fkEndRef))
+	else:
+		ikCtrl = ikControls.get("ikCtrl", None)
+		ikCtrlRef = ikControls.get("ikCtrlRef", None)
+		poleVector = ikControls.get("poleVector", None)
+		poleVectorRef = ikControls.get("poleVectorRef", None)
+
+		if ikCtrl and poleVector and poleVectorRef:
+			pairs = [(ikCtrl, ikCtrlRef), (poleVector, poleVectorRef)]
+
+	#return; list (control, reference)
+	return [(pm.PyNode(ctrl), pm.PyNode(ref)) for ctrl, ref in pairs if ctrl and ref]
+
+def overridePlugValues(plugValues = {}):
+	"""Temporarily disconnect the given plugs from their sources, and set them to the given values.
+	Returns the restore data for restorePlugValues.
+	"""
+
+	restoreData = []
+	for plugName in plugValues:
+		if cmds.getAttr(plugName, lock = True):
+			mnsLog.log("Plug " + plugName + " is locked and can't be overridden. Skipping.", svr = 2)
+			continue
+		sources = cmds.listConnections(plugName, s = True, d = False, p = True) or []
+		restoreData.append((plugName, sources[0] if sources else None, cmds.getAttr(plugName)))
+		if sources: cmds.disconnectAttr(sources[0], plugName)
+		cmds.setAttr(plugName, plugValues[plugName])
+
+	#return; list (plugName, source, original value)
+	return restoreData
+
+def restorePlugValues(restoreData = []):
+	for plugName, source, value in restoreData:
+		cmds.setAttr(plugName, value)
+		if source: cmds.connectAttr(source, plugName, f = True)
+
+def getMatchKeyChannels(keyControls = [], excludePlugs = []):
+	"""Return the keyable channel plugs of the given controls, excluding the given plugs, as setKeyframe would key them.
+	"""
+
+	returnList = []
+	for ctrl in keyControls:
+		nodeName = pm.PyNode(ctrl).longName()
+		for channel in cmds.listAttr(nodeName, k = True, s = True) or []:
+			plugName = nodeName + "." + channel
+			if not plugName in excludePlugs and not plugName in returnList and mnsAnimUtils.isPlugKeyable(plugName): returnList.append(plugName)
+
+	#return; list (plug names)
+	return returnList
+
+def getParentScalePlugs(parents = [], excludePlugs = []):
+	"""Return the scale plugs of the given parent nodes (the inverse scale source of segment-scale-compensated children), excluding the given plugs.
+	"""
+
+	returnList = []
+	for parent in parents:
+		if parent and cmds.attributeQuery("scale", node = parent, exists = True):
+			returnList += [parent + ".scale" + axis for axis in "XYZ" if not parent + ".scale" + axis in excludePlugs and not parent + ".scale" + axis in returnList]
+
+	#return; list (plug names)
+	return returnList
+
+def getSampledScales(keySamples = {}, nodeName = None, frameCount = 0):
+	if not nodeName or not nodeName + ".scaleX" in keySamples: return None
+
+	#return; list ((x,y,z) per frame)
+	return [[keySamples[nodeName + ".scale" + axis][k] for axis in "XYZ"] for k in range(frameCount)]
+
+def limbMatchFkIKRange(limbsData = {}, mode = 0):
+	"""Range mode FK<->IK matching, for multiple limbs and frames, without moving the time-line.
+	limbsData is a dict of {blendAttrHolder: {"ctrlsAssembly": dict (see getLimbModuleControls), "frameIndices": list, "keyControls": list}}.
+
+	All reference matrices for the whole range are sampled in a single pass through time-specific DG contexts (with the ikFkBlend overridden to the matching state),
+	the matches are solved in memory (in hierarchy order), and the results are written as bulk keys, along with all other keyable channels of the key controls and the ikFkBlend.
+	For hindLimbs (IK mode), the ankle-bend aim is solved in memory, in a second sampling pass over the matched IK chain, instead of using a temporary locator and aim constraint.
+
+	mode 0 - Match FK to IK
+	mode 1 - Match IK to FK
+	"""
+
+	allFrames = sorted(list(dict.fromkeys([frame for hostCtrl in limbsData for frame in limbsData[hostCtrl]["frameIndices"]])))
+	if not allFrames: return
+
+	frameIndices = dict((frame, k) for k, frame in enumerate(allFrames))
+	limbs = []
+	sampleNodes = []
+	blendPlugs = []
+	for hostCtrl in limbsData:
+		#a locked blend can't be overridden to the matching state, hence the wrong chain would be sampled
+		blendPlug = pm.PyNode(hostCtrl).longName() + ".ikFkBlend"
+		if cmds.getAttr(blendPlug, lock = True):
+			mnsLog.log("The ikFkBlend attribute of " + pm.PyNode(hostCtrl).nodeName() + " is locked. Skipping this limb's match.", svr = 2)
+			continue
+
+		ctrlsAssembly = limbsData[hostCtrl]["ctrlsAssembly"]
+		fkControls, ikControls = ctrlsAssembly.get("fkControls", {}), ctrlsAssembly.get("ikControls", {})
+		pairs = getLimbMatchPairs(fkControls, ikControls, mode)
+
+		ankleBend = None
+		if mode == 1 and ikControls.get("poleVector", None):
+			fkMidB, ankleBendCtrl, angleBendRef = fkControls.get("fkMidB", None), ikControls.get("ankleBendCtrl", None), ikControls.get("angleBendRef", None)
+			if fkMidB and ankleBendCtrl and angleBendRef: #hindLimb case
+				ankleBend = [pm.PyNode(n).longName() for n in [ankleBendCtrl, angleBendRef, fkMidB, ikControls["poleVector"]]]
+
+		pairs = [(ctrl.longName(), ref.longName(), (cmds.listRelatives(ctrl.longName(), p = True, f = True) or [None])[0]) for ctrl, ref in pairs]
+		for pair in pairs: sampleNodes += [n for n in pair if n]
+		blendPlugs.append(blendPlug)
+		limbs.append({"hostCtrl": hostCtrl, "pairs": pairs, "ankleBend": ankleBend, "blendPlug": blendPlug, "frames": limbsData[hostCtrl]["frameIndices"], "keyControls": limbsData[hostCtrl]["keyControls"]})
+
+	#first pass- sample all reference matrices and key channels
+	sampleNodes = list(dict.fromkeys(sampleNodes))
+	keyPlugs = getMatchKeyChannels([ctrl for limb in limbs for ctrl in limb["keyControls"]], blendPlugs)
+	parentScalePlugs = getParentScalePlugs([pair[2] for limb in limbs for pair in limb["pairs"]], keyPlugs)
+	restoreData = overridePlugValues(dict((blendPlug, float(mode)) for blendPlug in blendPlugs))
+	try:
+		samples = mnsAnimUtils.sampleWorldMatrices(sampleNodes, allFrames)
+		keySamples = mnsAnimUtils.sampleAttrValues(keyPlugs + parentScalePlugs, allFrames)
+	finally:
+		restorePlugValues(restoreData)
+	sampledMatrices = dict((nodeName, mnsAnimUtils.getSampledMatrices(samples, k)) for k, nodeName in enumerate(samples["nodes"]))
+
+	#solve the matches in hierarchy order, to allow a parent's match to propagate to its children
+	plugKeys = {}
+	ankleBendCtrls = [limb["ankleBend"][0] for limb in limbs if limb["ankleBend"]]
+	for limb in limbs:
+		limbFrameIndices = [frameIndices[frame] for frame in limb["frames"]]
+		solvedWorlds = {}
+		for ctrlName, refName, parentName in limb["pairs"]:
+			parentMatrices = sampledMatrices[parentName] if parentName else []
+			ancestors = [n for n in solvedWorlds if ctrlName.startswith(n + "|")]
+			if ancestors and parentMatrices:
+				ancestor = sorted(ancestors, key = len)[-1]
+				parentMatrices = [parentMatrices[k] * sampledMatrices[ancestor][k].inverse() * solvedWorlds[ancestor][k] for k in range(len(allFrames))]
+
+			solvedWorlds[ctrlName] = sampledMatrices[refName]
+			channels = mnsAnimUtils.solveLocalChannels(ctrlName, solvedWorlds[ctrlName], parentMatrices, parentScales = getSampledScales(keySamples, parentName, len(allFrames)))
+			for channel in channels: keySamples[ctrlName + "." + channel] = channels[channel]
+
+		for plugName in keyPlugs:
+			if plugName.split(".")[0] in ankleBendCtrls: continue
+			if [ctrl for ctrl in limb["keyControls"] if plugName.split(".")[0] == pm.PyNode(ctrl).longName()]:
+				plugKeys[plugName] = (limb["frames"], [keySamples[plugName][k] for k in limbFrameIndices])
+	mnsAnimUtils.setKeysOnPlugs(plugKeys)
+
+	#second pass- solve the hindLimb ankle-bend aim, over the matched IK chain
+	hindLimbs = [limb for limb in limbs if limb["ankleBend"]]
+	if hindLimbs:
+		restoreData = overridePlugValues(dict((limb["blendPlug"], float(1 - mode)) for limb in hindLimbs))
+		try:
+			ankleNodes = list(dict.fromkeys([n for limb in hindLimbs for n in limb["ankleBend"]]))
+			ankleNodes += [p for p in [(cmds.listRelatives(limb["ankleBend"][0], p = True, f = True) or [None])[0] for limb in hindLimbs] if p and not p in ankleNodes]
+			samples = mnsAnimUtils.sampleWorldMatrices(ankleNodes, allFrames)
+			ankleParentScalePlugs = getParentScalePlugs([(cmds.listRelatives(limb["ankleBend"][0], p = True, f = True) or [None])[0] for limb in hindLimbs])
+			keySamples.update(mnsAnimUtils.sampleAttrValues(ankleParentScalePlugs, allFrames))
+		finally:
+			restorePlugValues(restoreData)
+		sampledMatrices = dict((nodeName, mnsAnimUtils.getSampledMatrices(samples, k)) for k, nodeName in enumerate(samples["nodes"]))
+
+		plugKeys = {}
+		for limb in hindLimbs:
+			ankleBendCtrl, angleBendRef, fkMidB, poleVector = limb["ankleBend"]
+			parentName = (cmds.listRelatives(ankleBendCtrl, p = True, f = True) or [None])[0]
+			limbFrameIndices = [frameIndices[frame] for frame in limb["frames"]]
+
+			targetWorlds = []
+			for k in range(len(allFrames)):
+				targetWorlds.append(mnsAnimUtils.solveAimWithOffset(sampledMatrices[ankleBendCtrl][k], mnsAnimUtils.getMatrixPosition(sampledMatrices[angleBendRef][k]), mnsAnimUtils.getMatrixPosition(sampledMatrices[fkMidB][k]), mnsAnimUtils.getMatrixPosition(sampledMatrices[poleVector][k])))
+			channels = mnsAnimUtils.solveLocalChannels(ankleBendCtrl, targetWorlds, sampledMatrices[parentName] if parentName else [], parentScales = getSampledScales(keySamples, parentName, len(allFrames)))
+			for channel in channels: keySamples[ankleBendCtrl + "." + channel] = channels[channel]
+
+			for plugName in keyPlugs:
+				if plugName.split(".")[0] == ankleBendCtrl: plugKeys[plugName] = (limb["frames"], [keySamples[plugName][k] for k in limbFrameIndices])
+		mnsAnimUtils.setKeysOnPlugs(plugKeys)
+
+	#key the blend to the matched state
+	mnsAnimUtils.setKeysOnPlugs(dict((limb["blendPlug"], (limb["frames"], [float(1 - mode)] * len(limb["frames"]))) for limb in limbs))
+
 ###############################
 ############ CNS ##############
 ###############################
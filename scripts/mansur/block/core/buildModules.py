@@ -57,7 +57,14 @@ class MnsBuildModuleBtn(object):
 	"""
 
 	def __init__(self, path, **kwargs):
+		catalogEntry = kwargs.get("catalogEntry", None) #arg; comment = a module catalog entry (see moduleCatalog). When passed, the module info is read from it rather than from the path.
+
 		self.path = path
+		if catalogEntry:
+			self.moduleName = catalogEntry["moduleName"]
+			self.groupType = catalogEntry["groupType"]
+			return
+
 		#get module name from path
 		self.moduleName = os.path.basename(os.path.normpath(path))
 		mnsLog.log("MnsBuildModuleBtn Class Initialize - " + self.moduleName + ".")
@@ -2018,13 +2025,10 @@ def updateModules(blkWin = None, rigTop = None, buildModulesBtns = [], **kwargs)
 			optArgsFromFile, split = blkWin.getModuleSettings(rootGuide, includeCreationOnly = True)
 			optArgs = mnsArgs.formatArgumetsAsDict(optArgsFromFile)
 
-			for argKey in optArgs: 
-				locked, keyable, cb = True, False, False
-				attrType = type(optArgs[argKey])
-				if attrType != pm.nodetypes.Transform:
-					if not rootGuide.node.hasAttr(argKey):
-						mnsUtils.addAttrToObj(rootGuide.node, name = argKey , type = attrType, value = optArgs[argKey], locked = locked, cb = cb, keyable = keyable)
-						if not buildModuleKey in updatedModules: updatedModules.append(buildModuleKey)
+			locked, keyable, cb = True, False, False
+			attrSpecs = [{"name": argKey, "type": type(optArgs[argKey]), "value": optArgs[argKey], "locked": locked, "cb": cb, "keyable": keyable} for argKey in optArgs if type(optArgs[argKey]) != pm.nodetypes.Transform]
+			if mnsUtils.addAttrsToObjs(rootGuide.node, attrSpecs):
+				updatedModules.append(buildModuleKey)
 
 			if progressBar: 
 				progBarValue = progBarStartValue + (progBarChunk / len(MnsRigO.modules.keys()) * float(k + 1))
@@ -2040,10 +2044,8 @@ def updateRigTopAttrs(rigTop = None):
 			optArgs = mnsArgs.formatArgumetsAsDict(optArgsFromFile)
 			locked, keyable, cb = True, False, False
 
-			for argKey in optArgs:
-				attrType = type(optArgs[argKey])
-				if attrType != pm.nodetypes.Transform:
-					mnsUtils.addAttrToObj(rigTop.node, name = argKey , type = attrType, value = optArgs[argKey], locked = locked, cb = cb, keyable = keyable)
+			attrSpecs = [{"name": argKey, "type": type(optArgs[argKey]), "value": optArgs[argKey], "locked": locked, "cb": cb, "keyable": keyable} for argKey in optArgs if type(optArgs[argKey]) != pm.nodetypes.Transform]
+			mnsUtils.addAttrsToObjs(rigTop.node, attrSpecs)
 
 def update2026DLNodes():
 	if GLOB_mayaVersion > 2025:
@@ -2116,11 +2118,8 @@ def updateRig(blkWin = None, buildModulesBtns = [], **kwargs):
 		status, rootJoint = mnsUtils.validateAttrAndGet(rootGuide, "jntSlave", None)
 		if rootJoint:
 			allJoints = [rootJoint] + rootJoint.listRelatives(ad = True, type = "joint")
-			for idx,j in enumerate(allJoints):
-				mnsUtils.lockAndHideAllTransforms(j, lock = True, cb = True, keyable = True)
-				if progressBar: 
-					progBarValue = progBarStartValue + (progBarChunk / len(allJoints) * float(idx + 1))
-					progressBar.setValue(progBarValue)
+			mnsUtils.setChannelStateBulk(allJoints, lock = True, cb = True, keyable = True)
+			if progressBar: progressBar.setValue(progBarStartValue + progBarChunk)
 
 		if progressBar: 
 			progressBar.setValue(100)		
@@ -0,0 +1,184 @@
+"""=== Author: Assaf Ben Zur ===
+BLOCK build-modules catalog.
+This module maintains a manifest of all available build-modules (name, path, group type, icon, tool-tip and settings hash), used by the BLOCK UI to draw its module tabs.
+The catalog is cached locally (within the prefs directory), and is updated incrementally on load:
+	- A module parent directory is only re-listed when its modification time changed.
+	- A module group directory is only re-listed when its modification time changed.
+	- A module entry is only rebuilt when its directory, main python file or settings file modification time changed.
+This avoids walking and reading the entire module library (which may live on a network share) on every BLOCK launch.
+"""
+
+#global dependencies
+import os, hashlib
+
+#mns dependencies
+from ...core.globals import *
+from ...core import log as mnsLog
+from ...core import utility as mnsUtils
+
+GLOB_moduleCatalogVersion = 1
+GLOB_moduleCatalogFileName = "blockModuleCatalog"
+
+def getModuleCatalogFilePath():
+	prefsDir = mnsUtils.locatePreferencesDirectory()
+
+	#return; string (catalog file path)
+	return (prefsDir + "/" + GLOB_moduleCatalogFileName + ".json") if prefsDir else None
+
+def loadModuleCatalog():
+	"""Load the cached catalog from the prefs directory. An empty catalog is returned if the cache doesn't exist, or its version doesn't match.
+	"""
+
+	catalog = {}
+	catalogPath = getModuleCatalogFilePath()
+	if catalogPath: catalog = mnsUtils.readJson(catalogPath)
+	if not catalog or catalog.get("version", 0) != GLOB_moduleCatalogVersion:
+		catalog = {"version": GLOB_moduleCatalogVersion, "parents": {}, "groups": {}, "modules": {}}
+
+	#return; dict (catalog)
+	return catalog
+
+def saveModuleCatalog(catalog = {}):
+	catalogPath = getModuleCatalogFilePath()
+	if catalogPath:
+		try:
+			mnsUtils.writeJsonFullPath(catalogPath, catalog)
+		except Exception:
+			mnsLog.log("Failed to write the BLOCK module catalog- " + catalogPath, svr = 2)
+
+def getPathMTime(path = ""):
+	try:
+		#return; float (modification time)
+		return os.path.getmtime(path)
+	except OSError:
+		return 0.0
+
+def getFileHash(filePath = ""):
+	if not os.path.isfile(filePath): return ""
+
+	with open(filePath, "rb") as f: fileHash = hashlib.md5(f.read()).hexdigest()
+
+	#return; string (md5 hex digest)
+	return fileHash
+
+def listSubDirectories(path = ""):
+	#return; list (directory names)
+	return [name for name in os.listdir(path) if os.path.isdir(os.path.join(path, name))]
+
+def formatModuleToolTip(headerLines = []):
+	"""Format a build-module's tool-tip (html) from its python file header lines.
+	"""
+
+	formattedTooltip = "Module description wasn't created."
+
+	author = ""
+	components = ""
+	synopsis = []
+
+	for line in headerLines:
+		if "Author: " in line: author = line.split(": ")[-1]
+		elif "Best used for: " in line: components = line.split(": ")[-1]
+		else:
+			synopsis.append(line)
+
+	if author or components or synopsis:
+		formattedTooltip = "<html><body><font size = 4><table width = 500>"
+		formattedTooltip += "<tr><td><b>Author:</b><td></tr>"
+		formattedTooltip += "<tr><td>" + author + "</td></tr>"
+		formattedTooltip += "<tr></tr>"
+		formattedTooltip += "<tr><td><b>Best For Components:</b><td></tr>"
+		formattedTooltip += "<tr><td>" + components + "</tr></td>"
+		formattedTooltip += "<tr></tr>"
+		formattedTooltip += "<tr><td><b>Synopsis:</b><td></tr>"
+		for line in synopsis: formattedTooltip += "<tr><td>" + line + "</tr></td>"
+		formattedTooltip += "</table></font></body></html>"
+
+	#return; string (tool-tip)
+	return formattedTooltip
+
+def getModuleStamp(modulePath = ""):
+	moduleName = os.path.basename(os.path.normpath(modulePath))
+
+	#return; list (directory, python file and settings file modification times)
+	return [getPathMTime(modulePath), getPathMTime(modulePath + "/" + moduleName + ".py"), getPathMTime(modulePath + "/" + moduleName + ".modSettings")]
+
+def buildModuleEntry(modulePath = ""):
+	"""Build a catalog entry for the given build-module directory.
+	"""
+
+	moduleName = os.path.basename(os.path.normpath(modulePath))
+	pyFilePath = modulePath + "/" + moduleName + ".py"
+	iconPath = modulePath + "/" + moduleName + ".png"
+
+	toolTip = "Module description wasn't created."
+	if os.path.isfile(pyFilePath): toolTip = formatModuleToolTip(mnsUtils.extractHeaderFromPath(pyFilePath))
+
+	#return; dict (module entry)
+	return {"moduleName": moduleName,
+			"path": modulePath,
+			"groupType": os.path.basename(os.path.normpath(os.path.dirname(modulePath))),
+			"icon": iconPath if os.path.isfile(iconPath) else GLOB_guiIconsDir + "/general/module.png",
+			"toolTip": toolTip,
+			"settingsHash": getFileHash(modulePath + "/" + moduleName + ".modSettings"),
+			"stamp": getModuleStamp(modulePath)}
+
+def updateModuleCatalog(moduleParentPaths = [], **kwargs):
+	"""Update the module catalog for the given module parent paths, and return its contents.
+	Only directories that were changed since the last update are re-listed, and only modules that were changed are rebuilt.
+	Returns a list of (parent path, [(group name, [module entries])]) tuples, for all valid parent paths.
+	"""
+
+	save = kwargs.get("save", True) #arg; comment = write the updated catalog into the local cache
+
+	catalog = loadModuleCatalog()
+	parents, groups, modules = {}, {}, {}
+	changed = False
+	returnData = []
+
+	for parentPath in moduleParentPaths:
+		parentPath = parentPath.replace("\\", "/")
+		if not os.path.isfile(parentPath + "/" + GLOB_moduleDirectoryFlag):
+			mnsLog.log("The module path specefied - \'" + parentPath + "\' isn't an mns module directory. Skipping.", svr = 2)
+			continue
+
+		#parent directory- group names
+		parentMTime = getPathMTime(parentPath)
+		cachedParent = catalog["parents"].get(parentPath, None)
+		if cachedParent and cachedParent["mtime"] == parentMTime:
+			parents[parentPath] = cachedParent
+		else:
+			parents[parentPath] = {"mtime": parentMTime, "groups": listSubDirectories(parentPath)}
+			changed = True
+
+		parentGroups = []
+		for groupName in parents[parentPath]["groups"]:
+			groupPath = parentPath + "/" + groupName
+
+			#group directory- module names
+			groupMTime = getPathMTime(groupPath)
+			cachedGroup = catalog["groups"].get(groupPath, None)
+			if cachedGroup and cachedGroup["mtime"] == groupMTime:
+				groups[groupPath] = cachedGroup
+			else:
+				groups[groupPath] = {"mtime": groupMTime, "modules": listSubDirectories(groupPath) if os.path.isdir(groupPath) else []}
+				changed = True
+
+			groupEntries = []
+			for moduleDirName in groups[groupPath]["modules"]:
+				modulePath = groupPath + "/" + moduleDirName
+				cachedModule = catalog["modules"].get(modulePath, None)
+				if cachedModule and cachedModule["stamp"] == getModuleStamp(modulePath):
+					modules[modulePath] = cachedModule
+				else:
+					modules[modulePath] = buildModuleEntry(modulePath)
+					changed = True
+				groupEntries.append(modules[modulePath])
+			parentGroups.append((groupName, groupEntries))
+		returnData.append((parentPath, parentGroups))
+
+	if changed or len(modules) != len(catalog["modules"]):
+		catalog.update({"parents": parents, "groups": groups, "modules": modules})
+		if save: saveModuleCatalog(catalog)
+
+	#return; list (parent path, [(group name, [module entries])])
+	return returnData
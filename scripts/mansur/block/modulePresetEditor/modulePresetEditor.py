@@ -257,6 +257,8 @@ class MnsModulePresetEditor(form_class, base_class):
 		dataAssembly = kwargs.get("dataAssembly", self.currentPreset)
 
 		if dataAssembly and "data" in dataAssembly:
+			#make sure all lazy settings sections are drawn before applying
+			self.settingsWindowDynUI.drawAll()
 			for attrKey in self.settingsWindowDynUI.attrComponentPairing.keys():
 				UIComponent = self.settingsWindowDynUI.attrComponentPairing[attrKey]
 				
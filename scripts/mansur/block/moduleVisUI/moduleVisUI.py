@@ -453,12 +453,7 @@ class MnsModuleVisUI(form_class, base_class):
 				btnDict[btnKey].setChecked(btnStates[k])
 				btnDict[btnKey].blockSignals(False)
 
-		from ...core.globals import GLOB_mnsPickerInstances
-		for pickerInstanceName in GLOB_mnsPickerInstances.keys():
-			pickerInstance = GLOB_mnsPickerInstances[pickerInstanceName]
-			if pickerInstance:
-				if pickerInstance.rigTop.node == self.rigTop.node:
-					pickerInstance.setBtnVisStateBasedOnPupetRootAttr(attrKey)
+		#open picker instances react to the vis attribute change through their own attribute-changed callback
 
 		return btnStates
 
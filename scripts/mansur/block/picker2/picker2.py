@@ -16,7 +16,7 @@ import pymel.core as pm
 
 from functools import partial
 from pymel.core import datatypes as pmDt
-import os
+import os, math
 
 #mns dependencies
 from ...core import log as mnsLog
@@ -48,15 +48,21 @@ windowBaseName = "mnsPicker2"
 globalsVarName = "mnsPickerInstances"
 
 form_class, base_class = mnsUIUtils.buildFormBaseClassForUI(os.path.dirname(__file__), "mnsPicker2.ui")
-class picker2QPushButton(QtWidgets.QPushButton):
-	"""A simple QPushButton re-implementation.
-	This reimplementation is used to control the button's mouse events, used in 'Edit' mode.
+#button pixmap cache, shared by all picker instances.
+#keyed by the button's style, size, state and zoom level, so identical buttons share the same rendered pixmap.
+buttonPixmapCache = {}
+buttonPixmapCacheLimit = 4000
+
+class picker2ButtonItem(QtWidgets.QGraphicsObject):
+	"""A lightweight, retained-mode picker button.
+	The button is drawn from cached pixmaps (per style, state and zoom level), instead of embedding a QPushButton widget within a QGraphicsProxyWidget.
+	Being a plain graphics item, the button is indexed by the scene's BSP tree, used for click and rubber-band hit testing.
 	"""
 
 	def __init__(self, parent = None, plgNode = None, **kwargs):
-		super(picker2QPushButton, self).__init__()
-		self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
-		self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+		super(picker2ButtonItem, self).__init__(parent)
+		self.setAcceptHoverEvents(True)
+		self.setAcceptedMouseButtons(QtCore.Qt.LeftButton | QtCore.Qt.RightButton)
 
 		##locals
 		self.pickerWin = kwargs.get("pickerWin", None)
@@ -66,6 +72,9 @@ class picker2QPushButton(QtWidgets.QPushButton):
 		self.filterConnectedControls()
 		self.isFacial = kwargs.get("isFacial", False)
 		self.last = ""
+		self.checked = False
+		self.hovered = False
+		self.pressed = False
 
 		#style
 		self.plgColor = kwargs.get("plgColor", [255,255,255])
@@ -79,11 +88,10 @@ class picker2QPushButton(QtWidgets.QPushButton):
 		self.positionV = kwargs.get("positionV", 0.0)
 		self.scaleH = kwargs.get("scaleH", 1.0)
 		self.scaleV = kwargs.get("scaleV", 1.0)
+		self.styleKey = None
 
 		self.setButtonStyle()
 		self.setPositionAndScale()
-		self.connectSignals()
-		#self.setButtonVis()
 
 	def filterConnectedControls(self):
 		self.connectedControls = []
@@ -106,63 +114,144 @@ class picker2QPushButton(QtWidgets.QPushButton):
 				if len(self.connectedControls) == 1 and not self.plgNode.isFree.get():
 					self.directConnectedCtrl = self.connectedControls[0]
 
-	def mouseDoubleClickEvent(self, QMouseEvent):
-		self.last = "double"
+	### widget-like interface #################
 
-		clickMode = "select"
-		if QMouseEvent.buttons() == QtCore.Qt.RightButton:
-			clickMode = "reset"
+	def setHidden(self, state):
+		self.setVisible(not state)
 
-		self.btnDoubleClickedTrigger(clickMode = clickMode)
-		return True
-		#return super(picker2QPushButton, self).mouseDoubleClickEvent(QMouseEvent)
+	def isChecked(self):
+		return self.checked
 
-	def connectSignals(self):
-		self.released.connect(self.pickerButtonClickAction)
-		self.customContextMenuRequested.connect(self.rightClickedTrigger)
+	def setChecked(self, state):
+		state = bool(state)
+		if state != self.checked:
+			self.checked = state
+			self.update()
 
-	def setButtonVis(self):
-		if self.directConnectedCtrl:
-			if not self.directConnectedCtrl.v.get():
-				self.setHidden(True)
+	def geometry(self):
+		return self.sceneBoundingRect()
 
-	def updateButtonVis(self):
-		if self.directConnectedCtrl:
-			self.setHidden(not self.directConnectedCtrl.isVisible())
+	### draw ##################################
 
 	def setButtonStyle(self):
-		#color and behaviour
-		self.setStyleSheet("\
-							QPushButton{\
-										background-color: rgb(" + str(self.plgColor[0]) + "," + str(self.plgColor[1]) + "," + str(self.plgColor[2]) +"); \n\
-										color: rgb(" + str(self.textColor[0]) + "," + str(self.textColor[1]) + "," + str(self.textColor[2]) + ");\n\
-										border-radius:3px;\n\
-										border-style:solid;\n\
-										border-width:1;\n\
-										border-color:#000000\
-										}\n\
-							QPushButton:hover{background-color:#eaeaea;}\n\
-							QPushButton:pressed{background-color:#616161;border-color:#0084ff;border-width:2;}\n\
-							QPushButton:checked{background-color:#616161;border-color:#0084ff;border-width:2;}"
-							)
-
-		#text
-		self.setText(self.text) 
-		textFont=QtGui.QFont()
-		textFont.setBold(self.isBold)
-		textFont.setItalic(self.isItalic)
-		textFont.setUnderline(self.isUnderline)
-		textFont.setPointSize(self.fontSize)
-		self.setFont(textFont)
-		self.setCheckable(True)
+		self.styleKey = (tuple(self.plgColor), tuple(self.textColor), self.text, self.isBold, self.isItalic, self.isUnderline, self.fontSize, self.scaleH, self.scaleV)
+		self.setToolTip(self.text)
+		self.update()
 
 	def setPositionAndScale(self):
-		self.move(self.positionH, self.positionV)
-		self.resize(self.scaleH, self.scaleV)
+		self.prepareGeometryChange()
+		self.setPos(self.positionH, self.positionV)
+
+	def boundingRect(self):
+		return QtCore.QRectF(0, 0, self.scaleH, self.scaleV)
+
+	def getButtonState(self):
+		if self.pressed or self.checked: return "checked"
+		elif self.hovered: return "hover"
+		else: return "normal"
+
+	def renderButtonPixmap(self, state, lod):
+		"""Render the button into a new pixmap, for the given state and zoom level.
+		Colors, border and font follow the picker's button style (normal, hover and checked/pressed).
+		"""
+
+		pixmap = QtGui.QPixmap(max(1, int(round(self.scaleH * lod))), max(1, int(round(self.scaleV * lod))))
+		pixmap.fill(QtCore.Qt.transparent)
+
+		bgColor = QtGui.QColor(int(self.plgColor[0]), int(self.plgColor[1]), int(self.plgColor[2]))
+		borderColor = QtGui.QColor("#000000")
+		borderWidth = 1.0
+		if state == "hover":
+			bgColor = QtGui.QColor("#eaeaea")
+		elif state == "checked":
+			bgColor = QtGui.QColor("#616161")
+			borderColor = QtGui.QColor("#0084ff")
+			borderWidth = 2.0
+
+		painter = QtGui.QPainter(pixmap)
+		painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+		painter.setRenderHint(QtGui.QPainter.TextAntialiasing, True)
+		painter.scale(lod, lod)
+
+		rect = QtCore.QRectF(borderWidth / 2.0, borderWidth / 2.0, self.scaleH - borderWidth, self.scaleV - borderWidth)
+		painter.setPen(QtGui.QPen(borderColor, borderWidth))
+		painter.setBrush(QtGui.QBrush(bgColor))
+		painter.drawRoundedRect(rect, 3, 3)
+
+		if self.text:
+			textFont = QtGui.QFont()
+			textFont.setBold(self.isBold)
+			textFont.setItalic(self.isItalic)
+			textFont.setUnderline(self.isUnderline)
+			textFont.setPointSize(max(1, int(self.fontSize)))
+			painter.setFont(textFont)
+			painter.setPen(QtGui.QColor(int(self.textColor[0]), int(self.textColor[1]), int(self.textColor[2])))
+			painter.drawText(rect, QtCore.Qt.AlignCenter, self.text)
+		painter.end()
+
+		#return; QPixmap
+		return pixmap
+
+	def getButtonPixmap(self, state, lod):
+		#snap the zoom level to steps, to keep the amount of cached pixmaps per button low
+		lod = max(0.25, min(8.0, 2.0 ** (round(math.log(max(lod, 0.0001), 2) * 2) / 2.0)))
+		cacheKey = (self.styleKey, state, lod)
+
+		if not cacheKey in buttonPixmapCache:
+			if len(buttonPixmapCache) > buttonPixmapCacheLimit: buttonPixmapCache.clear()
+			buttonPixmapCache[cacheKey] = self.renderButtonPixmap(state, lod)
+
+		#return; QPixmap
+		return buttonPixmapCache[cacheKey]
+
+	def paint(self, painter, option, widget = None):
+		lod = QtWidgets.QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+		pixmap = self.getButtonPixmap(self.getButtonState(), lod)
+		painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform, True)
+		painter.drawPixmap(self.boundingRect(), pixmap, QtCore.QRectF(pixmap.rect()))
+
+	### events ################################
+
+	def hoverEnterEvent(self, event):
+		self.hovered = True
+		self.update()
+
+	def hoverLeaveEvent(self, event):
+		self.hovered = False
+		self.update()
+
+	def mousePressEvent(self, event):
+		self.pressed = True
+		self.update()
+		event.accept()
+
+	def mouseReleaseEvent(self, event):
+		self.pressed = False
+		self.update()
+
+		if event.button() == QtCore.Qt.LeftButton and self.boundingRect().contains(event.pos()):
+			self.pickerButtonClickAction()
+		event.accept()
+
+	def mouseDoubleClickEvent(self, event):
+		self.last = "double"
+
+		clickMode = "select"
+		if event.buttons() == QtCore.Qt.RightButton:
+			clickMode = "reset"
+
+		self.btnDoubleClickedTrigger(clickMode = clickMode)
+		event.accept()
+
+	def contextMenuEvent(self, event):
+		self.rightClickedTrigger()
+		event.accept()
+
+	### actions ###############################
 
 	def pickerButtonClickAction(self):
 		"""The global action trigger for any picker UI button click trigger.
-		   This method will trigger the "controls selection" and the "action script" for the passed in QPushButton passed in.
+		   This method will trigger the "controls selection" and the "action script" for the passed in button.
 		"""
 
 		if self.last == "double":
@@ -177,9 +266,12 @@ class picker2QPushButton(QtWidgets.QPushButton):
 					blkUtils.executeActionScript(self.plgNode)
 					blkUtils.selectRelatedControls(self.connectedControls, mode)
 
+			#re-sync the button, in case the selection didn't change
+			if self.pickerWin: self.pickerWin.syncButtonCheckState(self)
+
 	def btnDoubleClickedTrigger(self, clickMode = "select"):
 		"""The global action trigger for any picker UI button double click trigger.
-		   This method will trigger the "hierarchy selection" and the "action script" for the passed in QPushButton passed in.
+		   This method will trigger the "hierarchy selection" and the "action script" for the passed in button.
 		"""
 
 		def getControlHierarchy(control = None):
@@ -210,6 +302,12 @@ class MnsPickerGraphicsScene(QtWidgets.QGraphicsScene):
 
 		self.setSceneRect(-self.sceneWidth / 2, -self.sceneHeight / 2, self.sceneWidth, self.sceneHeight)	
 
+		#the buttons are static, hence a BSP index is used for all hit testing (clicks and rubber-band)
+		if int(cmds.about(version = True)) > 2024:
+			self.setItemIndexMethod(self.ItemIndexMethod.BspTreeIndex)
+		else:
+			self.setItemIndexMethod(self.BspTreeIndex)
+
 class MnsPickerGraphicViewWidget(QtWidgets.QGraphicsView):
 	def __init__(self, parent=mnsUIUtils.get_maya_window()):
 		QtWidgets.QGraphicsView.__init__(self)
@@ -269,15 +367,17 @@ class MnsPickerGraphicViewWidget(QtWidgets.QGraphicsView):
 		self.setBackgroundBrush(QtGui.QBrush(QtGui.QColor(70, 70, 70, 255)))
 
 
+	def getButtons(self):
+		return [item for item in self.scene().items() if isinstance(item, picker2ButtonItem)]
+
 	def getSelectedItems(self):
-		return [btnProxy for btnProxy in self.scene().items() if not type(btnProxy) is QtWidgets.QGraphicsPixmapItem and btnProxy.widget().isChecked()]
-		#
+		return [btn for btn in self.getButtons() if btn.isChecked()]
 
 	def getControllersInView(self):
 		if self.pickerWindowObj.visibleOnly_cbx.isChecked():
-			return [btnProxy.widget().directConnectedCtrl for btnProxy in self.scene().items() if not type(btnProxy) is QtWidgets.QGraphicsPixmapItem and btnProxy.widget().isVisible() and btnProxy.widget().directConnectedCtrl]
+			return [btn.directConnectedCtrl for btn in self.getButtons() if btn.isVisible() and btn.directConnectedCtrl]
 		else:
-			return [btnProxy.widget().directConnectedCtrl for btnProxy in self.scene().items() if not type(btnProxy) is QtWidgets.QGraphicsPixmapItem  and btnProxy.widget().directConnectedCtrl]
+			return [btn.directConnectedCtrl for btn in self.getButtons() if btn.directConnectedCtrl]
 
 	def getContentBoundingRect(self, fromSel = False):
 		returnRect = QtCore.QRect()
@@ -501,11 +601,10 @@ class MnsPickerGraphicViewWidget(QtWidgets.QGraphicsView):
 	def determaineSelection(self):
 		controls = []
 		if self.rubberBandGeometry.isValid():
-			for btnProxy in self.scene().items():
-				if btnProxy.isVisible() and type(btnProxy) != QtWidgets.QGraphicsPixmapItem:
-					btn = btnProxy.widget()
-					if self.rubberBandGeometry.intersects(self.mapFromScene(btn.geometry()).boundingRect()):
-						controls += btn.connectedControls
+			#BSP indexed query
+			for btn in self.scene().items(self.mapToScene(self.rubberBandGeometry), QtCore.Qt.IntersectsItemBoundingRect):
+				if isinstance(btn, picker2ButtonItem) and btn.isVisible():
+					controls += btn.connectedControls
 
 		mode = blkUtils.getKeyboardModifiersState()
 		blkUtils.selectRelatedControls(controls, mode)
@@ -592,7 +691,7 @@ class MnsPicker2(form_class, base_class):
 		#methods
 		self.installEventFilter(self)
 		self.initializeUI()	
-		self.refreshBtnState()
+		self.refreshBtnState(force = True)
 		self.connectSignals()
 
 	def recSetInstanceName(self, idx = 0):
@@ -773,43 +872,92 @@ class MnsPicker2(form_class, base_class):
 
 			if not puppetName in self.visRelationMapByRigTopKey.keys():
 				self.visRelationMapByRigTopKey[puppetName] = self.createVisRelationMapForRigTop()
+				self.registerVisDriversCallback(puppetName)
 
-	def setBtnVisStateBasedOnPupetRootAttr(self, visAttr):
-		if self.rigTop and self.puppetRoot:
-			puppetName = self.rigName_cb.currentText()
-			
-			if puppetName in self.visRelationMapByRigTopKey.keys():
-				puppetVisMap = self.visRelationMapByRigTopKey[puppetName]["puppetRootMap"]
-				
-				splitNameArray = visAttr.attrName().split("_")
-				if len(splitNameArray) == 3 and len(splitNameArray[0]) == 1:
-					if visAttr.name() in puppetVisMap.keys():
-						attrState = visAttr.get()
-						
-						btnStates = {"primaryVis": False, "secondaryVis": False, "tertiaryVis": False}
-						if attrState == 1: btnStates = {"primaryVis": True, "secondaryVis": False, "tertiaryVis": False}
-						elif attrState == 2: btnStates = {"primaryVis": True, "secondaryVis": True, "tertiaryVis": False}
-						elif attrState == 3: btnStates = {"primaryVis": True, "secondaryVis": True, "tertiaryVis": True}
-						elif attrState == 4: btnStates = {"primaryVis": False, "secondaryVis": True, "tertiaryVis": False}
-						elif attrState == 5: btnStates = {"primaryVis": False, "secondaryVis": False, "tertiaryVis": True}
-						elif attrState == 6: btnStates = {"primaryVis": False, "secondaryVis": True, "tertiaryVis": True}
-						elif attrState == 7: btnStates = {"primaryVis": True, "secondaryVis": False, "tertiaryVis": True}
-
-						for grpKey in btnStates.keys():
-							btnState = btnStates[grpKey]
-							for btn in puppetVisMap[visAttr.name()][grpKey]:
-								btn.setHidden(not btnState)
+	def registerVisDriversCallback(self, puppetName):
+		"""Register an attribute-changed callback on the puppet root, which hosts all of the mapped vis driver attributes.
+		Button visibility is then updated only when a vis driver actually changes, instead of querying each control's DAG visibility.
+		"""
+
+		if self.puppetRoot and puppetName in self.puppetPickersDict.keys():
+			pickerDef = self.puppetPickersDict[puppetName]
+			if not pickerDef.get("visCallbackID", None):
+				visRelationMap = self.visRelationMapByRigTopKey.get(puppetName, None) or {}
+				pickerDef["visAttrKeyByAttrName"] = dict((visAttrKey.split(".")[-1], visAttrKey) for visAttrKey in visRelationMap.get("puppetRootMap", {}))
+				pickerDef["pendingVisAttrs"] = set()
+				pickerDef["visCallbackID"] = OpenMaya.MNodeMessage.addAttributeChangedCallback(mnsUtils.getMObjectFromObjName(self.puppetRoot.node.name()), visDriverChangedCB, {"pickerWin": self, "puppetName": puppetName})
+
+	def queueVisDriverChange(self, puppetName, attrName):
+		"""Queue a changed vis driver attribute, and schedule a single batched update for all queued changes.
+		Attributes which aren't mapped vis drivers are ignored.
+		"""
+
+		if puppetName in self.puppetPickersDict.keys():
+			pickerDef = self.puppetPickersDict[puppetName]
+			if attrName in pickerDef["visAttrKeyByAttrName"]:
+				pendingVisAttrs = pickerDef["pendingVisAttrs"]
+				if not pendingVisAttrs:
+					QtCore.QTimer.singleShot(0, partial(self.flushVisDriverChanges, puppetName))
+				pendingVisAttrs.add(pickerDef["visAttrKeyByAttrName"][attrName])
+
+	def flushVisDriverChanges(self, puppetName):
+		if puppetName in self.puppetPickersDict.keys():
+			pendingVisAttrs = self.puppetPickersDict[puppetName]["pendingVisAttrs"]
+			visAttrNames = list(pendingVisAttrs)
+			pendingVisAttrs.clear()
+			self.setBtnVisStateBasedOnVisAttrs(visAttrNames, puppetName = puppetName)
+
+	def getBtnVisStatesForVisAttrState(self, attrState):
+		btnStates = {"primaryVis": False, "secondaryVis": False, "tertiaryVis": False}
+		if attrState == 1: btnStates = {"primaryVis": True, "secondaryVis": False, "tertiaryVis": False}
+		elif attrState == 2: btnStates = {"primaryVis": True, "secondaryVis": True, "tertiaryVis": False}
+		elif attrState == 3: btnStates = {"primaryVis": True, "secondaryVis": True, "tertiaryVis": True}
+		elif attrState == 4: btnStates = {"primaryVis": False, "secondaryVis": True, "tertiaryVis": False}
+		elif attrState == 5: btnStates = {"primaryVis": False, "secondaryVis": False, "tertiaryVis": True}
+		elif attrState == 6: btnStates = {"primaryVis": False, "secondaryVis": True, "tertiaryVis": True}
+		elif attrState == 7: btnStates = {"primaryVis": True, "secondaryVis": False, "tertiaryVis": True}
+
+		#return; dict (vis group name: visibility state)
+		return btnStates
+
+	def setBtnVisStateBasedOnVisAttrs(self, visAttrNames = [], **kwargs):
+		"""Update the buttons related to the given vis driver attributes in a single batch.
+		The new state for every related button is resolved first, then all buttons are set while the views' updates are disabled.
+		"""
+
+		puppetName = kwargs.get("puppetName", self.rigName_cb.currentText()) #arg; comment = the puppet (picker definition) to update
+
+		if puppetName in self.visRelationMapByRigTopKey.keys() and puppetName in self.puppetPickersDict.keys():
+			visRelationMap = self.visRelationMapByRigTopKey[puppetName]
+			if not visRelationMap or not "puppetRootMap" in visRelationMap: return
+			puppetVisMap = visRelationMap["puppetRootMap"]
+
+			btnVisStates = {}
+			for visAttrName in visAttrNames:
+				if visAttrName in puppetVisMap.keys():
+					attrState = cmds.getAttr(visAttrName)
+					btnStates = self.getBtnVisStatesForVisAttrState(attrState)
+					for grpKey in btnStates.keys():
+						if grpKey in puppetVisMap[visAttrName]:
+							for btn in puppetVisMap[visAttrName][grpKey]:
+								btnVisStates[btn] = btnStates[grpKey]
+
+			if btnVisStates:
+				pickerDef = self.puppetPickersDict[puppetName]
+				views = [pickerDef["bodyQGV"], pickerDef["faceQGV"]]
+				for view in views: view.setUpdatesEnabled(False)
+				for btn in btnVisStates:
+					btn.setHidden(not btnVisStates[btn])
+				for view in views: view.setUpdatesEnabled(True)
 
 	def setBtnVisStateBasedOnPupetRoot(self):
 		if self.rigTop and self.puppetRoot:
 			puppetName = self.rigName_cb.currentText()
 			
 			if puppetName in self.visRelationMapByRigTopKey.keys():
-				puppetVisMap = self.visRelationMapByRigTopKey[puppetName]["puppetRootMap"]
-
-				puppetRootVisAttrs = self.puppetRoot.node.listAttr(ud = True, unlocked = True)
-				for visAttr in puppetRootVisAttrs:
-					self.setBtnVisStateBasedOnPupetRootAttr(visAttr)
+				visRelationMap = self.visRelationMapByRigTopKey[puppetName]
+				if visRelationMap and "puppetRootMap" in visRelationMap:
+					self.setBtnVisStateBasedOnVisAttrs(list(visRelationMap["puppetRootMap"].keys()), puppetName = puppetName)
 
 	def initializePuppetPicker(self):
 		"""Main method for the global UI draw.
@@ -846,13 +994,20 @@ class MnsPicker2(form_class, base_class):
 				#draw all buttons
 				plgs = blkUtils.getAllPlgsForRigTop(self.rigTop)
 				ctrlToButtonMap = {}
+				ctrlNameToButtonsMap = {}
 				if plgs:
 					for plg in plgs: 
 						plgBtn = self.drawPlgButton(plg, bodyQGV, faceQGV)
 						if plgBtn and plgBtn.directConnectedCtrl:
 							ctrlToButtonMap[plgBtn.directConnectedCtrl] = plgBtn
+							ctrlName = plgBtn.directConnectedCtrl.nodeName()
+							if not ctrlName in ctrlNameToButtonsMap: ctrlNameToButtonsMap[ctrlName] = []
+							ctrlNameToButtonsMap[ctrlName].append(plgBtn)
 				newPickerDefinition.update({"ctrlToButtonMap": ctrlToButtonMap})
 				
+				#selection sync index- control name to buttons, and the last synced selection state
+				newPickerDefinition.update({"ctrlNameToButtonsMap": ctrlNameToButtonsMap, "lastSelectedCtrlNames": set()})
+				
 				#set a new index to the new def
 				newPickerDefinition.update({"index": self.mainStack_sw.count()})
 
@@ -881,6 +1036,9 @@ class MnsPicker2(form_class, base_class):
 			self.setThumbnail()
 
 			self.setBtnVisStateBasedOnPupetRoot()
+
+			#sync to the current selection, which may have changed while this puppet wasn't displayed
+			self.refreshBtnState()
 			
 			#resize window if initial run
 			if initialRun:
@@ -1030,7 +1188,7 @@ class MnsPicker2(form_class, base_class):
 				status, isFacial = mnsUtils.validateAttrAndGet(plg, "isFacial", False)
 
 				### create
-				plgBtn = picker2QPushButton(pickerWin = self,
+				plgBtn = picker2ButtonItem(pickerWin = self,
 											plgNode = plg, 
 											plgColor = [(plgColor[0] * 255), (plgColor[1] * 255), (plgColor[2] * 255)],
 											textColor = [plg.textColorR.get(), plg.textColorG.get(), plg.textColorB.get()],
@@ -1045,8 +1203,8 @@ class MnsPicker2(form_class, base_class):
 											scaleV = plgSize[1],
 											isFacial = isFacial)
 				#add to view
-				if isFacial: proxyItem = faceQGV.scene().addWidget(plgBtn)
-				else: proxyItem = bodyQGV.scene().addWidget(plgBtn)
+				if isFacial: faceQGV.scene().addItem(plgBtn)
+				else: bodyQGV.scene().addItem(plgBtn)
 				return plgBtn
 
 	def destroyAction(self, dummy = None):
@@ -1064,6 +1222,11 @@ class MnsPicker2(form_class, base_class):
 		try: OpenMaya.MMessage.removeCallback(self.sceneOpenedCallback)
 		except: pass
 
+		for puppetName in self.puppetPickersDict.keys():
+			try: OpenMaya.MMessage.removeCallback(self.puppetPickersDict[puppetName]["visCallbackID"])
+			except: pass
+			self.puppetPickersDict[puppetName]["visCallbackID"] = None
+
 	def eventFilter(self, source, event):
 		"""Override event filter to catch the close trigger to delete the callback
 		"""
@@ -1083,53 +1246,98 @@ class MnsPicker2(form_class, base_class):
 
 		return super(QtWidgets.QWidget, self).eventFilter(source, event)
 
-	def refreshButtonVisibility(self):
-		for btnProxy in (self.bodyQGV.scene().items() + self.faceQGV.scene().items()):
-			if not type(btnProxy) is QtWidgets.QGraphicsPixmapItem:
-				btn =  btnProxy.widget()
-				
-				if btn.directConnectedCtrl:
-					shp = btn.directConnectedCtrl.getShape()
-					if shp and shp.isVisible():
-						btn.setHidden(False)
-					else:
-						btn.setHidden(True)
-				else: 
+	def refreshButtonVisibility(self, **kwargs):
+		"""Refresh all buttons visibility state.
+		By default, the state is re-evaluated from the mapped vis driver attributes only.
+		A full per-button DAG visibility query is performed only when explicitly requested.
+		"""
+
+		fullQuery = kwargs.get("fullQuery", False) #arg; comment = query each button's connected control visibility through the DAG
+
+		if not fullQuery:
+			self.setBtnVisStateBasedOnPupetRoot()
+			return
+
+		for btn in (self.bodyQGV.getButtons() + self.faceQGV.getButtons()):
+			if btn.directConnectedCtrl:
+				shp = btn.directConnectedCtrl.getShape()
+				if shp and shp.isVisible():
 					btn.setHidden(False)
+				else:
+					btn.setHidden(True)
+			else: 
+				btn.setHidden(False)
+
+	def getSelectedCtrlNames(self):
+		"""Collect the current scene selection as a set of control node names, relevant to the current rig-top.
+		"""
+
+		selectedCtrlNames = set()
+
+		if not self.namespace:
+			rigTopBodyName = self.rigTop.body
+			for s in cmds.ls("*_ctrl", sl = True, type = "transform"):
+				if "|" in s:
+					if rigTopBodyName in s:
+						selectedCtrlNames.add(s.split("|")[-1])
+				else:
+					selectedCtrlNames.add(s)
+		else: 
+			selectedCtrlNames.update(cmds.ls(self.namespace + ":*_ctrl", sl = True, type = "transform"))
+
+		for s in cmds.ls("*_cnsCtrl", sl = True, type = "transform"):
+			cnsSlave = blkUtils.locateCnsForCtrl(s, slaveOnly = True)
+			cnsSlave = mnsUtils.validateNameStd(cnsSlave)
+			if cnsSlave: selectedCtrlNames.add(cnsSlave.node.nodeName())
+
+		#return; set (selected control names)
+		return selectedCtrlNames
+
+	def syncButtonCheckState(self, btn):
+		"""Re-sync a single button's checked state to the last synced selection.
+		Used after a button was toggled directly by a click, in which case the selection state may not have changed at all.
+		"""
+
+		puppetName = self.rigName_cb.currentText()
+		if btn and puppetName in self.puppetPickersDict.keys():
+			lastSelectedCtrlNames = self.puppetPickersDict[puppetName]["lastSelectedCtrlNames"]
+			btn.setChecked(bool(btn.directConnectedCtrl) and btn.directConnectedCtrl.nodeName() in lastSelectedCtrlNames)
+
+	def refreshBtnState(self, dummy = None, **kwargs):
+		"""Sync the picker buttons checked state to the current scene selection.
+		Instead of iterating all buttons, the selection is diffed against the last synced state,
+		and only the buttons related to the changed controls are toggled, using the control name to buttons map created in initializePuppetPicker.
+		"""
+
+		force = kwargs.get("force", False) #arg; comment = re-sync all buttons, regardless of the last synced selection state
+
+		puppetName = self.rigName_cb.currentText()
+		if not puppetName in self.puppetPickersDict.keys(): return
 
-	def refreshBtnState(self, dummy = None):
 		try:
-			sel = []
-			if not self.namespace:
-				selA = cmds.ls("*_ctrl", sl = True, type = "transform")
-				
-				sel = []
-				rigTopBodyName = self.rigTop.body
-				for s in selA:
-					if "|" in s:
-						if rigTopBodyName in s:
-							sel.append(s.split("|")[-1])
-					else:
-						sel.append(s)
-			else: 
-				sel = cmds.ls(self.namespace + ":*_ctrl", sl = True, type = "transform")
-
-			for s in cmds.ls("*_cnsCtrl", sl = True, type = "transform"):
-				sel.append(blkUtils.locateCnsForCtrl(s, slaveOnly = True))
-
-			for btnProxy in (self.bodyQGV.scene().items() + self.faceQGV.scene().items()):
-				if not type(btnProxy) is QtWidgets.QGraphicsPixmapItem:
-					btn =  btnProxy.widget()
-					
-					if btn.directConnectedCtrl:
-						if btn.directConnectedCtrl.nodeName() in sel: 
-							btn.setChecked(True)
-						else: 
-							btn.setChecked(False)
-					else: 
-						btn.setChecked(False)
-		except:
-			pass
+			refreshTimer = pm.timerX()
+			pickerDef = self.puppetPickersDict[puppetName]
+			ctrlNameToButtonsMap = pickerDef["ctrlNameToButtonsMap"]
+
+			selectedCtrlNames = self.getSelectedCtrlNames()
+			lastSelectedCtrlNames = pickerDef["lastSelectedCtrlNames"]
+			if force:
+				lastSelectedCtrlNames = set(ctrlNameToButtonsMap.keys())
+				for btn in (self.bodyQGV.getButtons() + self.faceQGV.getButtons()):
+					if not btn.directConnectedCtrl: btn.setChecked(False)
+
+			toggledCount = 0
+			for ctrlName in (selectedCtrlNames ^ lastSelectedCtrlNames):
+				if ctrlName in ctrlNameToButtonsMap:
+					isSelected = ctrlName in selectedCtrlNames
+					for btn in ctrlNameToButtonsMap[ctrlName]:
+						btn.setChecked(isSelected)
+						toggledCount += 1
+
+			pickerDef["lastSelectedCtrlNames"] = selectedCtrlNames
+			mnsLog.log("Picker selection sync- " + str(toggledCount) + " buttons toggled in " + str(pm.timerX(st = refreshTimer)) + " seconds.", svr = 0)
+		except Exception as e:
+			mnsLog.log("Picker selection sync failed- " + str(e), svr = 2)
 
 	def getControllersInView(self):
 		if self.currentTabWidget.currentIndex() == 0:
@@ -1154,6 +1362,10 @@ class MnsPicker2(form_class, base_class):
 		mnsLog.log("mnsPicker2", svr = 0)
 		self.show()
 	
+def visDriverChangedCB(msg, plug, otherPlug, clientData, **kwargs):
+	if msg & OpenMaya.MNodeMessage.kAttributeSet:
+		clientData["pickerWin"].queueVisDriverChange(clientData["puppetName"], plug.partialName(False, False, False, False, False, True))
+
 def closeAllInstances(idx = 0):
 	previousPosition = None
 
@@ -23,6 +23,7 @@ from ...core import log as mnsLog
 from ...core.prefixSuffix import *
 from ...core import string as mnsString
 from ...core import utility as mnsUtils
+from ...core import animUtility as mnsAnimUtils
 from ...core import UIUtils as mnsUIUtils
 from ..core import blockUtility as blkUtils
 from ...core.globals import *
@@ -320,32 +321,90 @@ class MnsSpacesTool(form_class, base_class):
 					if not ctrl.node in frameIdicesCtrlsPairing.keys(): 
 						#get current relevant frame indices
 						seqRange = self.getFramesListFromUIState(ctrl.node, spaceAttr.attrName())
-						#get all target xforms from all frames
-						xFormPairing = {}
-						for frameIdx in seqRange:
-							pm.currentTime(frameIdx)
-							xForm = pm.xform(ctrl.node, q=1, ws=1, matrix = True)
-							xFormPairing.update({frameIdx: xForm})
-
 						allFrameIndecies = sorted(list(dict.fromkeys(allFrameIndecies + seqRange)))
-						frameIdicesCtrlsPairing.update({ctrl.node: {"frameIndices": seqRange, "attribute": spaceAttr, "xFormPairing": xFormPairing, "keyControl": ctrl.node}})
+						frameIdicesCtrlsPairing.update({ctrl.node: {"frameIndices": seqRange, "attribute": spaceAttr, "targetEnumIndex": self.getSpaceEnumIndexByName(ctrl.node, spaceAttr, targetSpaceName), "keyControl": ctrl.node}})
 
-			#no act based on the gathed data
-			for frameIdx in allFrameIndecies:
-				pm.currentTime(frameIdx)
-				for ctrlNode in frameIdicesCtrlsPairing:
-					relevantFrameIndices = frameIdicesCtrlsPairing[ctrlNode]["frameIndices"]
-					if frameIdx in relevantFrameIndices:
-						attrObj = frameIdicesCtrlsPairing[ctrlNode]["attribute"]
-						targetXFormMatrix = frameIdicesCtrlsPairing[ctrlNode]["xFormPairing"][frameIdx]
-						targetEnumIndex = self.getSpaceEnumIndexByName(ctrlNode, attrObj, targetSpaceName)
-						attrObj.set(targetEnumIndex)
-						pm.xform(ctrlNode, ws=1, matrix = targetXFormMatrix)
-						if self.autoKey_btn.isChecked():
-							pm.setKeyframe(frameIdicesCtrlsPairing[ctrlNode]["keyControl"], time = frameIdx)
+			if frameIdicesCtrlsPairing and allFrameIndecies:
+				if self.autoKey_btn.isChecked():
+					self.spaceSwitchKeyed(frameIdicesCtrlsPairing, allFrameIndecies)
+				else:
+					self.spaceSwitchInPlace(frameIdicesCtrlsPairing, allFrameIndecies)
 
 		self.insertCallbacks()
 
+	def spaceSwitchInPlace(self, frameIdicesCtrlsPairing = {}, allFrameIndecies = []):
+		"""Switch spaces without keying- the space attribute is set, and the control's world matrix is re-applied, per frame.
+		"""
+
+		#get all target xforms from all frames
+		for ctrlNode in frameIdicesCtrlsPairing:
+			xFormPairing = {}
+			for frameIdx in frameIdicesCtrlsPairing[ctrlNode]["frameIndices"]:
+				pm.currentTime(frameIdx)
+				xFormPairing.update({frameIdx: pm.xform(ctrlNode, q=1, ws=1, matrix = True)})
+			frameIdicesCtrlsPairing[ctrlNode]["xFormPairing"] = xFormPairing
+
+		#no act based on the gathed data
+		for frameIdx in allFrameIndecies:
+			pm.currentTime(frameIdx)
+			for ctrlNode in frameIdicesCtrlsPairing:
+				if frameIdx in frameIdicesCtrlsPairing[ctrlNode]["frameIndices"]:
+					frameIdicesCtrlsPairing[ctrlNode]["attribute"].set(frameIdicesCtrlsPairing[ctrlNode]["targetEnumIndex"])
+					pm.xform(ctrlNode, ws=1, matrix = frameIdicesCtrlsPairing[ctrlNode]["xFormPairing"][frameIdx])
+
+	def spaceSwitchKeyed(self, frameIdicesCtrlsPairing = {}, allFrameIndecies = []):
+		"""Switch spaces and key the result, without moving the time-line.
+		The controls' world matrices are sampled through time-specific DG contexts, the space attributes are then keyed to the target space,
+		and the controls' local values are solved in memory against their (new) parent matrices, and keyed in bulk per channel.
+		All keyable channels are keyed on the relevant frames, as setKeyframe would.
+		"""
+
+		ctrlNodes = list(frameIdicesCtrlsPairing.keys())
+		allFrameIndices = dict((frameIdx, k) for k, frameIdx in enumerate(allFrameIndecies))
+
+		#sample target world matrices, and all other keyable channels
+		samples = mnsAnimUtils.sampleWorldMatrices(ctrlNodes, allFrameIndecies)
+		keyableChannels = {}
+		otherPlugs = []
+		for ctrlNode in ctrlNodes:
+			spaceAttrName = frameIdicesCtrlsPairing[ctrlNode]["attribute"].attrName(longName = True)
+			keyableChannels[ctrlNode] = [c for c in (cmds.listAttr(ctrlNode.longName(), k = True, s = True) or []) if c != spaceAttrName]
+			otherPlugs += [ctrlNode.longName() + "." + c for c in keyableChannels[ctrlNode] if not c in mnsAnimUtils.transformChannels and mnsAnimUtils.isPlugKeyable(ctrlNode.longName() + "." + c)]
+		otherSamples = mnsAnimUtils.sampleAttrValues(otherPlugs, allFrameIndecies)
+
+		#key the space attributes first, so the parent matrices are evaluated in the target space
+		spacePlugs = []
+		plugKeys = {}
+		for ctrlNode in ctrlNodes:
+			spaceAttr = frameIdicesCtrlsPairing[ctrlNode]["attribute"]
+			spacePlug = spaceAttr.name(fullDagPath = True)
+			frames = frameIdicesCtrlsPairing[ctrlNode]["frameIndices"]
+			if (spaceAttr.isKeyable() or spaceAttr.isAnimated()) and mnsAnimUtils.isPlugKeyable(spacePlug):
+				plugKeys[spacePlug] = (frames, [frameIdicesCtrlsPairing[ctrlNode]["targetEnumIndex"]] * len(frames))
+				spacePlugs.append(spacePlug)
+			else:
+				spaceAttr.set(frameIdicesCtrlsPairing[ctrlNode]["targetEnumIndex"])
+		mnsAnimUtils.setKeysOnPlugs(plugKeys, steppedPlugs = spacePlugs)
+
+		#solve and key the local channels
+		localChannels = mnsAnimUtils.worldSamplesToLocalChannels(samples, ctrlNodes)
+		plugKeys = {}
+		for ctrlNode in ctrlNodes:
+			nodeName = ctrlNode.longName()
+			frames = frameIdicesCtrlsPairing[ctrlNode]["frameIndices"]
+			frameIndices = [allFrameIndices[frameIdx] for frameIdx in frames]
+
+			for channel in keyableChannels[ctrlNode]:
+				plugName = nodeName + "." + channel
+				if channel in mnsAnimUtils.transformChannels:
+					if not nodeName in localChannels or not mnsAnimUtils.isPlugKeyable(plugName): continue
+					values = localChannels[nodeName][channel]
+				elif plugName in otherSamples:
+					values = otherSamples[plugName]
+				else: continue
+				plugKeys[plugName] = (frames, [values[k] for k in frameIndices])
+		mnsAnimUtils.setKeysOnPlugs(plugKeys)
+
 	def selectIKFKHost(self):
 		newSelection = []
 
@@ -395,17 +454,17 @@ class MnsSpacesTool(form_class, base_class):
 				allFrameIndecies = sorted(list(dict.fromkeys(allFrameIndecies + seqRange)))
 		
 		#no act based on the gathed data
-		for frameIdx in allFrameIndecies:
-			pm.currentTime(frameIdx)
-			for hostCtrl in frameIdicesCtrlsPairing.keys():
-				hostCtrl.ikFkBlend.set(1 - mode)
-				relevantFrameIndices = frameIdicesCtrlsPairing[hostCtrl]["frameIndices"]
-				if frameIdx in relevantFrameIndices:
-					blkUtils.limbMatchFkIK(hostCtrl, mode, ctrlsAssembly = frameIdicesCtrlsPairing[hostCtrl]["ctrlsAssembly"])
-
-					if self.autoKey_btn.isChecked():
-						pm.setKeyframe(frameIdicesCtrlsPairing[hostCtrl]["keyControls"], time = frameIdx)
-						pm.setKeyframe(hostCtrl, time = frameIdx, attribute = "ikFkBlend", v = 1 - mode)
+		if self.autoKey_btn.isChecked():
+			#range mode- match and key all frames without moving the time-line
+			blkUtils.limbMatchFkIKRange(frameIdicesCtrlsPairing, mode)
+		else:
+			for frameIdx in allFrameIndecies:
+				pm.currentTime(frameIdx)
+				for hostCtrl in frameIdicesCtrlsPairing.keys():
+					hostCtrl.ikFkBlend.set(1 - mode)
+					relevantFrameIndices = frameIdicesCtrlsPairing[hostCtrl]["frameIndices"]
+					if frameIdx in relevantFrameIndices:
+						blkUtils.limbMatchFkIK(hostCtrl, mode, ctrlsAssembly = frameIdicesCtrlsPairing[hostCtrl]["ctrlsAssembly"])
 	
 		if newSelection: pm.select(newSelection, r = True)
 
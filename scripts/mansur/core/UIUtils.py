@@ -1899,7 +1899,71 @@ def drawButtonAndFieldUnknown(MnsArgumentObj, layoutParent):
 
 	#return;QLEdit
 	return LEdit
-		
+
+def getArgumentModelValue(MnsArgumentObj, **kwargs):
+	"""Get the value a dynUI row would return for the given argument, without drawing it.
+	This mirrors the widget's initial state (as set by its draw and 'set default' commands), in the same format assembled by dynUI.assembleFeildValues.
+	Used for dynUI rows that weren't materialized (lazy sections).
+	"""
+
+	value = kwargs.get("value", MnsArgumentObj.default) #arg; comment = value to convert. Default to the argument's default.
+
+	argName = MnsArgumentObj.name.lower()
+	isString = type(value) == str or type(value) == unicode
+
+	if argName == "spaces" or (MnsArgumentObj.type == list and MnsArgumentObj.multiRowList):
+		items = [str(v) for v in value] if (value and value != ["None"] and value != [' '] and type(value) is list) else []
+		#return; list
+		return items or ["None"]
+	elif "divider" in argName:
+		return value
+	elif "schemeoverride" in argName or "colorscheme" in argName:
+		return [tuple(float(c) for c in color) for color in (value or [])]
+	elif "channelcontrol" in argName:
+		send = [" "]
+		if type(value) is dict:
+			for channel in "trs":
+				for k, axis in enumerate("xyz"):
+					if k < len(value.get(channel, [])) and value[channel][k]: send.append(channel + axis)
+		return send
+	elif "color" in MnsArgumentObj.name and MnsArgumentObj.type is tuple and len(MnsArgumentObj.default) == 3:
+		return tuple(float(c) for c in value)
+	elif "constructscripts" in argName:
+		return value if (value and isString) else ""
+	elif argName == "extrachannels":
+		currentChannelList = []
+		try: currentChannelList = json.loads(value) or []
+		except: pass
+		return json.dumps([{"attrName": str(c["attrName"]), "attrTarget": str(c.get("attrTarget", "")), "dir": str(c.get("dir", "")), "isDiv": str(c.get("isDiv", "False"))} for c in currentChannelList])
+	elif MnsArgumentObj.ob != [] and type(MnsArgumentObj.ob) is list and len(MnsArgumentObj.ob) > 0:
+		options = [str(o) for o in MnsArgumentObj.ob]
+		if MnsArgumentObj.type == str:
+			if "controlshape" in argName and isString and "txtCtrlShp_" in value:
+				return value if value.split("txtCtrlShp_")[-1] else "circle"
+			return value if (isString and value in options) else options[0]
+		else:
+			try: return int(value) if 0 <= int(value) < len(options) else 0
+			except: return 0
+	elif MnsArgumentObj.type == str or MnsArgumentObj.type == list:
+		return value if (value and isString) else ""
+	elif MnsArgumentObj.type == float:
+		minimum = float(MnsArgumentObj.min) if MnsArgumentObj.min else 0.0
+		maximum = float(MnsArgumentObj.max) if MnsArgumentObj.max else 99.99
+		try: value = float(value) if value is not None else 0.0
+		except: value = 0.0
+		return round(min(max(value, minimum), maximum), 3)
+	elif MnsArgumentObj.type == int:
+		minimum = int(MnsArgumentObj.min) if MnsArgumentObj.min else 0
+		maximum = int(MnsArgumentObj.max) if MnsArgumentObj.max else 99
+		try: value = int(value) if value else 0
+		except: value = 0
+		return min(max(value, minimum), maximum)
+	elif MnsArgumentObj.type == bool:
+		return bool(value) if value is not None else False
+
+	#return; any (value)
+	return ""
+
 def tearOffWindow(name, title, width, height, cameraToView):
 	"""Create a new maya 'tear-off' panel.
 	"""
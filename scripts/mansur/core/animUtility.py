@@ -0,0 +1,531 @@
+"""=== Author: Assaf Ben Zur ===
+Core animation utility library.
+This module holds the animation sampling and bulk keying methods used by the animation tools.
+Transforms are sampled through time-specific DG contexts (without moving the time-line),
+and keys are written as whole arrays per channel, instead of per frame setKeyframe calls.
+"""
+
+#global dependencies
+from maya.api import OpenMaya as om
+import array
+
+
+from maya import cmds
+from maya import mel
+import pymel.core as pm
+
+from . import utility as mnsUtils
+
+transformChannels = ["translateX", "translateY", "translateZ", "rotateX", "rotateY", "rotateZ", "scaleX", "scaleY", "scaleZ"]
+
+def getFramesForRange(rangeMin, rangeMax):
+	"""Return a list of integer frames for the given range (max excluded), matching python's range behaviour.
+	"""
+
+	#return; list (frames)
+	return list(range(int(rangeMin), int(rangeMax)))
+
+def getNodeLongName(node):
+	if isinstance(node, pm.PyNode): return node.longName()
+	node = mnsUtils.checkIfObjExistsAndSet(node)
+	if node: return node.longName()
+
+def evaluatePlugsAtTime(plugs = [], frame = 0, getter = None):
+	"""Evaluate the given API plugs within a time-specific DG context.
+	The time-line isn't moved, hence the scene isn't fully evaluated.
+	"""
+
+	context = om.MDGContext(om.MTime(frame, om.MTime.uiUnit()))
+	returnValues = []
+
+	if hasattr(om, "MDGContextGuard"):
+		with om.MDGContextGuard(context):
+			for plug in plugs: returnValues.append(getter(plug, None))
+	else:
+		for plug in plugs: returnValues.append(getter(plug, context))
+
+	#return; list (values)
+	return returnValues
+
+def getWorldMatrixPlugs(nodes = []):
+	mSel = om.MSelectionList()
+	for node in nodes: mSel.add(getNodeLongName(node))
+
+	#return; list (MPlug)
+	return [om.MFnDependencyNode(mSel.getDependNode(k)).findPlug("worldMatrix", False).elementByLogicalIndex(0) for k in range(len(nodes))]
+
+def getScalarFromPlug(plug, context = None):
+	"""Return the given numeric plug's value in UI units.
+	"""
+
+	attr = plug.attribute()
+	if attr.hasFn(om.MFn.kUnitAttribute):
+		unitType = om.MFnUnitAttribute(attr).unitType()
+		if unitType == om.MFnUnitAttribute.kAngle:
+			return (plug.asMAngle(context) if context else plug.asMAngle()).asUnits(om.MAngle.uiUnit())
+		elif unitType == om.MFnUnitAttribute.kDistance:
+			return (plug.asMDistance(context) if context else plug.asMDistance()).asUnits(om.MDistance.uiUnit())
+
+	#return; float
+	return plug.asDouble(context) if context else plug.asDouble()
+
+def getDefaultFromPlug(plug):
+	"""Return the given numeric plug's attribute default value in UI units.
+	"""
+
+	attr = plug.attribute()
+	if attr.hasFn(om.MFn.kUnitAttribute):
+		unitDefault = om.MFnUnitAttribute(attr).default
+		if isinstance(unitDefault, om.MAngle): return unitDefault.asUnits(om.MAngle.uiUnit())
+		elif isinstance(unitDefault, om.MDistance): return unitDefault.asUnits(om.MDistance.uiUnit())
+		return float(unitDefault.value)
+	elif attr.hasFn(om.MFn.kNumericAttribute):
+		return float(om.MFnNumericAttribute(attr).default)
+
+	#return; float
+	return 0.0
+
+def sampleAttrValues(plugNames = [], frames = []):
+	"""Sample the given numeric plugs for every given frame, using time-specific DG contexts.
+	Values are returned in UI units.
+	"""
+
+	returnData = dict((plugName, array.array("d")) for plugName in plugNames)
+
+	if plugNames and frames:
+		mSel = om.MSelectionList()
+		for plugName in plugNames: mSel.add(plugName)
+		plugs = [mSel.getPlug(k) for k in range(len(plugNames))]
+
+		for frame in frames:
+			for k, value in enumerate(evaluatePlugsAtTime(plugs, frame, getScalarFromPlug)):
+				returnData[plugNames[k]].append(value)
+
+	#return; dict (plugName: array (values per frame))
+	return returnData
+
+def getMatrixFromPlug(plug, context = None):
+	if context: return om.MFnMatrixData(plug.asMObject(context)).matrix()
+	return om.MFnMatrixData(plug.asMObject()).matrix()
+
+def sampleWorldMatrices(nodes = [], frames = []):
+	"""Sample the world matrices of the given nodes, for every given frame, using time-specific DG contexts.
+	The samples are stored as a flat (frames x nodes x 16) float array.
+	"""
+
+	nodeNames = [getNodeLongName(n) for n in nodes]
+	returnData = {"frames": list(frames), "nodes": nodeNames, "uuids": [cmds.ls(n, uuid = True)[0] for n in nodeNames], "data": array.array("d")}
+
+	if nodes and frames:
+		plugs = getWorldMatrixPlugs(nodes)
+		for frame in frames:
+			for matrix in evaluatePlugsAtTime(plugs, frame, getMatrixFromPlug):
+				returnData["data"].extend(tuple(matrix))
+
+	#return; dict (frames: list, nodes: list (long names), uuids: list, data: array (frames x nodes x 16))
+	return returnData
+
+def getSampledMatrix(samples, frameIndex, nodeIndex):
+	start = (frameIndex * len(samples["nodes"]) + nodeIndex) * 16
+
+	#return; MMatrix
+	return om.MMatrix(samples["data"][start:start + 16])
+
+def getStaticAttrValue(nodeName, attrName, default = None):
+	if cmds.attributeQuery(attrName, node = nodeName, exists = True):
+		value = cmds.getAttr(nodeName + "." + attrName)
+		if type(value) == list and len(value) == 1 and type(value[0]) == tuple: value = value[0]
+		return value
+	return default
+
+def getEulerMatrix(rotation = (0.0, 0.0, 0.0)):
+	#rotation in UI units
+	radians = [om.MAngle(v, om.MAngle.uiUnit()).asRadians() for v in rotation]
+
+	#return; MMatrix
+	return om.MEulerRotation(radians[0], radians[1], radians[2]).asMatrix()
+
+def decomposeLocalMatrix(localMatrix, nodeDef, previousEuler = None):
+	"""Decompose a local matrix into translate, rotate and scale channel values (UI units), for the given node definition.
+	The joint-orient and rotate-axis are removed from the rotation, which is then filtered against the previous frame's rotation.
+	"""
+
+	tm = om.MTransformationMatrix(localMatrix)
+	translation = tm.translation(om.MSpace.kTransform)
+	scale = tm.scale(om.MSpace.kTransform)
+
+	#local rotation = rotateAxis * rotate * jointOrient
+	rotMatrix = nodeDef["rotateAxisMatrix"].inverse() * tm.rotation(asQuaternion = True).asMatrix() * nodeDef["jointOrientMatrix"].inverse()
+	euler = om.MTransformationMatrix(rotMatrix).rotation().reorder(nodeDef["rotateOrder"])
+	if previousEuler: euler = euler.closestSolution(previousEuler)
+
+	distUnit = om.MDistance.uiUnit()
+	angleUnit = om.MAngle.uiUnit()
+	channels = {
+				"translateX": om.MDistance(translation.x).asUnits(distUnit), "translateY": om.MDistance(translation.y).asUnits(distUnit), "translateZ": om.MDistance(translation.z).asUnits(distUnit),
+				"rotateX": om.MAngle(euler.x).asUnits(angleUnit), "rotateY": om.MAngle(euler.y).asUnits(angleUnit), "rotateZ": om.MAngle(euler.z).asUnits(angleUnit),
+				"scaleX": scale[0], "scaleY": scale[1], "scaleZ": scale[2]
+				}
+
+	#return; dict (channel: value), MEulerRotation
+	return channels, euler
+
+def composeLocalMatrix(channels = {}, nodeDef = {}):
+	"""Compose a local matrix from translate, rotate and scale channel values (UI units), for the given node definition.
+	This is the inverse of decomposeLocalMatrix.
+	"""
+
+	distUnit = om.MDistance.uiUnit()
+	translation = om.MVector([om.MDistance(channels.get("translate" + axis, 0.0), distUnit).asCentimeters() for axis in "XYZ"])
+	radians = [om.MAngle(channels.get("rotate" + axis, 0.0), om.MAngle.uiUnit()).asRadians() for axis in "XYZ"]
+	rotMatrix = om.MEulerRotation(radians[0], radians[1], radians[2], nodeDef.get("rotateOrder", 0)).asMatrix()
+
+	scaleMatrix = om.MTransformationMatrix().setScale([channels.get("scale" + axis, 1.0) for axis in "XYZ"], om.MSpace.kTransform).asMatrix()
+	tm = om.MTransformationMatrix(scaleMatrix * nodeDef["rotateAxisMatrix"] * rotMatrix * nodeDef["jointOrientMatrix"])
+	tm.setTranslation(translation, om.MSpace.kTransform)
+
+	#return; MMatrix
+	return tm.asMatrix()
+
+def getNodeDefForDecompose(nodeName):
+	isJoint = cmds.nodeType(nodeName) == "joint"
+
+	nodeDef = {
+				"rotateOrder": getStaticAttrValue(nodeName, "rotateOrder", 0),
+				"rotateAxisMatrix": getEulerMatrix(getStaticAttrValue(nodeName, "rotateAxis", (0.0, 0.0, 0.0))),
+				"jointOrientMatrix": om.MMatrix(),
+				"segmentScaleCompensate": False
+				}
+	if isJoint:
+		nodeDef["jointOrientMatrix"] = getEulerMatrix(getStaticAttrValue(nodeName, "jointOrient", (0.0, 0.0, 0.0)))
+		nodeDef["segmentScaleCompensate"] = bool(getStaticAttrValue(nodeName, "segmentScaleCompensate", False))
+
+	#return; dict (node decompose definition)
+	return nodeDef
+
+def removeParentInverseScale(localMatrix, parentScale = (1.0, 1.0, 1.0)):
+	"""Remove the parent's inverse scale from a segment-scale-compensated joint's local matrix.
+	The local matrix is composed as S*RA*R*JO*IS*T, hence the parent scale is applied to the upper 3x3 only, leaving the translation intact.
+	"""
+
+	values = list(tuple(localMatrix))
+	translation = values[12:15]
+	values[12:15] = [0.0, 0.0, 0.0]
+	values = list(tuple(om.MMatrix(values) * om.MTransformationMatrix().setScale(parentScale, om.MSpace.kTransform).asMatrix()))
+	values[12:15] = translation
+
+	#return; MMatrix
+	return om.MMatrix(values)
+
+def getCurrentSampledNodeNames(samples = {}):
+	"""Resolve the current long names of the sampled nodes, from their UUIDs.
+	Nodes may have been re-parented or renamed since sampling. Deleted nodes are returned as None.
+	"""
+
+	if not "uuids" in samples: return list(samples.get("nodes", []))
+
+	returnList = []
+	for uuid in samples["uuids"]:
+		currentNames = cmds.ls(uuid, long = True)
+		returnList.append(currentNames[0] if currentNames else None)
+
+	#return; list (long names)
+	return returnList
+
+def worldSamplesToLocalChannels(samples = {}, nodes = None):
+	"""Convert sampled world matrices into local channel values per node, based on the nodes' current hierarchy.
+	Parents are resolved from the samples when sampled (parent first), or sampled in the same frames otherwise.
+	If nodes isn't passed, all sampled nodes are converted.
+	"""
+
+	returnData = {}
+	frames = samples.get("frames", [])
+	sampledNodes = getCurrentSampledNodeNames(samples)
+	if not frames or not sampledNodes: return returnData
+
+	nodes = [getNodeLongName(n) for n in (nodes or sampledNodes)]
+	nodes = [n for n in nodes if n and n in sampledNodes]
+	nodes = sorted(nodes, key = lambda n: len(n.split("|")))
+
+	#collect parent matrices for parents which weren't sampled
+	nodeIndices = dict((n, k) for k, n in enumerate(sampledNodes) if n)
+	parents = {}
+	externalParents = []
+	for nodeName in nodes:
+		parent = cmds.listRelatives(nodeName, p = True, f = True)
+		parent = parent[0] if parent else None
+		parents[nodeName] = parent
+		if parent and not parent in nodeIndices and not parent in externalParents: externalParents.append(parent)
+	externalSamples = sampleWorldMatrices(externalParents, frames) if externalParents else None
+	externalIndices = dict((n, k) for k, n in enumerate(externalParents))
+
+	#collect the local scale (inverse scale source) of segment-scale-compensated nodes' parents, which aren't converted
+	parentScalePlugs = []
+	for nodeName in nodes:
+		parent = parents[nodeName]
+		if parent and not parent in nodes and cmds.attributeQuery("scale", node = parent, exists = True) and getStaticAttrValue(nodeName, "segmentScaleCompensate", False):
+			parentScalePlugs += [parent + ".scale" + axis for axis in "XYZ" if not parent + ".scale" + axis in parentScalePlugs]
+	parentScaleSamples = sampleAttrValues(parentScalePlugs, frames)
+
+	for nodeName in nodes:
+		nodeDef = getNodeDefForDecompose(nodeName)
+		channels = {}
+		previousEuler = None
+
+		for frameIndex in range(len(frames)):
+			worldMatrix = getSampledMatrix(samples, frameIndex, nodeIndices[nodeName])
+			parent = parents[nodeName]
+			parentMatrix = om.MMatrix()
+			if parent in nodeIndices: parentMatrix = getSampledMatrix(samples, frameIndex, nodeIndices[parent])
+			elif parent: parentMatrix = getSampledMatrix(externalSamples, frameIndex, externalIndices[parent])
+
+			localMatrix = worldMatrix * parentMatrix.inverse()
+			if nodeDef["segmentScaleCompensate"] and parent:
+				#remove the parent's inverse scale
+				parentScale = (1.0, 1.0, 1.0)
+				if parent in returnData:
+					parentScale = [returnData[parent]["scale" + axis][frameIndex] for axis in "XYZ"]
+				elif parent + ".scaleX" in parentScaleSamples:
+					parentScale = [parentScaleSamples[parent + ".scale" + axis][frameIndex] for axis in "XYZ"]
+				localMatrix = removeParentInverseScale(localMatrix, parentScale)
+
+			frameChannels, previousEuler = decomposeLocalMatrix(localMatrix, nodeDef, previousEuler)
+			for channel in frameChannels:
+				if not channel in channels: channels[channel] = array.array("d")
+				channels[channel].append(frameChannels[channel])
+
+		returnData[nodeName] = channels
+
+	#return; dict (node long name: {channel: array (values per frame)})
+	return returnData
+
+def getSampledMatrices(samples, nodeIndex):
+	#return; list (MMatrix per frame)
+	return [getSampledMatrix(samples, frameIndex, nodeIndex) for frameIndex in range(len(samples["frames"]))]
+
+def solveLocalChannels(nodeName = "", worldMatrices = [], parentMatrices = [], **kwargs):
+	"""Solve local channel values (UI units) for the given node, from in-memory target world matrices and parent world matrices (one per frame).
+	Use this when the parent matrices aren't sampled from the scene, i.e. when the parents were solved in memory as well.
+	"""
+
+	parentScales = kwargs.get("parentScales", None) #arg; comment = the parent's local scale (x,y,z) per frame, used to remove the inverse scale of segment-scale-compensated joints. Default to the parent's current scale.
+
+	nodeDef = getNodeDefForDecompose(nodeName)
+	channels = {}
+	previousEuler = None
+
+	if nodeDef["segmentScaleCompensate"] and parentMatrices and not parentScales:
+		parent = (cmds.listRelatives(nodeName, p = True, f = True) or [None])[0]
+		parentScales = [getStaticAttrValue(parent, "scale", (1.0, 1.0, 1.0)) if parent else (1.0, 1.0, 1.0)] * len(worldMatrices)
+
+	for k, worldMatrix in enumerate(worldMatrices):
+		parentMatrix = parentMatrices[k] if parentMatrices else om.MMatrix()
+		localMatrix = worldMatrix * parentMatrix.inverse()
+		if nodeDef["segmentScaleCompensate"] and parentMatrices: localMatrix = removeParentInverseScale(localMatrix, parentScales[k])
+
+		frameChannels, previousEuler = decomposeLocalMatrix(localMatrix, nodeDef, previousEuler)
+		for channel in frameChannels:
+			if not channel in channels: channels[channel] = array.array("d")
+			channels[channel].append(frameChannels[channel])
+
+	#return; dict (channel: array (values per frame))
+	return channels
+
+def getAimFrameMatrix(position, target, up):
+	"""Return an orthonormal rotation matrix, which X axis aims from position to target, and Z axis is oriented towards the up position.
+	"""
+
+	aim = (om.MVector(target) - om.MVector(position)).normal()
+	upDir = om.MVector(up) - om.MVector(position)
+	zAxis = (upDir - aim * (upDir * aim)).normal()
+	yAxis = zAxis ^ aim
+
+	#return; MMatrix
+	return om.MMatrix([aim.x, aim.y, aim.z, 0.0, yAxis.x, yAxis.y, yAxis.z, 0.0, zAxis.x, zAxis.y, zAxis.z, 0.0, 0.0, 0.0, 0.0, 1.0])
+
+def solveAimWithOffset(worldMatrix, fromTarget, toTarget, up):
+	"""Solve an aim-constraint with maintain offset, in memory.
+	The offset is taken while aiming at fromTarget, and the result is the world matrix of the constrained node, when aiming at toTarget.
+	Position and scale are maintained.
+	"""
+
+	tm = om.MTransformationMatrix(worldMatrix)
+	position = tm.translation(om.MSpace.kWorld)
+	tm.setTranslation(om.MVector(), om.MSpace.kWorld)
+
+	fromFrame = getAimFrameMatrix(position, fromTarget, up)
+	toFrame = getAimFrameMatrix(position, toTarget, up)
+	tm = om.MTransformationMatrix(tm.asMatrix() * fromFrame.inverse() * toFrame)
+	tm.setTranslation(position, om.MSpace.kWorld)
+
+	#return; MMatrix
+	return tm.asMatrix()
+
+def getMatrixPosition(matrix):
+	#return; MVector
+	return om.MTransformationMatrix(matrix).translation(om.MSpace.kWorld)
+
+def isPlugKeyable(plugName = ""):
+	"""Check if the given plug can be keyed- it isn't locked, and it isn't driven by anything other than an anim-curve.
+	"""
+
+	if cmds.getAttr(plugName, lock = True): return False
+	sources = cmds.listConnections(plugName, s = True, d = False, scn = True) or []
+	animCurves = cmds.listConnections(plugName, s = True, d = False, scn = True, type = "animCurve") or []
+
+	#return; bool
+	return len(sources) == len(animCurves)
+
+def setKeysBulk(plugName = "", frames = [], values = [], **kwargs):
+	"""Write a whole key array into the given plug, in a single setAttr call.
+	A new anim-curve is created and connected, or, if the plug is already animated, the existing keys are merged (new keys replace existing keys on the same frames) and the curve is rewritten.
+	Values are expected in UI units.
+	"""
+
+	tangentType = kwargs.get("tangentType", "auto") #arg; comment = in and out tangent type to set for the new keys
+	outTangentType = kwargs.get("outTangentType", tangentType) #arg; comment = out tangent type to set for the new keys, if different from the in tangent type
+	merge = kwargs.get("merge", True) #arg; comment = merge with existing keys on the plug's anim-curve, otherwise existing keys are discarded
+
+	if not plugName or not frames or len(frames) != len(values): return None
+
+	keys = {}
+	curve = None
+	existingCurves = cmds.listConnections(plugName, s = True, d = False, type = "animCurve") or []
+	if existingCurves:
+		curve = existingCurves[0]
+		if merge:
+			existingTimes = cmds.keyframe(curve, q = True, tc = True) or []
+			existingValues = cmds.keyframe(curve, q = True, vc = True) or []
+			keys = dict(zip(existingTimes, existingValues))
+		cmds.delete(curve)
+
+	for k, frame in enumerate(frames):
+		keys[float(frame)] = values[k]
+
+	curveType = "animCurveTU"
+	attrType = cmds.getAttr(plugName, type = True)
+	if attrType == "doubleLinear": curveType = "animCurveTL"
+	elif attrType == "doubleAngle": curveType = "animCurveTA"
+
+	nodeName, attrName = plugName.split(".", 1)
+	curve = cmds.createNode(curveType, name = nodeName.split("|")[-1].split(":")[-1] + "_" + attrName.replace(".", "_").replace("[", "_").replace("]", ""), skipSelect = True)
+
+	keyTimeValues = []
+	sortedTimes = sorted(keys.keys())
+	for time in sortedTimes: keyTimeValues += [time, keys[time]]
+	cmds.setAttr(curve + ".ktv[0:" + str(len(sortedTimes) - 1) + "]", *keyTimeValues)
+	cmds.connectAttr(curve + ".output", plugName, f = True)
+
+	if tangentType: cmds.keyTangent(curve, itt = tangentType)
+	if outTangentType: cmds.keyTangent(curve, ott = outTangentType)
+
+	#return; string (anim curve name)
+	return curve
+
+def appendKeysBulk(curve = "", frames = [], values = [], **kwargs):
+	"""Append a key array to the end of the given anim-curve, in a single setAttr call.
+	All given frames are expected to be later than the curve's last key. Values are expected in UI units.
+	"""
+
+	startIndex = kwargs.get("startIndex", None) #arg; comment = the curve's current key count. Queried from the curve if not passed.
+
+	if not curve or not frames or len(frames) != len(values): return 0
+	if startIndex is None: startIndex = cmds.keyframe(curve, q = True, keyframeCount = True)
+
+	keyTimeValues = []
+	for k, frame in enumerate(frames): keyTimeValues += [float(frame), values[k]]
+	cmds.setAttr(curve + ".ktv[" + str(startIndex) + ":" + str(startIndex + len(frames) - 1) + "]", *keyTimeValues)
+
+	#return; int (new key count)
+	return startIndex + len(frames)
+
+def setLocalChannelsKeysBulk(localChannels = {}, frames = [], **kwargs):
+	"""Write the local channels data (as returned from worldSamplesToLocalChannels) as bulk keys, one key array per channel.
+	"""
+
+	channelsFilter = kwargs.get("channels", None) #arg; comment = limit the keyed channels to the given channel names
+
+	curves = []
+	for nodeName in localChannels:
+		for channel in localChannels[nodeName]:
+			if channelsFilter and not channel in channelsFilter: continue
+			plugName = nodeName + "." + channel
+			if not isPlugKeyable(plugName): continue
+
+			curve = setKeysBulk(plugName, frames, localChannels[nodeName][channel], **kwargs)
+			if curve: curves.append(curve)
+
+	#return; list (anim curves)
+	return curves
+
+def cacheAnimCurves(nodes = []):
+	"""Cache the keys of all anim-curves directly driving the given nodes.
+	Returns a dict of destination plug name: (times, values), values in UI units.
+	"""
+
+	animCache = {}
+	for node in nodes:
+		connections = cmds.listConnections(getNodeLongName(node), s = True, d = False, type = "animCurve", c = True, p = True) or []
+		for k in range(0, len(connections), 2):
+			plugName, curve = connections[k], connections[k + 1].split(".")[0]
+			times = cmds.keyframe(curve, q = True, tc = True) or []
+			values = cmds.keyframe(curve, q = True, vc = True) or []
+			if times: animCache[plugName] = (times, values)
+
+	#return; dict (plugName: (times, values))
+	return animCache
+
+def applyAnimCacheSlice(animCache = {}, rangeMin = 0, rangeMax = 0, **kwargs):
+	"""Write the keys within the given range (inclusive) out of an anim cache (see cacheAnimCurves) back into their plugs, replacing any existing animation.
+	"""
+
+	timeOffset = kwargs.get("timeOffset", 0.0) #arg; comment = offset to apply to the sliced key times
+	tangentType = kwargs.get("tangentType", "auto") #arg; comment = in and out tangent type to set for the keys
+
+	curves = []
+	for plugName in animCache:
+		times, values = animCache[plugName]
+		sliceIndices = [k for k, time in enumerate(times) if rangeMin <= time <= rangeMax]
+		if not sliceIndices or not cmds.objExists(plugName): continue
+
+		curve = setKeysBulk(plugName, [times[k] + timeOffset for k in sliceIndices], [values[k] for k in sliceIndices], tangentType = tangentType, merge = False)
+		if curve: curves.append(curve)
+
+	#return; list (anim curves)
+	return curves
+
+def getDefaultTangentTypes():
+	#return; string (in tangent type), string (out tangent type)
+	return cmds.keyTangent(q = True, g = True, itt = True)[0], cmds.keyTangent(q = True, g = True, ott = True)[0]
+
+def setKeysOnPlugs(plugKeys = {}, **kwargs):
+	"""Key the given plugs with the given (frames, values) pairs, without moving the time-line.
+	Plugs that aren't animated get a new anim-curve, written in bulk (see setKeysBulk).
+	Plugs that are already animated are keyed through a single batched MEL setKeyframe call, to keep the existing keys and tangents intact, and the whole call undoable.
+	"""
+
+	tangentType = kwargs.get("tangentType", None) #arg; comment = in tangent type for new anim-curves. Default to the global preference.
+	outTangentType = kwargs.get("outTangentType", None) #arg; comment = out tangent type for new anim-curves. Default to the global preference.
+	steppedPlugs = kwargs.get("steppedPlugs", []) #arg; comment = plugs to key with stepped out tangents, when new anim-curves are created for them (i.e. enum attributes)
+
+	defaultIn, defaultOut = getDefaultTangentTypes()
+	tangentType = tangentType or defaultIn
+	outTangentType = outTangentType or defaultOut
+
+	curves = []
+	melCmds = []
+	for plugName in plugKeys:
+		frames, values = plugKeys[plugName]
+		if not frames: continue
+
+		if cmds.listConnections(plugName, s = True, d = False, type = "animCurve"):
+			for k, frame in enumerate(frames):
+				melCmds.append("setKeyframe -t " + str(frame) + " -v " + repr(float(values[k])) + " " + mnsUtils.melString(plugName) + ";")
+		else:
+			curve = setKeysBulk(plugName, frames, values, tangentType = tangentType, outTangentType = "step" if plugName in steppedPlugs else outTangentType, merge = False)
+			if curve: curves.append(curve)
+
+	if melCmds: mel.eval("\n".join(melCmds))
+
+	#return; list (new anim curves)
+	return curves
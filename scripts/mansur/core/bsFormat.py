@@ -0,0 +1,249 @@
+"""=== Author: Assaf Ben Zur ===
+BlendShape delta cache (.mnsBS) file format.
+A versioned binary container for blendShape targets, stored as sparse deltas:
+	- Magic ("MNSBS") and version (uint16), followed by the header length (uint32).
+	- A JSON header- schema info, the deformer name, the vertex count and topology checksum of the mesh it was taken from, and a block table per target item (the full target and its in-betweens).
+	- A data section of little-endian blocks, one per target item- the vertex indices (uint32), followed by the xyz deltas (float32).
+	  Painted weights (the deformer's base weights and each target's weights) are stored as sparse blocks as well- the vertex indices (uint32), followed by the weights (float32).
+Target blocks are located through the header, and the data section is memory-mapped on read, allowing partial loads (a subset of targets) without reading the whole file.
+The target data structure matches meshUtility.getBlendShapeTargetsData- {"name", "index", "weight", "items": {itemIndex: (vertex indices, (x,y,z) deltas)}, "targetWeights": (vertex indices, weights)}.
+This module doesn't depend on Maya.
+"""
+
+#global dependencies
+import os, sys, json, struct, array, mmap, hashlib, time, tempfile, random
+
+try:
+	import cPickle as pickle
+except ImportError:
+	import pickle
+
+BS_MAGIC = b"MNSBS"
+BS_VERSION = 1
+BS_INDEX_TYPE = "I"
+BS_VALUE_TYPE = "f"
+
+def getTopologyChecksum(vertexCount = 0, faceVertexCounts = [], faceVertexIndices = []):
+	"""Create a topology checksum from the mesh's vertex count and face-vertex lists (as returned by MFnMesh.getVertices).
+	Meshes with the same checksum share the same vertex order, hence any cached deltas can be applied to them.
+	"""
+
+	checksum = hashlib.md5(struct.pack("<I", vertexCount))
+	for values in [faceVertexCounts, faceVertexIndices]:
+		values = array.array(BS_INDEX_TYPE, values)
+		if sys.byteorder == "big": values.byteswap()
+		checksum.update(values.tostring() if sys.version_info.major < 3 else values.tobytes())
+
+	#return; string (md5 hex digest)
+	return checksum.hexdigest()
+
+def isBSFile(filePath = ""):
+	with open(filePath, "rb") as f: magic = f.read(len(BS_MAGIC))
+
+	#return; bool
+	return magic == BS_MAGIC
+
+def packTargetItem(indices, deltas):
+	"""Pack a single target item into an index array and a flat xyz delta array.
+	"""
+
+	indexValues = array.array(BS_INDEX_TYPE, indices)
+	deltaValues = array.array(BS_VALUE_TYPE)
+	for delta in deltas: deltaValues.extend(delta[:3])
+
+	#return; array (indices), array (deltas)
+	return indexValues, deltaValues
+
+def packWeights(indices, values):
+	#return; array (indices), array (weights)
+	return array.array(BS_INDEX_TYPE, indices), array.array(BS_VALUE_TYPE, values)
+
+def unpackTargetItem(indexValues, deltaValues):
+	#return; list (indices), list ((x,y,z) deltas)
+	return list(indexValues), [tuple(deltaValues[k:k + 3]) for k in range(0, len(deltaValues), 3)]
+
+def writeBSFile(filePath = "", bsData = {}):
+	"""Write the given blendShape data into an .mnsBS file.
+	bsData- {"name", "vertexCount", "topologyChecksum", "baseWeights": (vertex indices, weights), "targets": [target data]}.
+	"""
+
+	blocks, blockValues = [], []
+	offset = 0
+
+	def addWeightsBlock(weights):
+		indexValues, weightValues = packWeights(*weights)
+		blockInfo = {"count": len(indexValues), "offset": offset}
+		blockValues.extend([indexValues, weightValues])
+
+		#return; dict (block info), int (block size)
+		return blockInfo, len(indexValues) * indexValues.itemsize + len(weightValues) * weightValues.itemsize
+
+	baseWeightsInfo = None
+	if bsData.get("baseWeights", None) and bsData["baseWeights"][0]:
+		baseWeightsInfo, blockSize = addWeightsBlock(bsData["baseWeights"])
+		offset += blockSize
+
+	for targetData in bsData.get("targets", []):
+		targetInfo = {"name": targetData["name"], "index": targetData.get("index", len(blocks)), "weight": float(targetData.get("weight", 0.0)), "items": []}
+		for itemIdx in sorted(targetData["items"].keys()):
+			indexValues, deltaValues = packTargetItem(*targetData["items"][itemIdx])
+			targetInfo["items"].append({"item": int(itemIdx), "count": len(indexValues), "offset": offset})
+			offset += len(indexValues) * indexValues.itemsize + len(deltaValues) * deltaValues.itemsize
+			blockValues += [indexValues, deltaValues]
+		if targetData.get("targetWeights", None) and targetData["targetWeights"][0]:
+			targetInfo["targetWeights"], blockSize = addWeightsBlock(targetData["targetWeights"])
+			offset += blockSize
+		blocks.append(targetInfo)
+
+	header = {"schema": "mnsBS", "version": BS_VERSION, "byteOrder": "little", "indexType": "uint32", "valueType": "float32",
+				"name": bsData.get("name", ""), "vertexCount": bsData.get("vertexCount", 0), "topologyChecksum": bsData.get("topologyChecksum", ""), "baseWeights": baseWeightsInfo, "targets": blocks}
+	headerBytes = json.dumps(header).encode("utf-8")
+
+	with open(filePath, "wb") as f:
+		f.write(BS_MAGIC)
+		f.write(struct.pack("<HI", BS_VERSION, len(headerBytes)))
+		f.write(headerBytes)
+		for values in blockValues:
+			if sys.byteorder == "big": values.byteswap()
+			values.tofile(f)
+
+def readBSHeader(fileHandle):
+	fileHandle.seek(0)
+	if fileHandle.read(len(BS_MAGIC)) != BS_MAGIC: raise ValueError("Not an mnsBS file.")
+	version, headerLength = struct.unpack("<HI", fileHandle.read(6))
+	if version > BS_VERSION: raise ValueError("Unsupported mnsBS version- " + str(version) + ".")
+	header = json.loads(fileHandle.read(headerLength).decode("utf-8"))
+	header["dataStart"] = len(BS_MAGIC) + 6 + headerLength
+
+	#return; dict (header)
+	return header
+
+def readArrayFromBuffer(typeCode, buffer, start, count):
+	values = array.array(typeCode)
+	data = buffer[start:start + count * values.itemsize]
+	if sys.version_info.major < 3: values.fromstring(data)
+	else: values.frombytes(data)
+	if sys.byteorder == "big": values.byteswap()
+
+	#return; array
+	return values
+
+def readWeightsBlock(buffer, dataStart, blockInfo):
+	start = dataStart + blockInfo["offset"]
+	indexValues = readArrayFromBuffer(BS_INDEX_TYPE, buffer, start, blockInfo["count"])
+	weightValues = readArrayFromBuffer(BS_VALUE_TYPE, buffer, start + len(indexValues) * indexValues.itemsize, blockInfo["count"])
+
+	#return; list (indices), list (weights)
+	return list(indexValues), list(weightValues)
+
+def readBSFile(filePath = "", **kwargs):
+	"""Read an .mnsBS file into the blendShape data dict structure- name, vertexCount, topologyChecksum and targets.
+	The data section is memory-mapped, so only the requested targets' blocks are read.
+	"""
+
+	targets = kwargs.get("targets", None) #arg; comment = target names to load. Pass an empty list to skip all targets. Default to all targets.
+	inbetweens = kwargs.get("inbetweens", True) #arg; comment = load in-between items. If False, only the full target items (6000) are loaded.
+
+	with open(filePath, "rb") as f:
+		header = readBSHeader(f)
+		bsData = {"name": header["name"], "version": header["version"], "vertexCount": header["vertexCount"], "topologyChecksum": header["topologyChecksum"], "baseWeights": None, "targets": []}
+
+		targetBlocks = [t for t in header["targets"] if targets is None or t["name"] in targets]
+		if (targetBlocks or header.get("baseWeights", None)) and os.path.getsize(filePath) > header["dataStart"]:
+			fileMap = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+			try:
+				if header.get("baseWeights", None): bsData["baseWeights"] = readWeightsBlock(fileMap, header["dataStart"], header["baseWeights"])
+
+				for targetInfo in targetBlocks:
+					targetData = {"name": targetInfo["name"], "index": targetInfo["index"], "weight": targetInfo["weight"], "items": {}, "targetWeights": None}
+					if targetInfo.get("targetWeights", None): targetData["targetWeights"] = readWeightsBlock(fileMap, header["dataStart"], targetInfo["targetWeights"])
+					for itemInfo in targetInfo["items"]:
+						if not inbetweens and itemInfo["item"] != 6000: continue
+
+						start = header["dataStart"] + itemInfo["offset"]
+						indexValues = readArrayFromBuffer(BS_INDEX_TYPE, fileMap, start, itemInfo["count"])
+						deltaValues = readArrayFromBuffer(BS_VALUE_TYPE, fileMap, start + len(indexValues) * indexValues.itemsize, itemInfo["count"] * 3)
+						targetData["items"][itemInfo["item"]] = unpackTargetItem(indexValues, deltaValues)
+					bsData["targets"].append(targetData)
+			finally:
+				fileMap.close()
+		else:
+			bsData["targets"] = [{"name": t["name"], "index": t["index"], "weight": t["weight"], "items": {}} for t in targetBlocks]
+
+	#return; dict (blendShape data)
+	return bsData
+
+def getBSFileInfo(filePath = ""):
+	"""Read the file's header only- deformer name, version, vertex count, topology checksum and target names.
+	"""
+
+	with open(filePath, "rb") as f: header = readBSHeader(f)
+
+	#return; dict (file info)
+	return {"name": header["name"], "version": header["version"], "vertexCount": header["vertexCount"], "topologyChecksum": header["topologyChecksum"], "targets": [t["name"] for t in header["targets"]]}
+
+def createBenchmarkBSData(vertexCount = 100000, targetCount = 300, density = 0.1, inbetweenCount = 1):
+	"""Create a synthetic blendShape data set of the given size, for benchmarking.
+	density- the fraction of vertices affected by each target.
+	"""
+
+	affectedCount = max(1, int(vertexCount * density))
+	targetsData = []
+	for t in range(targetCount):
+		start = random.randint(0, vertexCount - affectedCount)
+		items = {}
+		for itemIdx in [6000] + [5000 + int(1000.0 * (k + 1) / (inbetweenCount + 1)) for k in range(inbetweenCount)]:
+			items[itemIdx] = (list(range(start, start + affectedCount)), [(random.random(), random.random(), random.random()) for k in range(affectedCount)])
+		targetsData.append({"name": "target" + str(t), "index": t, "weight": 0.0, "items": items})
+
+	#return; dict (blendShape data)
+	return {"name": "benchmark_bs", "vertexCount": vertexCount, "topologyChecksum": getTopologyChecksum(vertexCount, [], []), "targets": targetsData}
+
+def benchmarkBSFormat(vertexCount = 100000, targetCount = 300, density = 0.1, inbetweenCount = 1, iterations = 3):
+	"""Benchmark the .mnsBS format against dense (full mesh points per target, as stored by the duplicate-based path) pickled data, for a synthetic data set of the given size.
+	Returns the file sizes and the average export, full import and partial (single target) import times.
+	For an in-scene comparison against the duplicate-based blendShape duplication, use meshUtility.benchmarkBlendShapeDuplication.
+	"""
+
+	bsData = createBenchmarkBSData(vertexCount, targetCount, density, inbetweenCount)
+	denseData = []
+	for targetData in bsData["targets"]:
+		denseItems = {}
+		for itemIdx, (indices, deltas) in targetData["items"].items():
+			points = array.array("d", [0.0]) * (vertexCount * 3)
+			for k, vtxIdx in enumerate(indices): points[vtxIdx * 3:vtxIdx * 3 + 3] = array.array("d", deltas[k])
+			denseItems[itemIdx] = points
+		denseData.append({"name": targetData["name"], "items": denseItems})
+
+	tempDir = tempfile.mkdtemp(prefix = "mnsBSBenchmark_")
+	densePath, bsPath = os.path.join(tempDir, "dense.pkl"), os.path.join(tempDir, "sparse.mnsBS")
+
+	def timeIt(method):
+		startTime = time.time()
+		for k in range(iterations): method()
+		return (time.time() - startTime) / iterations
+
+	def writeDense():
+		with open(densePath, "wb") as f: pickle.dump(denseData, f, pickle.HIGHEST_PROTOCOL)
+
+	def readDense():
+		with open(densePath, "rb") as f: return pickle.load(f)
+
+	results = {"vertices": vertexCount, "targets": targetCount, "density": density, "inbetweens": inbetweenCount,
+				"denseExport": timeIt(writeDense),
+				"bsExport": timeIt(lambda: writeBSFile(bsPath, bsData)),
+				"denseImport": timeIt(readDense),
+				"bsImport": timeIt(lambda: readBSFile(bsPath)),
+				"bsSingleTargetImport": timeIt(lambda: readBSFile(bsPath, targets = ["target0"])),
+				"denseSize": os.path.getsize(densePath),
+				"bsSize": os.path.getsize(bsPath)}
+
+	for filePath in [densePath, bsPath]: os.remove(filePath)
+	os.rmdir(tempDir)
+
+	#return; dict (benchmark results)
+	return results
+
+if __name__ == "__main__":
+	for benchmarkSize in [(10000, 50, 0.2, 0), (50000, 150, 0.1, 1), (100000, 300, 0.05, 1)]:
+		print(benchmarkBSFormat(*benchmarkSize))
@@ -25,6 +25,8 @@ GLOB_additionalModulePathsJsonName = "moduleParentPaths"
 GLOB_additionalModulePresetsPathsJsonName = "modulePresetsPaths"
 GLOB_modPresetSuffix = "mnsBMPS"
 GLOB_moduleDirectoryFlag = "buildModulesDir.mns"
+GLOB_settingsBlobAttrName = "mnsSettingsBlob"
+GLOB_settingsBlobVersion = 1
 GLOB_mnsBlockDefColorScheme = [(1,0.15,0.15), (0,1,0), (0,0,1),(1,0.15,0.15), (0.15,1,0.15), (0.15,0.15,1), (1,0.3,0.3), (0.3,1,0.3), (0.3,0.3,1),(1,0.45,0.45), (0.45,1,0.45), (0.45,0.45,1),(1,0.6,0.6), (0.6,1,0.6), (0.6,0.6,1)]
 
 GLOB_mnsJntStructDefaultSuffix = "Main"
@@ -50,7 +52,9 @@ GLOB_autoLoadPluginList = ["mnsAnnotate",
 
 GLOB_cnsToolNodeName = "c_mnsCns_A001_grp"
 GLOB_pyVer = sys.version_info.major
+GLOB_mnsDevMode = os.environ.get("MNS_DEV_MODE", "0") not in ["", "0"]
 GLOB_mnsPrefs = {}
+GLOB_mnsPrefsCheckInterval = 2.0
 GLOB_schemes = ["dark"]
 
 GLOB_mnsPickerInstances = {}
\ No newline at end of file
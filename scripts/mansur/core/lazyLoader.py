@@ -0,0 +1,88 @@
+"""=== Author: Assaf Ben Zur ===
+Lazy module loading.
+This module contains the lazy module proxy used by the mansur package __init__ and the maya menu, to defer importing UI tools until they are first used.
+A proxy imports its target module on the first attribute access, and forwards all attribute access to it from then on.
+All module loads (eager or lazy) are timed, for the startup report.
+This module doesn't depend on Maya.
+"""
+
+#global dependencies
+import sys, time, types, importlib
+from collections import OrderedDict
+
+if sys.version_info.major > 2: from importlib import reload
+
+moduleLoadTimes = OrderedDict()
+startupTime = 0.0
+reloadRequested = False
+
+def loadModule(moduleName = "", reloadModule = False, lazy = False):
+	"""Import (and optionally reload) the given module by its full name, recording the load time.
+	"""
+
+	startTime = time.time()
+	module = importlib.import_module(moduleName)
+	if reloadModule: module = reload(module)
+	moduleLoadTimes[moduleName] = (time.time() - startTime, "lazy" if lazy else "eager")
+
+	#return; module
+	return module
+
+class MnsLazyModule(types.ModuleType):
+	"""Lazy module proxy.
+	The target module is imported only upon the first attribute access.
+	"""
+
+	def __init__(self, moduleName = "", reloadOnLoad = False):
+		super(MnsLazyModule, self).__init__(moduleName)
+		self.__dict__["_mnsModuleName"] = moduleName
+		self.__dict__["_mnsReloadOnLoad"] = reloadOnLoad
+		self.__dict__["_mnsModule"] = None
+
+	def mnsIsLoaded(self):
+		#return; bool
+		return self.__dict__["_mnsModule"] is not None
+
+	def mnsLoad(self):
+		"""Import the target module if it wasn't loaded yet, and return it.
+		"""
+
+		if self.__dict__["_mnsModule"] is None:
+			self.__dict__["_mnsModule"] = loadModule(self.__dict__["_mnsModuleName"], self.__dict__["_mnsReloadOnLoad"], lazy = True)
+
+		#return; module
+		return self.__dict__["_mnsModule"]
+
+	def mnsDeferredCall(self, attrName = ""):
+		"""Return a callable which calls the given module function when triggered, without loading the module up until then.
+		Any arguments passed by the caller (i.e. Qt signal arguments) are ignored.
+		"""
+
+		def deferredCall(*args):
+			return getattr(self.mnsLoad(), attrName)()
+
+		#return; function
+		return deferredCall
+
+	def __getattr__(self, attrName):
+		return getattr(self.mnsLoad(), attrName)
+
+	def __setattr__(self, attrName, value):
+		setattr(self.mnsLoad(), attrName, value)
+
+	def __dir__(self):
+		return dir(self.mnsLoad())
+
+	def __repr__(self):
+		return "<mnsLazyModule '" + self.__dict__["_mnsModuleName"] + "' (" + ("loaded" if self.mnsIsLoaded() else "not loaded") + ")>"
+
+def getLoadReport():
+	"""Build a load-time report for all modules loaded through this module, sorted by load time.
+	"""
+
+	lines = ["Mansur startup: " + "%.3f" % startupTime + " seconds."]
+	for moduleName, loadInfo in sorted(moduleLoadTimes.items(), key = lambda item: -item[1][0]):
+		lines.append("\t" + "%.3f" % loadInfo[0] + "s\t" + loadInfo[1] + "\t" + moduleName)
+
+	#return; string (report)
+	return "\n".join(lines)
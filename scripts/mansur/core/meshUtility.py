@@ -1,10 +1,13 @@
 from maya.api import OpenMaya as om
+import os, time, tempfile
 
 
 from maya import cmds
 import pymel.core as pm
 
 from . import utility as mnsUtils
+from . import log as mnsLog
+from . import bsFormat as mnsBSFormat
 
 def getSymDictForMesh(meshName = "", tolerance = 0.02):
 	if meshName:
@@ -105,22 +108,262 @@ def extractBlendShapeTragets(mesh, bsDeformer):
 			
 		return newTarGroup, newTargets
 
+def getComponentIndices(componentList = []):
+	"""Convert a component list (i.e. ["vtx[0:4]", "vtx[8]"]) into a flat vertex index list.
+	"""
+
+	indices = []
+	for component in componentList:
+		if "[" in component:
+			compRange = component.split("[")[-1].rstrip("]")
+			if compRange == "*": continue
+			if ":" in compRange:
+				start, end = compRange.split(":")
+				indices += range(int(start), int(end) + 1)
+			else:
+				indices.append(int(compRange))
+
+	return indices
+
+def getIndexRuns(indices = []):
+	"""Compress a sorted index list into contiguous (start, end) runs (i.e. [0,1,2,3,4,8] -> [(0,4), (8,8)]).
+	"""
+
+	runs = []
+	if indices:
+		start = prev = indices[0]
+		for idx in list(indices[1:]) + [None]:
+			if idx is not None and idx == prev + 1:
+				prev = idx
+				continue
+			runs.append((start, prev))
+			if idx is not None: start = prev = idx
+
+	return runs
+
+def getComponentListFromIndices(indices = []):
+	"""Compress a sorted vertex index list into a compact component list (i.e. [0,1,2,3,4,8] -> ["vtx[0:4]", "vtx[8]"]).
+	"""
+
+	return [("vtx[" + str(start) + "]") if start == end else ("vtx[" + str(start) + ":" + str(end) + "]") for start, end in getIndexRuns(indices)]
+
+def getPaintedWeights(multiPlug = ""):
+	"""Read a per-vertex weight multi plug (blendShape baseWeights or targetWeights) as sparse (indices, values).
+	Unset entries default to 1.0, hence only values other than 1.0 are returned.
+	"""
+
+	indices, values = [], []
+	for start, end in getIndexRuns(sorted(cmds.getAttr(multiPlug, multiIndices = True) or [])):
+		runValues = cmds.getAttr(multiPlug + "[" + str(start) + ":" + str(end) + "]")
+		if not isinstance(runValues, (list, tuple)): runValues = [runValues]
+		for k, value in enumerate(runValues):
+			if abs(value - 1.0) > 0.000001:
+				indices.append(start + k)
+				values.append(value)
+
+	return indices, values
+
+def setPaintedWeights(multiPlug = "", indices = [], values = []):
+	weightsByIndex = dict(zip(indices, values))
+	for start, end in getIndexRuns(sorted(weightsByIndex.keys())):
+		cmds.setAttr(multiPlug + "[" + str(start) + ":" + str(end) + "]", *[weightsByIndex[k] for k in range(start, end + 1)], size = end - start + 1)
+
+def getBlendShapeBaseWeights(bsDeformer):
+	"""Read the blendShape deformer's painted base (envelope) weights, as sparse (indices, values).
+	"""
+
+	bsName = bsDeformer.nodeName()
+	geoIdx = (cmds.getAttr(bsName + ".inputTarget", multiIndices = True) or [0])[0]
+
+	return getPaintedWeights(bsName + ".inputTarget[" + str(geoIdx) + "].baseWeights")
+
+def getMeshPoints(meshName = ""):
+	mSel = om.MSelectionList()
+	mSel.add(meshName)
+	mfnMesh = om.MFnMesh(mSel.getDependNode(0))
+
+	return mfnMesh.getPoints()
+
+def getBlendShapeTargetsData(bsDeformer, **kwargs):
+	"""Read all targets of the given blendShape deformer as sparse deltas, directly from the deformer data.
+	Returns a list of target dicts- {"name", "index", "weight", "items": {itemIndex: (vertex indices, (x,y,z) deltas)}, "targetWeights": (vertex indices, painted weights)}.
+	Item index 6000 is the full target, lower item indices are in-betweens (5000 + 1000 * weight).
+	Targets with a live geometry connection are read as the difference between the target geometry and the deformer's original geometry.
+	"""
+
+	tolerance = kwargs.get("tolerance", 0.00001) #arg; comment = minimum delta length for live-geometry targets
+
+	bsName = bsDeformer.nodeName()
+	targetsData = []
+
+	geoIndices = cmds.getAttr(bsName + ".inputTarget", multiIndices = True) or [0]
+	geoIdx = geoIndices[0]
+
+	weightIndices = cmds.getAttr(bsName + ".weight", multiIndices = True) or []
+	basePoints = None
+	for weightIdx in weightIndices:
+		targetName = cmds.aliasAttr(bsName + ".weight[" + str(weightIdx) + "]", q = True) or ("target" + str(weightIdx))
+		targetGroupPlug = bsName + ".inputTarget[" + str(geoIdx) + "].inputTargetGroup[" + str(weightIdx) + "]"
+		targetData = {"name": targetName, "index": weightIdx, "weight": cmds.getAttr(bsName + ".weight[" + str(weightIdx) + "]"), "items": {},
+						"targetWeights": getPaintedWeights(targetGroupPlug + ".targetWeights")}
+
+		for itemIdx in cmds.getAttr(targetGroupPlug + ".inputTargetItem", multiIndices = True) or []:
+			itemPlug = targetGroupPlug + ".inputTargetItem[" + str(itemIdx) + "]"
+			
+			liveTarget = cmds.listConnections(itemPlug + ".inputGeomTarget", s = True, d = False, sh = True)
+			if liveTarget:
+				if basePoints is None:
+					baseGeo = cmds.listConnections(bsName + ".originalGeometry[" + str(geoIdx) + "]", s = True, d = False, sh = True)
+					basePoints = getMeshPoints(baseGeo[0]) if baseGeo else om.MPointArray()
+				targetPoints = getMeshPoints(liveTarget[0])
+				
+				indices, deltas = [], []
+				for vtxIdx in range(min(len(basePoints), len(targetPoints))):
+					delta = targetPoints[vtxIdx] - basePoints[vtxIdx]
+					if delta.length() > tolerance:
+						indices.append(vtxIdx)
+						deltas.append((delta.x, delta.y, delta.z))
+			else:
+				deltas = [tuple(p[:3]) for p in (cmds.getAttr(itemPlug + ".inputPointsTarget") or [])]
+				indices = getComponentIndices(cmds.getAttr(itemPlug + ".inputComponentsTarget") or [])
+				if len(indices) != len(deltas): indices, deltas = [], []
+
+			targetData["items"][itemIdx] = (indices, deltas)
+		targetsData.append(targetData)
+
+	return targetsData
+
+def createBlendShapeFromTargetsData(mesh, targetsData = [], **kwargs):
+	"""Create a new blendShape deformer on the given mesh, and write the given sparse target deltas and painted weights (see getBlendShapeTargetsData) directly into it.
+	Targets keep their original weight indices. No target meshes are created.
+	"""
+
+	name = kwargs.get("name", "blendShape") #arg;
+	baseWeights = kwargs.get("baseWeights", None) #arg; comment = painted base weights (indices, values), as returned by getBlendShapeBaseWeights
+	
+	newBS = pm.blendShape(mesh, foc = True, name = name)[0]
+	bsName = newBS.nodeName()
+
+	if baseWeights: setPaintedWeights(bsName + ".inputTarget[0].baseWeights", *baseWeights)
+
+	for k, targetData in enumerate(targetsData):
+		targetIdx = targetData.get("index", k)
+		cmds.setAttr(bsName + ".weight[" + str(targetIdx) + "]", 0)
+		cmds.aliasAttr(targetData["name"], bsName + ".weight[" + str(targetIdx) + "]")
+		
+		targetGroupPlug = bsName + ".inputTarget[0].inputTargetGroup[" + str(targetIdx) + "]"
+		for itemIdx, (indices, deltas) in targetData["items"].items():
+			itemPlug = targetGroupPlug + ".inputTargetItem[" + str(itemIdx) + "]"
+			cmds.setAttr(itemPlug + ".inputPointsTarget", len(deltas), *[tuple(d) + (1.0,) for d in deltas], type = "pointArray")
+			componentList = getComponentListFromIndices(indices)
+			cmds.setAttr(itemPlug + ".inputComponentsTarget", len(componentList), *componentList, type = "componentList")
+		if targetData.get("targetWeights", None): setPaintedWeights(targetGroupPlug + ".targetWeights", *targetData["targetWeights"])
+
+	return newBS
+
 def duplicateBlendShapeNodes(origMesh, meshTwin, **kwargs):
 	connect = kwargs.get("connect", False)
+	fromDeltas = kwargs.get("fromDeltas", False) #arg; comment = Read the targets' deltas directly from the blendShape data, instead of extracting (duplicating) a mesh per target
 
 	bshps = origMesh.listHistory(type = "blendShape")
 	if bshps:
 		for bsNode in bshps:
-			newTarGroup, newTargets = extractBlendShapeTragets(origMesh, bsNode)
+			if fromDeltas:
+				targetsData = getBlendShapeTargetsData(bsNode)
+				newBS = createBlendShapeFromTargetsData(meshTwin, targetsData, name = bsNode.nodeName() + "_copy", baseWeights = getBlendShapeBaseWeights(bsNode))
+
+				if connect:
+					#connect by weight index- weights may not be aliased
+					for targetData in targetsData:
+						bsNode.weight[targetData["index"]] >> newBS.weight[targetData["index"]]
+			else:
+				newTarGroup, newTargets = extractBlendShapeTragets(origMesh, bsNode)
 
-			#all dat collected, recreate the BS and connect
-			newBS = pm.blendShape(newTargets, meshTwin, foc = True, name = bsNode.nodeName() + "_copy")[0]
-			pm.delete(newTarGroup)
+				#all dat collected, recreate the BS and connect
+				newBS = pm.blendShape(newTargets, meshTwin, foc = True, name = bsNode.nodeName() + "_copy")[0]
+				pm.delete(newTarGroup)
 
-			if connect:
-				for targetName in newTargets:
-					targetName = targetName.split("|")[-1]
-					bsNode.attr(targetName) >> newBS.attr(targetName)
+				if connect:
+					for targetName in newTargets:
+						targetName = targetName.split("|")[-1]
+						bsNode.attr(targetName) >> newBS.attr(targetName)
 
 			
-			return newBS
\ No newline at end of file
+			return newBS
+
+def getMeshTopologyChecksum(meshName = ""):
+	mSel = om.MSelectionList()
+	mSel.add(meshName)
+	mfnMesh = om.MFnMesh(mSel.getDependNode(0))
+	faceVertexCounts, faceVertexIndices = mfnMesh.getVertices()
+
+	return mnsBSFormat.getTopologyChecksum(mfnMesh.numVertices, list(faceVertexCounts), list(faceVertexIndices))
+
+def exportBlendShapeCache(mesh, bsDeformer, filePath = ""):
+	"""Export the given blendShape deformer's targets into an .mnsBS sparse delta cache file.
+	"""
+
+	meshShape = getShapeFromTransform(mesh)
+	if meshShape and bsDeformer and filePath:
+		bsData = {"name": bsDeformer.nodeName().split(":")[-1],
+					"vertexCount": cmds.polyEvaluate(meshShape.longName(), vertex = True),
+					"topologyChecksum": getMeshTopologyChecksum(meshShape.longName()),
+					"baseWeights": getBlendShapeBaseWeights(bsDeformer),
+					"targets": getBlendShapeTargetsData(bsDeformer)}
+		mnsBSFormat.writeBSFile(filePath, bsData)
+		mnsLog.log("BlendShape cache exported- " + filePath, svr = 1)
+
+		return filePath
+
+def importBlendShapeCache(mesh, filePath = "", **kwargs):
+	"""Create a new blendShape deformer on the given mesh from an .mnsBS cache file.
+	The mesh's topology must match the cached topology checksum.
+	"""
+
+	targets = kwargs.get("targets", None) #arg; comment = target names to load. Default to all targets.
+	name = kwargs.get("name", None) #arg; comment = new blendShape name. Default to the cached deformer name.
+
+	meshShape = getShapeFromTransform(mesh)
+	if meshShape and filePath and os.path.isfile(filePath):
+		if not mnsBSFormat.isBSFile(filePath):
+			mnsLog.log("Not an mnsBS file- " + filePath + ". Aborting.", svr = 2)
+			return None
+
+		fileInfo = mnsBSFormat.getBSFileInfo(filePath)
+		if fileInfo["topologyChecksum"] != getMeshTopologyChecksum(meshShape.longName()):
+			mnsLog.log("Topology mismatch between " + meshShape.nodeName() + " and the blendShape cache- " + filePath + ". Aborting.", svr = 2)
+			return None
+
+		bsData = mnsBSFormat.readBSFile(filePath, targets = targets)
+
+		return createBlendShapeFromTargetsData(mesh, bsData["targets"], name = name or bsData["name"], baseWeights = bsData["baseWeights"])
+
+def benchmarkBlendShapeDuplication(origMesh, **kwargs):
+	"""Benchmark the blendShape duplication methods for the given mesh (onto a temporary twin)- the duplicate-based path, the delta-based path, and an .mnsBS cache export and import.
+	Returns the timings in seconds, and the cache file size.
+	"""
+
+	origMesh = mnsUtils.checkIfObjExistsAndSet(origMesh)
+	results = {}
+	bshps = origMesh.listHistory(type = "blendShape") if origMesh else None
+	if bshps:
+		cachePath = os.path.join(tempfile.mkdtemp(prefix = "mnsBSBenchmark_"), "benchmark.mnsBS")
+		twin = pm.duplicate(origMesh, name = origMesh.nodeName() + "_bsBenchmarkTwin")[0]
+		for shape in twin.getShapes():
+			if shape.intermediateObject.get(): pm.delete(shape)
+
+		for method, methodCall in [("duplicate", lambda: duplicateBlendShapeNodes(origMesh, twin)),
+									("deltas", lambda: duplicateBlendShapeNodes(origMesh, twin, fromDeltas = True)),
+									("cacheExport", lambda: exportBlendShapeCache(origMesh, bshps[0], cachePath)),
+									("cacheImport", lambda: importBlendShapeCache(twin, cachePath, name = "benchmark_bs"))]:
+			startTime = time.time()
+			newBS = methodCall()
+			results[method] = time.time() - startTime
+			if newBS and method != "cacheExport": pm.delete(newBS)
+
+		results["cacheSize"] = os.path.getsize(cachePath)
+		pm.delete(twin)
+		os.remove(cachePath)
+		os.rmdir(os.path.dirname(cachePath))
+
+	return results
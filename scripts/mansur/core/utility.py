@@ -4,7 +4,7 @@ This module holds any 'global' function used within MNS.
 A 'misc' style module."""
 
 #global dependencies
-import fnmatch, imp, os, types, json, math, importlib, pkgutil, re, shutil, socket, platform
+import fnmatch, imp, os, types, json, math, importlib, pkgutil, re, shutil, socket, platform, time
 
 
 from maya import cmds
@@ -17,6 +17,7 @@ from shutil import move, copymode
 from os import fdopen, remove
 from maya import cmds
 import maya.OpenMaya as OpenMaya
+import maya.mel as mel
 
 #mns dependencies
 from . import log as mnsLog
@@ -100,6 +101,11 @@ def checkFunctionRedundencyForPackage(package, printRedundentOnly = True):
 	print("\n=====================================================")
 
 def reloadLib():
+	"""Reload the mansur package, along with all of its modules (regardless of the dev mode flag).
+	"""
+
+	from . import lazyLoader as mnsLazyLoader
+	mnsLazyLoader.reloadRequested = True
 	mansur = __import__(__name__.split('.')[0])
 	reload(mansur)
 
@@ -508,8 +514,218 @@ def getFirstLevelParentForObject(obj):
 	else: return obj
 	#return;pyNode (top level parent)
 
+def melString(value = ""):
+	"""Return the given value as a quoted, escaped MEL string literal.
+	"""
+
+	value = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+	#return; string (MEL string literal)
+	return "\"" + value + "\""
+
+def formatAttrSpec(attrSpec = {}):
+	"""Validate and coerce a single attribute spec (as passed to addAttrToObj) into a creation definition.
+	Returns None if the spec is invalid.
+	"""
+
+	attrName = attrSpec.get("name", "")
+	attrType = attrSpec.get("type", "string")
+	attrValue = attrSpec.get("value", None)
+	attrMax = attrSpec.get("max", None)
+	attrMin = attrSpec.get("min", None)
+
+	if attrType is unicode: attrType = str
+	if type(attrValue) is unicode: attrValue = str(attrValue)
+	if type(attrType) is str: 
+		attrType = attrType.lower()
+		if attrType == "string" or attrType == "str": attrType = str
+		if attrType == "int" or attrType == "short": attrType = int
+		if attrType == "float" or attrType == "double" or attrType == "long": attrType = float
+		if attrType == "bool" or attrType == "boolean" or attrType == "binary": attrType = bool
+		if attrType == "enum" or attrType == "list": attrType = list
+		if attrType == "message" or attrType == "msg": attrType = "message"
+
+	if attrType is bool and attrValue > 0: attrValue = True
+	if attrType is bool and attrValue == "on": attrValue = True
+	if attrType is bool and attrValue == "1": attrValue = True
+	if attrType is bool and attrValue == 0: attrValue = False
+	if attrType is bool and attrValue == "off": attrValue = False
+	if attrType is bool and attrValue == "0": attrValue = False
+
+	if not attrName:
+		mnsLog.log("Couldn't add attribute- attr name wasn't passed in.", svr = 0)
+		return None
+
+	if type(attrValue) is str and attrType is int:
+		try: attrValue = int(attrValue)
+		except: pass
+	if type(attrValue) is str and attrType is float:
+		try: attrValue = float(attrValue)
+		except: pass
+
+	if not (type(attrValue) is attrType or attrType == "message"):
+		mnsLog.log("Couldn't add attribute '" + attrName + "' - the attribute value passed '" + str(attrValue) +"' does not match the attr type passed", svr = 0)
+		return None
+
+	attrTypeName = None
+	if attrType is str: attrTypeName = "string"
+	if attrType is int: attrTypeName = "short"
+	if attrType is float: attrTypeName = "double"
+	if attrType is bool: attrTypeName = "bool"
+	if attrType is list: attrTypeName = "enum"
+	if attrType == "message": attrTypeName = "message"
+
+	if not attrTypeName:
+		mnsLog.log("Couldn't add attribute '" + attrName + "' - the attr type is invalid.", svr = 0)
+		return None
+
+	if attrMax or attrMin:
+		if type(attrMax) is str and attrType is int:
+			try: attrMax = int(attrMax)
+			except: pass
+		if type(attrMax) is str and attrType is float:
+			try: attrMax = float(attrMax)
+			except: pass
+
+		if type(attrMin) is str and attrType is int:
+			try: attrMin = int(attrMin)
+			except: pass
+		if type(attrMin) is str and attrType is float:
+			try: attrMin = float(attrMin)
+			except: pass
+
+		if attrType is int or attrType is float:
+			if not type(attrMax) is attrType: attrMax = None
+			if not type(attrMin) is attrType: attrMin = None
+		else: 
+			mnsLog.log("min/Max flags ignored ('" + attrName + "'). The attr type is not an int or float type.", svr = 2)
+			attrMax, attrMin = None, None
+	else:
+		attrMax, attrMin = None, None
+
+	#return; dict (formatted attribute definition)
+	return {
+			"name": attrName,
+			"type": attrType,
+			"typeName": attrTypeName,
+			"value": attrValue,
+			"max": attrMax,
+			"min": attrMin,
+			"replace": attrSpec.get("replace", False),
+			"locked": attrSpec.get("locked", False),
+			"cb": attrSpec.get("cb", True),
+			"keyable": attrSpec.get("keyable", True),
+			"enumDefault": attrSpec.get("enumDefault", 0)
+			}
+
+def getAttrCreationCommands(nodeName = "", attrDef = {}, exists = False):
+	"""Build the MEL commands to (re)create a single attribute, based on a formatted attribute definition.
+	"""
+
+	plugName = melString(nodeName + "." + attrDef["name"])
+	attrType = attrDef["type"]
+	commands = []
+
+	if exists:
+		commands.append("setAttr -lock false " + plugName)
+		commands.append("deleteAttr " + plugName)
+
+	if attrType is str:
+		commands.append("addAttr -ln " + melString(attrDef["name"]) + " -dt \"string\" " + melString(nodeName))
+		commands.append("setAttr -type \"string\" " + plugName + " " + melString(attrDef["value"]))
+	elif attrType is list:
+		commands.append("addAttr -ln " + melString(attrDef["name"]) + " -at \"enum\" -en " + melString(mnsString.flattenArrayColon(attrDef["value"])) + " " + melString(nodeName))
+		commands.append("setAttr " + plugName + " " + str(int(attrDef["enumDefault"])))
+		commands.append("addAttr -e -dv " + str(int(attrDef["enumDefault"])) + " " + plugName)
+	elif attrType == "message":
+		commands.append("addAttr -ln " + melString(attrDef["name"]) + " -at \"message\" " + melString(nodeName))
+		connectNode = checkIfObjExistsAndSet(obj = attrDef["value"])
+		if connectNode: commands.append("connectAttr " + melString(connectNode.name() + ".message") + " " + plugName)
+	else:
+		value = str(int(attrDef["value"])) if attrType is not float else repr(attrDef["value"])
+		commands.append("addAttr -ln " + melString(attrDef["name"]) + " -at " + melString(attrDef["typeName"]) + " -dv " + value + " " + melString(nodeName))
+		if attrDef["max"] is not None: commands.append("catchQuiet(`addAttr -e -max " + str(attrDef["max"]) + " " + plugName + "`)")
+		if attrDef["min"] is not None: commands.append("catchQuiet(`addAttr -e -min " + str(attrDef["min"]) + " " + plugName + "`)")
+
+	if attrDef["locked"]: commands.append("setAttr -lock true " + plugName)
+	if attrDef["cb"]: commands.append("catchQuiet(`setAttr -channelBox true " + plugName + "`)")
+	if attrDef["keyable"]: commands.append("catchQuiet(`setAttr -keyable true " + plugName + "`)")
+
+	#return; list (MEL commands)
+	return commands
+
+def getCaughtCommandsBlock(commands = []):
+	"""Wrap the given MEL commands in catch statements, for a batched MEL evaluation.
+	The commands run in order, until one fails. The block's failure state is appended to the $mnsCmdStates int array, which is expected to be declared (along with $mnsCmdFailed) by the caller.
+	catchQuiet commands are considered optional, and never fail the block.
+	"""
+
+	block = ["$mnsCmdFailed = 0;"]
+	for command in commands:
+		if command.startswith("catchQuiet("): block.append("if (!$mnsCmdFailed) " + command + ";")
+		else: block.append("if (!$mnsCmdFailed) $mnsCmdFailed = catch(`" + command + "`);")
+	block.append("$mnsCmdStates[size($mnsCmdStates)] = $mnsCmdFailed;")
+
+	#return; string (MEL block)
+	return "\n".join(block)
+
+def addAttrsToObjs(objects = [], attrSpecs = [], **kwargs):
+	"""Bulk attribute creation engine.
+	Adds all of the given attribute specs (each a dict of addAttrToObj arguments) to all of the given objects.
+	Attribute existence is computed from a single listAttr call per object, and all creation, set, lock and channel-box commands are
+	queued and executed in a single (undoable) MEL evaluation.
+	Every attribute's commands are caught separately- a failing attribute is logged and skipped, without aborting the rest.
+	Returns the created plug names.
+	"""
+
+	perObjectSpecs = kwargs.get("perObjectSpecs", {}) #arg; comment = additional specs per object, keyed by the object (as passed in)
+
+	if type(objects) is not list: objects = [objects]
+	if type(attrSpecs) is not list: attrSpecs = [attrSpecs]
+
+	formattedSpecs = [attrDef for attrDef in [formatAttrSpec(attrSpec) for attrSpec in attrSpecs] if attrDef]
+
+	commands = []
+	returnPlugs = []
+	for objKey in objects:
+		obj = checkIfObjExistsAndSet(obj = objKey)
+
+		if obj:
+			objSpecs = formattedSpecs
+			if objKey in perObjectSpecs:
+				objSpecs = formattedSpecs + [attrDef for attrDef in [formatAttrSpec(attrSpec) for attrSpec in perObjectSpecs[objKey]] if attrDef]
+			if not objSpecs: continue
+
+			nodeName = obj.name()
+			existingAttrs = set((cmds.listAttr(nodeName) or []) + (cmds.listAttr(nodeName, sn = True) or []))
+
+			for attrDef in objSpecs:
+				exists = attrDef["name"] in existingAttrs
+				if exists and not attrDef["replace"]: continue
+
+				commands.append(getCaughtCommandsBlock(getAttrCreationCommands(nodeName, attrDef, exists)))
+				existingAttrs.add(attrDef["name"])
+				returnPlugs.append(nodeName + "." + attrDef["name"])
+		else: mnsLog.log("Couldn't add attribute- the object passed is invalid", svr = 1)
+
+	if commands:
+		failedStates = mel.eval("int $mnsCmdFailed = 0;\nint $mnsCmdStates[] = {};\n" + "\n".join(commands) + "\n$mnsCmdStates;") or []
+		for plugName in [returnPlugs[k] for k, failed in enumerate(failedStates) if failed]:
+			mnsLog.log("Couldn't add attribute '" + plugName + "'.", svr = 0)
+			returnPlugs.remove(plugName)
+
+		#invalidate typed settings blob entries for any recreated enum attributes
+		for nodeName in set(plugName.split(".")[0] for plugName in returnPlugs):
+			if cmds.objExists(nodeName + "." + GLOB_settingsBlobAttrName):
+				enumAttrNames = [plugName.split(".")[-1] for plugName in returnPlugs if plugName.split(".")[0] == nodeName and cmds.getAttr(plugName, type = True) == "enum"]
+				if enumAttrNames: removeSettingsFromBlob(nodeName, enumAttrNames)
+
+	#return; list (created plug names)
+	return returnPlugs
+
 def addAttrToObj(objects = [], **kwargs):
 	"""A global conditioned wrapper for adding attributes to object/objects
+	This is a thin wrapper around the bulk attribute creation engine (addAttrsToObjs).
 	
 	Exceptions:
 		1. Object to add attr to was found non-existing or invalid. Abort.
@@ -521,140 +737,20 @@ def addAttrToObj(objects = [], **kwargs):
 		7. The replace flag was set to True, but the attribute doesn't exist. Ignore replace flag.
 		
 	"""
-	
-	if type(objects) is not list: objects = [objects]
-	returnObj = []
-	
-	for obj in objects:
-		obj = checkIfObjExistsAndSet(obj = obj)
-
-		if obj:
-			attrName = kwargs.get("name", "") #arg; comment = Added attribute name
-			replace = kwargs.get("replace", False) #arg; comment = If attr exists and this flag is set to True- delete the existing attribute then recreate according to parameters
-
-			attrExists = False
-			try: 
-				pm.getAttr(obj.nodeName() + "." +  attrName)
-				attrExists = True
-			except: pass
 
-			if attrExists and not replace:
-				pass
-			else:
-				attrType = kwargs.get("type", "string") #arg; comment = Added attribute type; optionBox = string, int, float, bool, enum
-				attrValue = kwargs.get("value", None) #arg; comment = Added attribute value
-				attrMax = kwargs.get("max", None) #arg; comment = Added attribute max (only if float or int)
-				attrMin = kwargs.get("min", None) #arg; comment = Added attribute min (only if float or int)
-				locked = kwargs.get("locked", False) #arg; comment = Added attribute lock state
-				channelBoxF = kwargs.get("cb", True) #arg; comment = Added attribute channelBox/Displayed state
-				keyable = kwargs.get("keyable", True) #arg; comment = Added attribute keyable state
-				enumDefault = kwargs.get("enumDefault", 0) #arg; comment = If added attr is enum, set its default to this value
+	attrName = kwargs.get("name", "") #arg; comment = Added attribute name
+	replace = kwargs.get("replace", False) #arg; comment = If attr exists and this flag is set to True- delete the existing attribute then recreate according to parameters
+	attrType = kwargs.get("type", "string") #arg; comment = Added attribute type; optionBox = string, int, float, bool, enum
+	attrValue = kwargs.get("value", None) #arg; comment = Added attribute value
+	attrMax = kwargs.get("max", None) #arg; comment = Added attribute max (only if float or int)
+	attrMin = kwargs.get("min", None) #arg; comment = Added attribute min (only if float or int)
+	locked = kwargs.get("locked", False) #arg; comment = Added attribute lock state
+	channelBoxF = kwargs.get("cb", True) #arg; comment = Added attribute channelBox/Displayed state
+	keyable = kwargs.get("keyable", True) #arg; comment = Added attribute keyable state
+	enumDefault = kwargs.get("enumDefault", 0) #arg; comment = If added attr is enum, set its default to this value
 
-				
-				if attrType is unicode: attrType = str
-				if type(attrValue) is unicode: attrValue = str(attrValue)
-				if type(attrType) is str: 
-					attrType = attrType.lower()
-					if attrType == "string" or attrType == "str": attrType = str
-					if attrType == "int" or attrType == "short": attrType = int
-					if attrType == "float" or attrType == "double" or attrType == "long": attrType = float
-					if attrType == "bool" or attrType == "boolean" or attrType == "binary": attrType = bool
-					if attrType == "enum" or attrType == "list": attrType = list
-					if attrType == "message" or attrType == "msg": attrType = "message"
-
-				if attrType is bool and attrValue > 0: attrValue = True
-				if attrType is bool and attrValue == "on": attrValue = True
-				if attrType is bool and attrValue == "1": attrValue = True
-				if attrType is bool and attrValue == 0: attrValue = False
-				if attrType is bool and attrValue == "off": attrValue = False
-				if attrType is bool and attrValue == "0": attrValue = False
-
-				if attrName:
-					if type(attrValue) is str and attrType is int:
-						try: attrValue = int(attrValue)
-						except: pass
-					if type(attrValue) is str and attrType is float:
-						try: attrValue = float(attrValue)
-						except: pass
-
-					if type(attrValue) is attrType or attrType == "message":
-						attrTypeName = None
-						if attrType is str: attrTypeName = "string"
-						if attrType is int: attrTypeName = "short"
-						if attrType is float: attrTypeName = "double"
-						if attrType is bool: attrTypeName = "bool"
-						if attrType is list: attrTypeName = "enum"
-						if attrType == "message": attrTypeName = "message"
-
-						if attrTypeName:
-							attrExists = False
-							try: 
-								pm.getAttr(obj.nodeName() + "." +  attrName)
-								attrExists = True
-							except: pass
-							if attrExists and replace:
-								oldAttr = obj.attr(attrName)
-								oldAttr.setLocked(False)
-								pm.deleteAttr(oldAttr)
-							
-							if attrType is str: obj.addAttr(attrName, dt = attrTypeName)
-							elif attrType == list: 
-								stringValues = mnsString.flattenArrayColon(attrValue)
-								pm.addAttr(obj, ln=attrName, at="enum", enumName=stringValues)
-							else: 
-								obj.addAttr(attrName, at = attrTypeName)
-
-							newAttr = obj.attr(attrName)
-
-							if attrType == "message": 
-								connectNode = checkIfObjExistsAndSet(obj = attrValue)
-								if connectNode: connectNode.message >> newAttr
-							elif attrType is not list: 
-								newAttr.set(attrValue)
-								if not attrType is str and not attrType is unicode: 
-									pm.addAttr(newAttr, e = True, dv = attrValue)
-							else: 
-								newAttr.set(enumDefault)
-								pm.addAttr(newAttr, e = True, dv = enumDefault)
-							
-							if attrMax or attrMin:
-								if type(attrMax) is str and attrType is int:
-									try: attrMax = int(attrMax)
-									except: pass
-								if type(attrMax) is str and attrType is float:
-									try: attrMax = float(attrMax)
-									except: pass
-
-								if type(attrMin) is str and attrType is int:
-									try: attrMin = int(attrMin)
-									except: pass
-								if type(attrMin) is str and attrType is float:
-									try: attrMin = float(attrMin)
-									except: pass
-
-								if attrType is int or attrType is float:
-									try:
-										if type(attrMax) is attrType:
-											pm.addAttr(newAttr, e = True, maxValue = attrMax) 
-									except: pass
-									try:
-										if type(attrMin) is attrType: 
-											pm.addAttr(newAttr, e = True, minValue = attrMin) 
-									except: pass
-								else: mnsLog.log("min/Max flags ignored ('" + attrName + "'). The attr type is not an int or float type.", svr = 2)
-							
-							if locked: newAttr.setLocked(True)
-							if channelBoxF: newAttr.showInChannelBox(True)
-							if keyable: newAttr.setKeyable(True)
-							returnObj.append(newAttr)
-							
-						else: mnsLog.log("Couldn't add attribute '" + attrName + "' - the attr type is invalid.", svr = 0)
-					else: mnsLog.log("Couldn't add attribute '" + attrName + "' - the attribute value passed '" + str(attrValue) +"' does not match the attr type passed", svr = 0)
-				else: mnsLog.log("Couldn't add attribute- attr name wasn't passed in.", svr = 0)
-		else: mnsLog.log("Couldn't add attribute- the object passed is invalid", svr = 1)
-		
 	#return; list (added attributes 'attr' objects list)
-	return returnObj
+	return [pm.Attribute(plugName) for plugName in addAttrsToObjs(objects, [kwargs])]
 
 def readSetteingFromFile(settingsPath):
 	"""Read mns setting from a given file and collect into a dict.
@@ -752,9 +848,70 @@ def lockAndHideTransforms(node = None, **kwargs):
 	#return;bool
 	return returnBool
 
+def setChannelStateBulk(nodes = [], **kwargs):
+	"""Bulk channel state engine.
+	Apply a lock/keyable/channel-box state to the requested transform channels (channel mask) of all of the given nodes at once.
+	The current channel states are collected using a few listAttr calls per node, and only attributes not already in the requested state are written,
+	all within a single (undoable) MEL evaluation.
+	"""
+
+	lock = kwargs.get("lock", False) #arg;
+	keyable = kwargs.get("keyable", False) #arg;
+	cb = kwargs.get("cb", False) #arg;
+
+	t = kwargs.get("t", True) #arg;
+	r = kwargs.get("r", True) #arg;
+	s = kwargs.get("s", True) #arg;
+	x = kwargs.get("x", True) #arg;
+	y = kwargs.get("y", True) #arg;
+	z = kwargs.get("z", True) #arg;
+
+	if type(nodes) is not list: nodes = [nodes]
+
+	channels = [channel for k, channel in enumerate(["translate", "rotate", "scale"]) if [t, r, s][k]]
+	axes = [axis for k, axis in enumerate(["X", "Y", "Z"]) if [x, y, z][k]]
+	attrNames = [channel + axis for axis in axes for channel in channels]
+
+	commands = []
+	skipCount = 0
+	failedNodes = []
+	for node in nodes:
+		if type(node).__name__ == "MnsNameStd": node = node.node
+		nodeName = str(node)
+
+		try: existingAttrs = set(cmds.listAttr(nodeName, st = attrNames) or [])
+		except: existingAttrs = set()
+		if len(existingAttrs) != len(attrNames): failedNodes.append(nodeName)
+		if not existingAttrs: continue
+
+		lockedAttrs = set(cmds.listAttr(nodeName, l = True) or [])
+		keyableAttrs = set(cmds.listAttr(nodeName, k = True) or [])
+		cbAttrs = set(cmds.listAttr(nodeName, cb = True) or [])
+
+		for attrName in attrNames:
+			if attrName not in existingAttrs: continue
+			plugName = melString(nodeName + "." + attrName)
+
+			if (attrName in lockedAttrs) != bool(lock): commands.append("setAttr -lock " + str(int(bool(lock))) + " " + plugName)
+			else: skipCount += 1
+
+			if (attrName in keyableAttrs) != bool(keyable): commands.append("setAttr -keyable " + str(int(bool(keyable))) + " " + plugName)
+			else: skipCount += 1
+
+			#the channel box flag is only effective for non-keyable attributes
+			if not keyable and (attrName in cbAttrs) != bool(cb): commands.append("setAttr -channelBox " + str(int(bool(cb))) + " " + plugName)
+			else: skipCount += 1
+
+	if commands: mel.eval(";\n".join(commands) + ";")
+	if len(nodes) > 1: mnsLog.log("Channel state applied to " + str(len(nodes)) + " nodes. " + str(len(commands)) + " writes, " + str(skipCount) + " writes avoided.", svr = 0)
+
+	#return;dict ('writes': number of attribute writes, 'skipped': number of avoided writes, 'failedNodes': nodes missing requested channels)
+	return {"writes": len(commands), "skipped": skipCount, "failedNodes": failedNodes}
+
 def lockAndHideAllTransforms(node = None, **kwargs):
 	"""Lock and hide all of the given node's attributes.
 	Override flags can be inserted to skip requested channels.
+	This is a single node wrapper around setChannelStateBulk.
 	"""
 
 	lock = kwargs.get("lock", False) #arg;
@@ -768,33 +925,7 @@ def lockAndHideAllTransforms(node = None, **kwargs):
 	y = kwargs.get("y", True) #arg;
 	z = kwargs.get("z", True) #arg;
 
-	chanString = ""
-	channels = ["t","r","s"]
-	k = 0
-	for channel in [t,r,s]:
-		if channel: chanString += channels[k]
-		k += 1
-
-	axesString = ""
-	axes = ["x","y","z"]
-	k = 0
-	for axis in [x,y,z]:
-		if axis: axesString += axes[k]
-		k += 1
-
-	returnBool = True
-	if type(node).__name__ == "MnsNameStd":
-		node = node.node
-	for axis in axes:
-		for channel in chanString:
-			try:
-				attr = node.attr(channel + axis)
-				attr.setLocked(lock)
-				attr.showInChannelBox(cb)
-				attr.setKeyable(keyable)
-			except: 
-				returnBool = False
-				pass
+	returnBool = not setChannelStateBulk([node], **kwargs)["failedNodes"]
 
 	#return;bool
 	return returnBool
@@ -967,6 +1098,60 @@ def splitEnumAttrToColorSchemeFloatTupleList(enumAttrName, node):
 	#return;list (formatted list of tuples)
 	return values
 
+def readSettingsBlob(node = None):
+	"""Read the typed settings blob from the given settings holder (module root/rig top), using a single attribute read.
+	The blob is a versioned json string attribute holding natively typed list, channel-control and color-scheme settings,
+	replacing the need to query and split the corresponding enum attributes.
+	Returns an empty dict if the blob doesn't exist, or is invalid.
+	"""
+
+	nodeName = str(node)
+	if not cmds.objExists(nodeName + "." + GLOB_settingsBlobAttrName): return {}
+
+	try:
+		blob = json.loads(cmds.getAttr(nodeName + "." + GLOB_settingsBlobAttrName) or "{}")
+	except:
+		mnsLog.log("Invalid settings blob found on '" + nodeName + "'. Ignoring.", svr = 2)
+		return {}
+
+	if not isinstance(blob, dict) or blob.get("version", 0) > GLOB_settingsBlobVersion: return {}
+
+	#return;dict (settings)
+	return blob.get("settings", {})
+
+def writeSettingsBlob(node = None, settings = {}, **kwargs):
+	"""Write (merge by default) the given typed settings into the settings blob of the given settings holder.
+	The blob attribute is created if it doesn't exist.
+	"""
+
+	merge = kwargs.get("merge", True) #arg; comment = If True, merge the given settings into the existing blob. Otherwise replace the blob content.
+
+	nodeName = str(node)
+	if not cmds.objExists(nodeName): return
+
+	if merge:
+		blobSettings = readSettingsBlob(nodeName)
+		blobSettings.update(settings)
+		settings = blobSettings
+
+	blobString = json.dumps({"version": GLOB_settingsBlobVersion, "settings": settings}, sort_keys = True)
+	if not cmds.objExists(nodeName + "." + GLOB_settingsBlobAttrName):
+		addAttrsToObjs(nodeName, [{"name": GLOB_settingsBlobAttrName, "type": str, "value": blobString, "locked": True, "cb": False, "keyable": False}])
+	else:
+		setAttrValuesBulk(nodeName, {GLOB_settingsBlobAttrName: blobString})
+
+def removeSettingsFromBlob(node = None, settingNames = []):
+	"""Remove the given settings from the settings blob of the given settings holder, if they exist.
+	Used to invalidate blob entries when their enum encoded attribute is recreated outside of the settings flow.
+	"""
+
+	nodeName = str(node)
+	blobSettings = readSettingsBlob(nodeName)
+	removeNames = [settingName for settingName in settingNames if settingName in blobSettings]
+	if removeNames:
+		for settingName in removeNames: blobSettings.pop(settingName)
+		writeSettingsBlob(nodeName, blobSettings, merge = False)
+
 def setAttr(attr, value):
 	"""mns set attr.
 	Simple method to set attributes. 
@@ -983,6 +1168,73 @@ def setAttr(attr, value):
 	except: pass
 	if locked: attr.setLocked(True)
 
+def getAttrValuesBulk(nodeName = "", attrNames = []):
+	"""Bulk attribute value read.
+	Reads all of the requested attributes of the given node using plain cmds calls (no PyNode attribute construction).
+	Single compound values (i.e. double3) are flattened to a tuple, to match the PyMel get() return type.
+	Attributes that can't be read (i.e. message attributes) are skipped.
+	"""
+
+	returnDict = {}
+	for attrName in attrNames:
+		try: value = cmds.getAttr(nodeName + "." + attrName)
+		except: continue
+
+		if type(value) == list and len(value) == 1 and type(value[0]) == tuple: value = value[0]
+		returnDict[attrName] = value
+
+	#return; dict (attribute name: value)
+	return returnDict
+
+def attrValuesMatch(valueA, valueB):
+	"""Compare two attribute values, allowing a small tolerance for float values.
+	"""
+
+	if isinstance(valueA, (list, tuple)) and isinstance(valueB, (list, tuple)):
+		if len(valueA) != len(valueB): return False
+		for k in range(len(valueA)):
+			if not attrValuesMatch(valueA[k], valueB[k]): return False
+		return True
+	elif isinstance(valueA, float) or isinstance(valueB, float):
+		try: return abs(float(valueA) - float(valueB)) < 0.000001
+		except: return False
+	else:
+		return valueA == valueB
+
+def setAttrValuesBulk(nodeName = "", attrValues = {}, **kwargs):
+	"""Bulk attribute value write.
+	Writes all of the given attribute values using plain cmds calls.
+	Values matching the current attribute values are skipped, locked attributes are unlocked, set, and re-locked.
+	"""
+
+	skipUnchanged = kwargs.get("skipUnchanged", True) #arg; comment = skip attributes that already hold the requested value
+
+	currentValues = {}
+	if skipUnchanged: currentValues = getAttrValuesBulk(nodeName, list(attrValues.keys()))
+
+	setCount = 0
+	for attrName in attrValues:
+		value = attrValues[attrName]
+		if attrName in currentValues and attrValuesMatch(currentValues[attrName], value): continue
+
+		plugName = nodeName + "." + attrName
+		locked = False
+		try: 
+			locked = cmds.getAttr(plugName, lock = True)
+			if locked: cmds.setAttr(plugName, lock = False)
+
+			if isinstance(value, (str, unicode)): cmds.setAttr(plugName, value, type = "string")
+			elif isinstance(value, (list, tuple)): cmds.setAttr(plugName, *value)
+			else: cmds.setAttr(plugName, value)
+			setCount += 1
+		except: pass
+		if locked: 
+			try: cmds.setAttr(plugName, lock = True)
+			except: pass
+
+	#return; int (number of attributes written)
+	return setCount
+
 def readJson(fullPath):
 	"""Read the input json path into formatted python variables.
 	"""
@@ -1227,6 +1479,8 @@ def locatePreferencesDirectory():
 	#return; string (preferences directory path)
 	return prefsPath
 
+mnsPrefsState = {"filePath": None, "stamp": None, "snapshot": None, "lastCheck": 0.0, "defaults": None}
+
 def createMnsDefaultPrefs(**kwargs):
 	"""This method is called whenever a pref read is being called.
 	In case this method fails to locate local prefs for the current user, it creates it from the defualt prefs file.
@@ -1235,6 +1489,7 @@ def createMnsDefaultPrefs(**kwargs):
 	"""
 
 	restore = kwargs.get("restoreDefaults", False)
+	if restore: mnsPrefsState["stamp"] = None
 
 	defPrefDir = dirname(dirname(__file__)) + "/preferences/preferencesDefaults.json"
 	if os.path.isfile(defPrefDir):
@@ -1260,38 +1515,131 @@ def createMnsDefaultPrefs(**kwargs):
 	#return; string (prefs file path)
 
 def getMansurPrefsDefaults(**kwargs):
-	defPrefDir = dirname(dirname(__file__)) + "/preferences/preferencesDefaults.json"
-	if os.path.isfile(defPrefDir):
-		return readJson(defPrefDir)
+	"""Return the default prefs. The defaults file is read once, and cached.
+	"""
+
+	if mnsPrefsState["defaults"] is None:
+		defPrefDir = dirname(dirname(__file__)) + "/preferences/preferencesDefaults.json"
+		if not os.path.isfile(defPrefDir): return None
+		mnsPrefsState["defaults"] = readJson(defPrefDir)
+
+	#return; dict (default prefrences)
+	return json.loads(json.dumps(mnsPrefsState["defaults"]))
+
+def getPrefsFileStamp(filePath = None):
+	"""Return the given file's (mtime, size) stamp, used to detect external edits. None if the file doesn't exist.
+	"""
+
+	try:
+		fileStat = os.stat(filePath)
+	except (OSError, TypeError):
+		return None
+
+	#return; tuple (mtime, size)
+	return (fileStat.st_mtime, fileStat.st_size)
+
+def mergePrefsWithDefaults(prefs = {}):
+	"""Fill any missing category or pref in the given prefs from the defaults (in place).
+	"""
+
+	defaultPrefs = getMansurPrefsDefaults() or {}
+	for prefCat in defaultPrefs.keys():
+		if prefCat not in prefs.keys():
+			prefs[prefCat] = defaultPrefs[prefCat]
+		else:
+			for pref in defaultPrefs[prefCat]:
+				if pref not in prefs[prefCat].keys():
+					prefs[prefCat][pref] = defaultPrefs[prefCat][pref]
+
+	#return; dict (prefrences)
+	return prefs
+
+def loadMansurPrefs(force = False):
+	"""Load the prefs file into the in-memory prefs (GLOB_mnsPrefs), merged with the defaults.
+	The file is only read when it was changed on disk (by its mtime and size stamp) since the last load, or when forced.
+	"""
+
+	from . import globals as mnsGlobals
+
+	prefsFile = mnsPrefsState["filePath"]
+	if not prefsFile or not os.path.isfile(prefsFile):
+		prefsFile = getMansurPrefsFromFile(returnFileDirectory = True)
+		mnsPrefsState["filePath"] = prefsFile
+
+	stamp = getPrefsFileStamp(prefsFile)
+	if force or not mnsGlobals.GLOB_mnsPrefs or stamp != mnsPrefsState["stamp"]:
+		prefs = readJson(prefsFile) if prefsFile else {}
+		if prefs or not mnsGlobals.GLOB_mnsPrefs:
+			mnsGlobals.GLOB_mnsPrefs = mergePrefsWithDefaults(prefs)
+			mnsPrefsState["stamp"] = stamp
+			mnsPrefsState["snapshot"] = json.dumps(mnsGlobals.GLOB_mnsPrefs, sort_keys = True)
+	mnsPrefsState["lastCheck"] = time.time()
+
+	#return; dict (prefrences)
+	return mnsGlobals.GLOB_mnsPrefs
+
+def saveMansurPrefs(prefs = None):
+	"""Write the given prefs (default to the in-memory prefs) into the prefs file.
+	The file is only written if the prefs were actually changed. The write is atomic- into a temp file within the prefs directory, which then replaces the prefs file.
+	"""
+
+	from . import globals as mnsGlobals
+
+	prefs = prefs if prefs is not None else mnsGlobals.GLOB_mnsPrefs
+	snapshot = json.dumps(prefs, sort_keys = True)
+	if snapshot == mnsPrefsState["snapshot"]: return False
+
+	prefsDir = locatePreferencesDirectory()
+	if not prefsDir: return False
+	prefsFile = prefsDir + "/" + GLOB_mnsPrefsFileName
+
+	fileHandle, tempPath = mkstemp(dir = prefsDir, prefix = GLOB_mnsPrefsFileName + ".", suffix = ".tmp")
+	try:
+		with fdopen(fileHandle, "w") as outfile:
+			json.dump(prefs, outfile)
+		if hasattr(os, "replace"):
+			os.replace(tempPath, prefsFile)
+		else:
+			if os.path.isfile(prefsFile) and platform.system() == "Windows": remove(prefsFile)
+			os.rename(tempPath, prefsFile)
+	except Exception:
+		if os.path.isfile(tempPath): remove(tempPath)
+		mnsLog.log("Failed to write the prefs file- " + prefsFile, svr = 2)
+		return False
+
+	mnsGlobals.GLOB_mnsPrefs = prefs
+	mnsPrefsState["filePath"] = prefsFile
+	mnsPrefsState["stamp"] = getPrefsFileStamp(prefsFile)
+	mnsPrefsState["snapshot"] = snapshot
+
+	#return; bool (written)
+	return True
 
 def updateMansurPrefs(prefs = None, **kwargs):
-	if not prefs:
-		prefs = getMansurPrefsFromFile()
+	"""Update the in-memory prefs.
+	When prefs are passed in, they are merged with the defaults, and saved (only if changed).
+	Otherwise, the prefs are re-loaded from file only if it was edited since the last load.
+	"""
 
 	if prefs:
-		defaultPrefs = getMansurPrefsDefaults()
-		for prefCat in defaultPrefs.keys():
-			if prefCat not in prefs.keys():
-				prefs[prefCat] = defaultPrefs[prefCat]
-			else:
-				for pref in defaultPrefs[prefCat]:
-					if pref not in prefs[prefCat].keys():
-						prefs[prefCat][pref] = defaultPrefs[prefCat][pref]
-		
+		prefs = mergePrefsWithDefaults(prefs)
+		saveMansurPrefs(prefs)
 		from . import globals as mnsGlobals
 		mnsGlobals.GLOB_mnsPrefs = prefs
-		
-		settingsFile = getMansurPrefsFromFile(returnFileDirectory = True)
-		with open(settingsFile , 'w') as outfile:  
-			json.dump(prefs, outfile)
-
 		return prefs
 
+	#return; dict (prefrences)
+	return loadMansurPrefs()
+
 def getMansurPrefs():
-	"""This method retrives the prefs static dict from globals
+	"""This method retrives the prefs static dict from globals.
+	The prefs file's stamp is re-checked (for external edits) once every GLOB_mnsPrefsCheckInterval seconds at most.
 	"""
 	from . import globals as mnsGlobals
 
+	if not mnsGlobals.GLOB_mnsPrefs or time.time() - mnsPrefsState["lastCheck"] > GLOB_mnsPrefsCheckInterval:
+		loadMansurPrefs()
+
 	return mnsGlobals.GLOB_mnsPrefs
 	#return; dict (prefrences)
 
@@ -1304,7 +1652,7 @@ def getMansurPrefsFromFile(**kwargs):
 
 	prefsFile = None
 	prefsDir = locatePreferencesDirectory()
-	if prefsDir and GLOB_mnsPrefsFileName in os.listdir(prefsDir):
+	if prefsDir and os.path.isfile(prefsDir + "/" + GLOB_mnsPrefsFileName):
 		prefsFile = prefsDir + "/" + GLOB_mnsPrefsFileName
 		
 	else:
@@ -14,7 +14,7 @@ from maya import cmds
 import pymel.core as pm
 
 from functools import partial
-import os, random, json
+import os, random, json, time, subprocess, tempfile, platform, shutil
 import maya.OpenMaya as OpenMaya
 from maya import cmds
 infoNodeName = "mnsAnimationExporterInfo"
@@ -29,6 +29,7 @@ from ...core import UIUtils as mnsUIUtils
 from ...core import nodes as mnsNodes
 from ...core import skinUtility as mnsSkinUtils
 from ...core import meshUtility as mnsMeshUtils
+from ...core import animUtility as mnsAnimUtils
 from ...block.core import blockUtility as blkUtils
 from ...gui import gui as mnsGui
 from ...core.globals import *
@@ -160,6 +161,89 @@ class ExtraAttributesListWidget(QtWidgets.QListWidget):
 
 		menu.exec_(self.viewport().mapToGlobal(position))
 
+def getMayapyPath():
+	"""Return the mayapy executable path for the running Maya, or None if it can't be found.
+	"""
+
+	mayaLocation = os.environ.get("MAYA_LOCATION", "")
+	mayapyPath = os.path.join(mayaLocation, "bin", "mayapy.exe" if platform.system() == "Windows" else "mayapy")
+	if mayaLocation and os.path.isfile(mayapyPath): return mayapyPath
+
+class MnsFBXExportJobQueue(QtCore.QObject):
+	"""Out of process FBX export job queue.
+	Each job is exported by a headless mayapy worker process (see mnsFBXExportWorker), with up to maxWorkers processes running concurrently.
+	The queue is polled using a QTimer, so the interactive session isn't blocked while the jobs are running.
+	Each job writes its own log file, and the finishedCallback is called with the queue once all jobs are done.
+	"""
+
+	def __init__(self, jobs = [], maxWorkers = 4, finishedCallback = None, progressCallback = None):
+		super(MnsFBXExportJobQueue, self).__init__()
+		self.mayapyPath = getMayapyPath()
+		self.workerPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mnsFBXExportWorker.py")
+		self.pendingJobs = list(jobs)
+		self.jobCount = len(jobs)
+		self.maxWorkers = max(1, maxWorkers)
+		self.runningJobs = {}
+		self.finishedJobs = []
+		self.finishedCallback = finishedCallback
+		self.progressCallback = progressCallback
+		self.startTime = None
+
+		self.pollTimer = QtCore.QTimer(self)
+		self.pollTimer.setInterval(250)
+		self.pollTimer.timeout.connect(self.poll)
+
+	def isRunning(self):
+		return self.pollTimer.isActive()
+
+	def start(self):
+		self.startTime = time.time()
+		mnsLog.log("Starting parallel FBX export- " + str(self.jobCount) + " jobs, " + str(self.maxWorkers) + " workers.", svr = 1)
+		self.poll()
+		if self.runningJobs or self.pendingJobs: self.pollTimer.start()
+
+	def launchJob(self, job):
+		with open(job["jobFile"], "w") as f: json.dump(job, f, indent = 4)
+
+		try:
+			logHandle = open(job["log"], "w")
+			process = subprocess.Popen([self.mayapyPath, self.workerPath, job["jobFile"]], stdout = logHandle, stderr = subprocess.STDOUT)
+			self.runningJobs[process] = (job, logHandle, time.time())
+		except Exception as e:
+			self.finishedJobs.append({"job": job, "success": False, "time": 0.0, "error": str(e)})
+
+	def poll(self):
+		for process in list(self.runningJobs.keys()):
+			if process.poll() is not None:
+				job, logHandle, jobStartTime = self.runningJobs.pop(process)
+				logHandle.close()
+				success = process.returncode == 0 and os.path.isfile(job["path"])
+				self.finishedJobs.append({"job": job, "success": success, "time": time.time() - jobStartTime, "error": ""})
+				mnsLog.log("Parallel export job " + ("done" if success else "failed") + ": " + job["path"], svr = 1 if success else 2)
+
+		while self.pendingJobs and len(self.runningJobs) < self.maxWorkers:
+			self.launchJob(self.pendingJobs.pop(0))
+
+		if self.progressCallback: self.progressCallback(len(self.finishedJobs), self.jobCount)
+
+		if not self.pendingJobs and not self.runningJobs:
+			self.pollTimer.stop()
+			if self.finishedCallback: self.finishedCallback(self)
+
+	def getSummary(self):
+		"""Return the summary lines for all finished jobs.
+		"""
+
+		summary = []
+		for jobResult in self.finishedJobs:
+			line = "      " + jobResult["job"]["path"] + ": " + ("Sucess" if jobResult["success"] else "Failure") + " (" + str(round(jobResult["time"], 2)) + "s)"
+			if not jobResult["success"]: line += "\n            log: " + (jobResult["error"] or jobResult["job"]["log"])
+			summary.append(line)
+
+		succeeded = len([j for j in self.finishedJobs if j["success"]])
+		summary.append("Parallel export: " + str(succeeded) + "/" + str(self.jobCount) + " ranges exported in " + str(round(time.time() - self.startTime, 2)) + "s using " + str(self.maxWorkers) + " workers.")
+		return summary
+
 form_class, base_class = mnsUIUtils.buildFormBaseClassForUI(os.path.dirname(__file__), "mnsAnimationExporter.ui")
 class MnsAnimationExporter(form_class, base_class):
 	"""Spaces Tool UI Class.
@@ -180,6 +264,8 @@ class MnsAnimationExporter(form_class, base_class):
 		self.rigTabsPairing = {}
 		self.infoNode = None
 		self.ranges_vs = None
+		self.exportJobQueue = None
+		self.exportJobDir = None
 		self.initializeView()
 		self.validateUIInfoNode()
 		loadMsg = self.loadUIInfo()
@@ -537,6 +623,9 @@ class MnsAnimationExporter(form_class, base_class):
 						checkbox = self.findChild(QtWidgets.QCheckBox, settingCbxName)
 						if checkbox:
 							checkbox.setChecked(globalSettings[settingCbxName])
+						spinBox = self.findChild(QtWidgets.QSpinBox, settingCbxName)
+						if spinBox:
+							spinBox.setValue(globalSettings[settingCbxName])
 				
 			elif previousData and type(previousData) is list:
 				#backwards compatibility- < 2.5.0
@@ -747,33 +836,39 @@ class MnsAnimationExporter(form_class, base_class):
 		return extractedRootJnt, origRootJnt, meshTwins, skinnedMeshes, skinData, unusedInfluences, twinDict, messageLog
 	
 	def saveWSAnimData(self, joints, rangeMin, rangeMax):
+		"""Sample the joints world matrices for the given range, through time-specific DG contexts.
+		The time-line isn't moved.
+		"""
+
 		animData = {}
 		if joints:
-			for frame in range(rangeMin, rangeMax):
-				animData[frame] = {}
-				pm.currentTime(frame, e = True)
-				for jnt in joints:
-					animData[frame][jnt] = pm.xform(jnt, q = True, ws=True, a = True, m = True)
+			animData = mnsAnimUtils.sampleWorldMatrices(joints, mnsAnimUtils.getFramesForRange(rangeMin, rangeMax))
 		return animData
 
 	def loadWSAnimData(self, animData):
+		"""Re-apply sampled world matrices to the joints (based on their current hierarchy), as keys per channel.
+		All keyable channels are keyed on every sampled frame, as setKeyframe on the joint would- t/r/s with the solved local values, and all other keyable channels with their sampled values.
+		Existing anim-curves are kept, and keyed into (see setKeysOnPlugs).
+		"""
+
 		if animData:
-			reorderedjoints = {}
-			for j in animData[list(animData.keys())[0]].keys():
-				if mnsUtils.checkIfObjExistsAndSet(j):
-					numParents = (len(j.longName().split("|")) - 2)
-					if numParents in reorderedjoints:
-						reorderedjoints[numParents].append(j)
-					else:
-						reorderedjoints[numParents] = [j]
-			
-			for frame in animData.keys():
-				pm.currentTime(frame, e = True)
-				
-				for i in range(min(reorderedjoints.keys()), max(reorderedjoints.keys()) + 1):
-					for jnt in reorderedjoints[i]:
-						pm.xform(jnt, ws=True, a = True, m = animData[frame][jnt])
-						pm.setKeyframe(jnt)
+			frames = animData["frames"]
+			localChannels = mnsAnimUtils.worldSamplesToLocalChannels(animData)
+
+			plugKeys = {}
+			extraPlugs = []
+			for nodeName in localChannels:
+				for channel in localChannels[nodeName]:
+					plugKeys[nodeName + "." + channel] = (frames, localChannels[nodeName][channel])
+				for attrName in cmds.listAttr(nodeName, keyable = True, scalar = True) or []:
+					if not attrName in localChannels[nodeName]: extraPlugs.append(nodeName + "." + attrName)
+
+			sampledValues = mnsAnimUtils.sampleAttrValues(extraPlugs, frames)
+			for plugName in extraPlugs: plugKeys[plugName] = (frames, sampledValues[plugName])
+
+			plugKeys = dict((plugName, plugKeys[plugName]) for plugName in plugKeys if mnsAnimUtils.isPlugKeyable(plugName))
+			steppedPlugs = [plugName for plugName in extraPlugs if plugName in plugKeys and cmds.getAttr(plugName, type = True) in ["bool", "enum"]]
+			mnsAnimUtils.setKeysOnPlugs(plugKeys, steppedPlugs = steppedPlugs)
 	
 	def writeDefaultData(self, exportData = {}):
 		if self.infoNode:
@@ -785,7 +880,9 @@ class MnsAnimationExporter(form_class, base_class):
 											 "includeMeshes_cbx": self.includeMeshes_cbx.isChecked(),
 											 "geoFromMdlGrpOnly_cbx": self.geoFromMdlGrpOnly_cbx.isChecked(),
 											 "rotToJO_cbx": self.rotToJO_cbx.isChecked(),
-											 "deleteUnusedJnts_cbx": self.deleteUnusedJnts_cbx.isChecked()
+											 "deleteUnusedJnts_cbx": self.deleteUnusedJnts_cbx.isChecked(),
+											 "parallelExport_cbx": self.parallelExport_cbx.isChecked(),
+											 "maxWorkers_sb": self.maxWorkers_sb.value()
 											},
 							"rangesData": {}
 							}
@@ -857,6 +954,147 @@ class MnsAnimationExporter(form_class, base_class):
 				if chan == "s":
 					extractedRootJnt.node.attr(chan + axis).set(1.0)
 			
+	def connectJointsToDrivers(self, extractedRootJnt, origRootJnt):
+		"""Connect the extracted joints to their original joints, using the selected bake connection method.
+		"""
+
+		allJoints = [extractedRootJnt.node] + extractedRootJnt.node.listRelatives(ad = True, type = "joint")
+		allOrigJointsDict = {}
+		for j in [origRootJnt] + origRootJnt.listRelatives(ad = True, type = "joint"):
+			allOrigJointsDict.update({j.nodeName().split(":")[-1]: j})
+			
+		cnsToDel = []
+		for j in allJoints:
+			mnsUtils.lockAndHideAllTransforms(j, lock = False, keyable = True, cb = True)
+			pureName = j.nodeName().split(":")[-1]
+			if pureName in allOrigJointsDict.keys():
+				mnsUtils.lockAndHideAllTransforms(allOrigJointsDict[pureName], lock = False, keyable = True, cb = True)
+
+				if self.bakeConMethod_cb.currentIndex() == 0: #constraints
+					cnsToDel.append(pm.parentConstraint(allOrigJointsDict[pureName], j, mo = True))
+					cnsToDel.append(pm.scaleConstraint(allOrigJointsDict[pureName], j, mo = True))
+					j.jointOrient.set(allOrigJointsDict[pureName].jointOrient.get())
+				else: #direct
+					for chan in ["t", "r", "s", "jointOrient"]:
+						allOrigJointsDict[pureName].attr(chan) >> j.attr(chan)
+
+		return allJoints, cnsToDel
+
+	def disconnectJointsFromDrivers(self, allJoints, cnsToDel):
+		if cnsToDel: pm.delete(cnsToDel)
+		for j in allJoints:
+			for chan in ["t", "r", "s", "jointOrient"]:
+				j.attr(chan).disconnect()
+
+	def duplicateTwinsBlendShapes(self, twinDict):
+		bspsNodes = []
+		for origMesh in twinDict.keys():
+			newBS = mnsMeshUtils.duplicateBlendShapeNodes(origMesh, twinDict[origMesh], connect = True, fromDeltas = True)	
+			if newBS:
+				newBS.rename(newBS.nodeName().split(":")[-1])
+				bspsNodes.append(newBS)
+		return bspsNodes
+
+	def getNormalizeTimeOffset(self, rng):
+		"""Return the key time offset to apply to the given range, when 'normalize ranges' is on.
+		"""
+
+		tc = 0
+		if self.normRanges_cbx.isChecked() and rng["min"] != 0:
+			tc = rng["min"]
+			if rng["min"] > 0: tc = rng["min"] * -1
+		return tc
+
+	def exportSelection(self, newSelection, path, messageLog):
+		pm.select(newSelection)
+		try:
+			pm.mel.FBXExport(f=path, s = True)
+			messageLog.append("      " + path + ": Sucess")
+		except:
+			messageLog.append("      " + path + ": Failure")
+
+	def createParallelExportJobs(self, jobDir, rigTopName, extractedRootJnt, meshTwins, curveNodes, animRanges):
+		"""Save the baked skeleton (and meshes) as an intermediate scene, and create a parallel export job per range.
+		"""
+
+		sceneNodes = [extractedRootJnt.node] + meshTwins
+		exportNodes = [extractedRootJnt.node]
+		if meshTwins and self.includeMeshes_cbx.isChecked(): exportNodes += meshTwins
+
+		intermediateScene = os.path.join(jobDir, rigTopName.replace(":", "_") + "_bake.mb").replace("\\", "/")
+		pm.select(sceneNodes, r = True)
+		cmds.file(intermediateScene, force = True, exportSelected = True, type = "mayaBinary", preserveReferences = False, channels = True, constraints = False, expressions = False, constructionHistory = True, shader = True)
+
+		jobs = []
+		for k, r in enumerate(animRanges):
+			jobName = rigTopName.replace(":", "_") + "_" + str(k).zfill(3) + "_" + os.path.splitext(os.path.basename(r["path"]))[0]
+			jobs.append({
+						"scene": intermediateScene,
+						"path": r["path"],
+						"min": r["min"],
+						"max": r["max"],
+						"timeOffset": self.getNormalizeTimeOffset(r),
+						"resetRootJnt": extractedRootJnt.node.longName() if self.resetRootJnt_cbx.isChecked() else "",
+						"nodes": [n.longName() for n in exportNodes],
+						"curveNodes": [n.longName() for n in curveNodes],
+						"fbxPreset": os.path.join(jobDir, "exportPreset.fbxexportpreset").replace("\\", "/"),
+						"jobFile": os.path.join(jobDir, jobName + ".json").replace("\\", "/"),
+						"log": os.path.join(jobDir, jobName + ".log").replace("\\", "/")
+						})
+		return jobs
+
+	def startParallelExport(self, jobs, jobDir):
+		#pass the current session's FBX export settings to the workers
+		try: pm.mel.FBXSaveExportPresetFile(f = os.path.join(jobDir, "exportPreset.fbxexportpreset").replace("\\", "/"))
+		except: mnsLog.log("Couldn't save the current FBX export preset. Workers will use the default FBX export settings.", svr = 2)
+
+		self.exportJobDir = jobDir
+		self.exportJobQueue = MnsFBXExportJobQueue(jobs, self.maxWorkers_sb.value(), finishedCallback = self.parallelExportFinished, progressCallback = self.parallelExportProgress)
+		self.exportJobQueue.start()
+
+	def parallelExportProgress(self, finishedCount, jobCount):
+		if jobCount: self.process_pb.setValue(int(100.0 * finishedCount / jobCount))
+
+	def parallelExportFinished(self, jobQueue):
+		summary = jobQueue.getSummary()
+		failed = [j for j in jobQueue.finishedJobs if not j["success"]]
+		for line in summary: mnsLog.log(line, svr = 1)
+
+		#job directory cleanup- only failed exports keep their job files (intermediate scene, job files and worker logs)
+		jobDir = self.exportJobDir
+		if jobDir and os.path.isdir(jobDir):
+			if failed:
+				summary.append("Job files kept for inspection: " + jobDir)
+				mnsLog.log("Parallel export failed- job files kept for inspection: " + jobDir, svr = 2)
+			else:
+				shutil.rmtree(jobDir, ignore_errors = True)
+		self.exportJobDir = None
+
+		msg = QtWidgets.QMessageBox()
+		msg.setIcon(QtWidgets.QMessageBox.Warning if failed else QtWidgets.QMessageBox.Information)
+		msg.setText(("Parallel Export Partially Failed" if failed else "Parallel Export Successfully Completed") + (" " * 250))
+		msg.setWindowTitle("Warning" if failed else "Sucess!")
+		msg.setInformativeText("\n".join(summary))
+		msg.exec_()
+		self.process_pb.setValue(0)
+
+	def getUnionBakeSpan(self, animRanges):
+		"""Compute the baking span for the given animation ranges.
+		The ranges are merged to their union, and baked once as a single span covering the union.
+		Returns the span (min, max), the number of frames the span bakes, and the number of frames baking every range separately would take.
+		A None span is returned in case the span exceeds the separate ranges frame count (sparse ranges), as a single bake isn't beneficial.
+		"""
+
+		if not animRanges: return None, 0, 0
+
+		legacyFrames = sum([r["max"] - r["min"] + 1 for r in animRanges])
+		spanMin = min([r["min"] for r in animRanges])
+		spanMax = max([r["max"] for r in animRanges])
+		spanFrames = spanMax - spanMin + 1
+
+		if spanFrames > legacyFrames: return None, spanFrames, legacyFrames
+		return (spanMin, spanMax), spanFrames, legacyFrames
+
 	def export(self):
 		self.process_pb.setValue(4)
 
@@ -864,6 +1102,19 @@ class MnsAnimationExporter(form_class, base_class):
 		statusArray = []
 		status = 0
 		userStartTime = pm.currentTime()
+		exportStartTime = time.time()
+		legacyTimeEstimate = 0.0
+
+		#parallel export setup
+		parallelJobs, jobDir = None, None
+		if self.parallelExport_cbx.isChecked():
+			if self.exportJobQueue and self.exportJobQueue.isRunning():
+				messageLog.append("A parallel export is already running. Exporting in-session.")
+			elif not getMayapyPath():
+				messageLog.append("Couldn't find mayapy. Exporting in-session.")
+			else:
+				parallelJobs = []
+				jobDir = tempfile.mkdtemp(prefix = "mnsFBXExport_")
 
 		exportData = self.gatherData()
 		self.writeDefaultData(exportData)
@@ -925,112 +1176,62 @@ class MnsAnimationExporter(form_class, base_class):
 								self.resetRootJnt(extractedRootJnt)
 
 							#Handle Blend-Shapes
-							if meshTwins:
-								for origMesh in twinDict.keys():
-									newBS = mnsMeshUtils.duplicateBlendShapeNodes(origMesh, twinDict[origMesh], connect = True)	
-									if newBS:
-										newBS.rename(newBS.nodeName().split(":")[-1])
-										bspsNodes.append(newBS)
-
-							pm.select(newSelection)
-							try:
-								pm.mel.FBXExport(f=r["path"], s = True)
-								messageLog.append("      " + r["path"] + ": Sucess")
-							except:
-								messageLog.append("      " + r["path"] + ": Failure")
+							if meshTwins: bspsNodes += self.duplicateTwinsBlendShapes(twinDict)
 
+							self.exportSelection(newSelection, r["path"], messageLog)
 							self.process_pb.setValue(self.process_pb.value() + additiveProgValue)
 					
 					#################################
 					############# ANIM ##############
 					#################################
 
-					#for each range
-					for r in exportRanges:
-						if not r["isAsset"]:
-							# if the structure changed due to Assets/previous runs, recreate
+					animRanges = [r for r in exportRanges if not r["isAsset"]]
+					bakeSpan, spanFrames, legacyFrames = self.getUnionBakeSpan(animRanges)
+
+					if bakeSpan:
+						#union bake- bake the union span once, then slice each range out of the cached bake
+						# if the structure changed due to Assets, recreate
+						if restructured:
+							if meshTwins: pm.delete(meshTwins)
+							pm.delete(extractedRootJnt.node)
+							extractedRootJnt, origRootJnt, meshTwins, skinnedMeshes, skinData, unusedInfluences, twinDict, messageLog = self.extractSkeletonFromRigTop(rigTop, 
+																																				self.skeletonExtractMode_cb.currentIndex(),
+																																				self.rotToJO_cbx.isChecked(),
+																																				includeMeshes,
+																																				messageLog
+																																				)
+
+						allJoints, cnsToDel = self.connectJointsToDrivers(extractedRootJnt, origRootJnt)
+						for r in animRanges: self.bakeExtraAttributes(r, extractedRootJnt.node)
+						if meshTwins and not bspsNodes: bspsNodes += self.duplicateTwinsBlendShapes(twinDict)
+
+						#bake
+						bakeStartTime = time.time()
+						pm.bakeResults(allJoints + bspsNodes, t= bakeSpan, sb = 1, simulation = True)
+						self.disconnectJointsFromDrivers(allJoints, cnsToDel)
+
+						jntsToKey = allJoints
+						if restructureRequired:
+							animWSData = self.saveWSAnimData(allJoints, bakeSpan[0], bakeSpan[1])
+							pm.cutKey(allJoints, s=True)
+							restructured = self.restructureJointHeirarchy(extractedRootJnt.node, unusedInfluences)
 							if restructured:
-								if meshTwins: pm.delete(meshTwins)
-								pm.delete(extractedRootJnt.node)
-								extractedRootJnt, origRootJnt, meshTwins, skinnedMeshes, skinData, unusedInfluences, twinDict, messageLog = self.extractSkeletonFromRigTop(rigTop, 
-																																					self.skeletonExtractMode_cb.currentIndex(),
-																																					self.rotToJO_cbx.isChecked(),
-																																					includeMeshes,
-																																					messageLog
-																																					)
+								jntsToKey = [extractedRootJnt.node] + extractedRootJnt.node.listRelatives(ad = True, type = "joint")
+							self.loadWSAnimData(animWSData)
 
+						animCache = mnsAnimUtils.cacheAnimCurves(jntsToKey + bspsNodes)
+						bakeTime = time.time() - bakeStartTime
+						estimatedLegacyBakeTime = bakeTime / spanFrames * legacyFrames
+						legacyTimeEstimate += estimatedLegacyBakeTime - bakeTime
+						messageLog.append("      Baked " + str(len(animRanges)) + " ranges as a single " + str(spanFrames) + " frames span in " + str(round(bakeTime, 2)) + "s (per-range baking: " + str(legacyFrames) + " frames, est. " + str(round(estimatedLegacyBakeTime, 2)) + "s)")
 
-							
-							#connect joints to drivers
-							allJoints = [extractedRootJnt.node] + extractedRootJnt.node.listRelatives(ad = True, type = "joint")
-							allOrigJointsDict = {}
-							for j in [origRootJnt] + origRootJnt.listRelatives(ad = True, type = "joint"):
-								allOrigJointsDict.update({j.nodeName().split(":")[-1]: j})
-								
-							cnsToDel = []
-							for j in allJoints:
-								mnsUtils.lockAndHideAllTransforms(j, lock = False, keyable = True, cb = True)
-								pureName = j.nodeName().split(":")[-1]
-								if pureName in allOrigJointsDict.keys():
-									mnsUtils.lockAndHideAllTransforms(allOrigJointsDict[pureName], lock = False, keyable = True, cb = True)
-
-									if self.bakeConMethod_cb.currentIndex() == 0: #constraints
-										cnsToDel.append(pm.parentConstraint(allOrigJointsDict[pureName], j, mo = True))
-										cnsToDel.append(pm.scaleConstraint(allOrigJointsDict[pureName], j, mo = True))
-										j.jointOrient.set(allOrigJointsDict[pureName].jointOrient.get())
-									else: #direct
-										for chan in ["t", "r", "s", "jointOrient"]:
-											allOrigJointsDict[pureName].attr(chan) >> j.attr(chan)
-							
-							#extra attributes
-							self.bakeExtraAttributes(r, extractedRootJnt.node)
+						if parallelJobs is not None:
+							parallelJobs += self.createParallelExportJobs(jobDir, rigTopName, extractedRootJnt, meshTwins, jntsToKey + bspsNodes, animRanges)
+							messageLog.append("      " + str(len(animRanges)) + " ranges queued for parallel export.")
 
-							if meshTwins and not bspsNodes:
-								for origMesh in twinDict.keys():
-									newBS = mnsMeshUtils.duplicateBlendShapeNodes(origMesh, twinDict[origMesh], connect = True)	
-									if newBS:
-										newBS.rename(newBS.nodeName().split(":")[-1])
-										bspsNodes.append(newBS)
-
-							#bake
-							pm.bakeResults(allJoints + bspsNodes, t= (r["min"], r["max"]), sb = 1, simulation = True)
-
-							#disconnect joints
-							if cnsToDel: pm.delete(cnsToDel)
-							for j in allJoints:
-								for chan in ["t", "r", "s", "jointOrient"]:
-									j.attr(chan).disconnect()
-
-							jntsToKey = allJoints
-							if restructureRequired:
-								#save Animation Data (WS)
-								animWSData = self.saveWSAnimData(allJoints, r["min"], r["max"])
-								
-								#delete keys
-								pm.cutKey(allJoints, s=True)
+						for r in (animRanges if parallelJobs is None else []):
+							mnsAnimUtils.applyAnimCacheSlice(animCache, r["min"], r["max"], timeOffset = self.getNormalizeTimeOffset(r))
 
-								#restructureJoints
-								restructured = self.restructureJointHeirarchy(extractedRootJnt.node, unusedInfluences)
-								if restructured:
-									jntsToKey = [extractedRootJnt.node] + extractedRootJnt.node.listRelatives(ad = True, type = "joint")
-								
-								#load anim data (WS)
-								self.loadWSAnimData(animWSData)
-
-							#move keys to start
-							if self.normRanges_cbx.isChecked():
-								if r["min"] != 0:
-									tc = r["min"]
-									if r["min"] > 0: tc = r["min"] * -1
-									pm.keyframe(jntsToKey + bspsNodes, 
-												e = True, 
-												iub = False, 
-												an = "objects", 
-												t = str(r["min"] - 1) + ".9999:" + str(r["max"]) + ".9999", 
-												r = True, 
-												o = "over", 
-												tc = tc)
-									
 							#export
 							newSelection = [extractedRootJnt.node]
 							if meshTwins and self.includeMeshes_cbx.isChecked(): newSelection += meshTwins
@@ -1039,17 +1240,81 @@ class MnsAnimationExporter(form_class, base_class):
 							if self.resetRootJnt_cbx.isChecked() and extractedRootJnt:
 								self.resetRootJnt(extractedRootJnt)
 
-							pm.select(newSelection)
-							try:
-								pm.mel.FBXExport(f=r["path"], s = True)
-								messageLog.append("      " + r["path"] + ": Sucess")
-							except:
-								messageLog.append("      " + r["path"] + ": Failure")
+							self.exportSelection(newSelection, r["path"], messageLog)
+							self.process_pb.setValue(self.process_pb.value() + additiveProgValue)
 
-							#delete all keys
-							pm.cutKey(jntsToKey, s=True)
+						#delete all keys
+						pm.cutKey(jntsToKey, s=True)
+					
+					#for each range (sparse ranges)
+					for r in (animRanges if not bakeSpan else []):
+						# if the structure changed due to Assets/previous runs, recreate
+						if restructured:
+							if meshTwins: pm.delete(meshTwins)
+							pm.delete(extractedRootJnt.node)
+							extractedRootJnt, origRootJnt, meshTwins, skinnedMeshes, skinData, unusedInfluences, twinDict, messageLog = self.extractSkeletonFromRigTop(rigTop, 
+																																				self.skeletonExtractMode_cb.currentIndex(),
+																																				self.rotToJO_cbx.isChecked(),
+																																				includeMeshes,
+																																				messageLog
+																																				)
+
+						#connect joints to drivers
+						allJoints, cnsToDel = self.connectJointsToDrivers(extractedRootJnt, origRootJnt)
+						
+						#extra attributes
+						self.bakeExtraAttributes(r, extractedRootJnt.node)
+
+						if meshTwins and not bspsNodes: bspsNodes += self.duplicateTwinsBlendShapes(twinDict)
+
+						#bake
+						pm.bakeResults(allJoints + bspsNodes, t= (r["min"], r["max"]), sb = 1, simulation = True)
+
+						#disconnect joints
+						self.disconnectJointsFromDrivers(allJoints, cnsToDel)
+
+						jntsToKey = allJoints
+						if restructureRequired:
+							#save Animation Data (WS)
+							animWSData = self.saveWSAnimData(allJoints, r["min"], r["max"])
 							
-							self.process_pb.setValue(self.process_pb.value() + additiveProgValue)
+							#delete keys
+							pm.cutKey(allJoints, s=True)
+
+							#restructureJoints
+							restructured = self.restructureJointHeirarchy(extractedRootJnt.node, unusedInfluences)
+							if restructured:
+								jntsToKey = [extractedRootJnt.node] + extractedRootJnt.node.listRelatives(ad = True, type = "joint")
+							
+							#load anim data (WS)
+							self.loadWSAnimData(animWSData)
+
+						#move keys to start
+						tc = self.getNormalizeTimeOffset(r)
+						if tc:
+							pm.keyframe(jntsToKey + bspsNodes, 
+										e = True, 
+										iub = False, 
+										an = "objects", 
+										t = str(r["min"] - 1) + ".9999:" + str(r["max"]) + ".9999", 
+										r = True, 
+										o = "over", 
+										tc = tc)
+								
+						#export
+						newSelection = [extractedRootJnt.node]
+						if meshTwins and self.includeMeshes_cbx.isChecked(): newSelection += meshTwins
+						
+						#reset root joint
+						if self.resetRootJnt_cbx.isChecked() and extractedRootJnt:
+							self.resetRootJnt(extractedRootJnt)
+
+						self.exportSelection(newSelection, r["path"], messageLog)
+
+						#delete all keys
+						pm.cutKey(jntsToKey, s=True)
+						
+						self.process_pb.setValue(self.process_pb.value() + additiveProgValue)
 					
 					#delete everything
 					if meshTwins: pm.delete(meshTwins)
@@ -1063,6 +1328,13 @@ class MnsAnimationExporter(form_class, base_class):
 					messageLog.append("      Couldn't find Rig-Top.")
 		else:
 			messageLog.append("Couldn't find valid ranges and paths to export.")
+
+		if parallelJobs:
+			messageLog.append(str(len(parallelJobs)) + " ranges are being exported in the background (" + jobDir + "). A summary will be shown once done.")
+
+		totalTime = time.time() - exportStartTime
+		messageLog.append("Total time: " + str(round(totalTime, 2)) + "s (est. with per-range baking: " + str(round(totalTime + legacyTimeEstimate, 2)) + "s)")
+		mnsLog.log("Animation export finished in " + str(round(totalTime, 2)) + "s (est. with per-range baking: " + str(round(totalTime + legacyTimeEstimate, 2)) + "s)", svr = 1)
 		
 		if statusArray:
 			if all(v is True for v in statusArray):
@@ -1096,6 +1368,9 @@ class MnsAnimationExporter(form_class, base_class):
 		msg.exec_()
 		self.process_pb.setValue(0)
 
+		if parallelJobs: self.startParallelExport(parallelJobs, jobDir)
+		elif jobDir and os.path.isdir(jobDir): shutil.rmtree(jobDir, ignore_errors = True)
+
 	##################	
 	###### LOAD ######
 	##################
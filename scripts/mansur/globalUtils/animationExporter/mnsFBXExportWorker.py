@@ -0,0 +1,83 @@
+"""=== Author: Assaf Ben Zur ===
+Headless FBX clip export worker for the animation exporter.
+This script is executed by mayapy (out of process), one process per job:
+	mayapy mnsFBXExportWorker.py <jobFile.json>
+
+A job opens a baked intermediate scene, slices the requested range out of the baked keys, optionally normalizes and resets the root joint,
+and exports the requested nodes as FBX.
+This script is standalone, and doesn't depend on the mansur package, as it runs outside of a Maya session.
+"""
+
+#global dependencies
+import sys, os, json, time
+
+cmds = None
+mel = None
+
+def log(message):
+	sys.stdout.write("[mnsFBXExportWorker] " + message + "\n")
+	sys.stdout.flush()
+
+def sliceAnimation(nodes = [], rangeMin = 0, rangeMax = 0, timeOffset = 0):
+	"""Remove all keys outside of the given range (inclusive) from all anim curves driving the given nodes, and offset the remaining keys.
+	"""
+
+	curves = list(set(cmds.listConnections(nodes, s = True, d = False, type = "animCurve") or []))
+	for curve in curves:
+		times = cmds.keyframe(curve, q = True, tc = True) or []
+		if not times: continue
+
+		if times[0] < rangeMin: cmds.cutKey(curve, time = (times[0], rangeMin - 0.001), clear = True)
+		if times[-1] > rangeMax: cmds.cutKey(curve, time = (rangeMax + 0.001, times[-1]), clear = True)
+		if timeOffset: cmds.keyframe(curve, e = True, r = True, tc = timeOffset, iub = False)
+
+	return len(curves)
+
+def resetRootJnt(rootJnt = ""):
+	"""Disconnect and reset the given root joint's transforms.
+	"""
+
+	for chan in ["translate", "rotate", "scale"]:
+		for plug in [rootJnt + "." + chan] + [rootJnt + "." + chan + axis for axis in "XYZ"]:
+			cmds.setAttr(plug, lock = False)
+			for source in cmds.listConnections(plug, s = True, d = False, p = True) or []:
+				cmds.disconnectAttr(source, plug)
+		for axis in "XYZ":
+			cmds.setAttr(rootJnt + "." + chan + axis, 1.0 if chan == "scale" else 0.0)
+
+def runJob(job = {}):
+	cmds.file(job["scene"], open = True, force = True, prompt = False)
+	log("Opened " + job["scene"])
+
+	if not cmds.pluginInfo("fbxmaya", q = True, loaded = True): cmds.loadPlugin("fbxmaya", quiet = True)
+	if job.get("fbxPreset") and os.path.isfile(job["fbxPreset"]):
+		mel.eval("FBXLoadExportPresetFile -f \"" + job["fbxPreset"].replace("\\", "/") + "\"")
+		log("Loaded FBX preset " + job["fbxPreset"])
+
+	curveCount = sliceAnimation([n for n in job["curveNodes"] if cmds.objExists(n)], job["min"], job["max"], job.get("timeOffset", 0))
+	log("Sliced " + str(curveCount) + " curves to range " + str(job["min"]) + "-" + str(job["max"]))
+
+	if job.get("resetRootJnt"): resetRootJnt(job["resetRootJnt"])
+
+	cmds.select([n for n in job["nodes"] if cmds.objExists(n)], r = True)
+	mel.eval("FBXExport -f \"" + job["path"].replace("\\", "/") + "\" -s")
+	log("Exported " + job["path"])
+
+if __name__ == "__main__":
+	startTime = time.time()
+	with open(sys.argv[1], "r") as f: job = json.load(f)
+
+	import maya.standalone
+	maya.standalone.initialize(name = "python")
+	from maya import cmds, mel
+
+	exitCode = 0
+	try: runJob(job)
+	except Exception as e:
+		log("Job failed: " + str(e))
+		exitCode = 1
+
+	log("Finished in " + str(round(time.time() - startTime, 2)) + "s")
+	try: maya.standalone.uninitialize()
+	except: pass
+	os._exit(exitCode)
@@ -0,0 +1,188 @@
+"""=== Author: Assaf Ben Zur ===
+Static function index for the defSearch UI.
+Python files are parsed (not imported) using ast, collecting every module level function's name, module, signature and docstring's first line.
+The index is cached on disk (json), and invalidated per file by its modification time, so only new or edited files are re-parsed.
+Searches are done over the index using a trigram/fuzzy matcher. Modules are only imported once a function is actually executed.
+This module doesn't depend on Maya.
+"""
+
+#global dependencies
+import os, ast, json, importlib
+
+DEF_INDEX_VERSION = 1
+
+def getArgName(arg):
+	#python 2 ast holds Name nodes, python 3 holds arg nodes
+	#return; string
+	return getattr(arg, "arg", None) or getattr(arg, "id", "")
+
+def getNodeSource(node):
+	if hasattr(ast, "unparse"): return ast.unparse(node)
+	try: return repr(ast.literal_eval(node))
+	except: return "..."
+
+def getFunctionSignature(functionNode):
+	"""Reconstruct the given function node's signature string.
+	"""
+
+	args = functionNode.args
+	positional = list(getattr(args, "posonlyargs", [])) + list(args.args)
+	defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+
+	tokens = []
+	for k, arg in enumerate(positional):
+		tokens.append(getArgName(arg) + ((" = " + getNodeSource(defaults[k])) if defaults[k] is not None else ""))
+	if args.vararg: tokens.append("*" + getArgName(args.vararg) if not isinstance(args.vararg, str) else "*" + args.vararg)
+	for k, arg in enumerate(getattr(args, "kwonlyargs", [])):
+		kwDefault = args.kw_defaults[k]
+		tokens.append(getArgName(arg) + ((" = " + getNodeSource(kwDefault)) if kwDefault is not None else ""))
+	if args.kwarg: tokens.append("**" + getArgName(args.kwarg) if not isinstance(args.kwarg, str) else "**" + args.kwarg)
+
+	#return; string (signature)
+	return "(" + ", ".join(tokens) + ")"
+
+def getModuleNameForFile(filePath, packageDir, packageName):
+	relPath = os.path.relpath(os.path.splitext(filePath)[0], packageDir).replace("\\", "/")
+	tokens = [t for t in relPath.split("/") if t]
+	if tokens and tokens[-1] == "__init__": tokens = tokens[:-1]
+
+	#return; string (module name)
+	return ".".join([packageName] + tokens)
+
+def indexFile(filePath, moduleName):
+	"""Parse the given python file, and return an index entry for every module level function.
+	"""
+
+	entries = []
+	try:
+		with open(filePath, "r") as f: tree = ast.parse(f.read(), filePath)
+	except Exception:
+		return entries
+
+	for node in tree.body:
+		if isinstance(node, ast.FunctionDef):
+			doc = (ast.get_docstring(node) or "").strip()
+			entries.append({"name": node.name, "module": moduleName, "signature": getFunctionSignature(node), "doc": doc.splitlines()[0] if doc else "", "line": node.lineno})
+
+	#return; list (index entries)
+	return entries
+
+def loadIndexCache(cachePath = ""):
+	if cachePath and os.path.isfile(cachePath):
+		try:
+			with open(cachePath, "r") as f: cache = json.load(f)
+			if cache.get("version", 0) == DEF_INDEX_VERSION: return cache
+		except Exception:
+			pass
+
+	#return; dict (index cache)
+	return {"version": DEF_INDEX_VERSION, "files": {}}
+
+def saveIndexCache(cachePath = "", cache = {}):
+	if cachePath:
+		try:
+			with open(cachePath, "w") as f: json.dump(cache, f)
+		except Exception:
+			pass
+
+def updateIndex(packages = [], cachePath = ""):
+	"""Update the on-disk index for the given packages- a list of (package directory, package name) tuples.
+	Only files that were added or modified since the last update are parsed. Removed files are dropped.
+	Returns the index entries for all files, along with the number of files parsed.
+	"""
+
+	cache = loadIndexCache(cachePath)
+	files = {}
+	parsedCount = 0
+
+	for packageDir, packageName in packages:
+		for root, dirs, fileNames in os.walk(packageDir):
+			dirs[:] = [d for d in dirs if not d.startswith(".") and d != "__pycache__"]
+			for fileName in fileNames:
+				if not fileName.endswith(".py"): continue
+
+				filePath = os.path.join(root, fileName).replace("\\", "/")
+				mtime = os.path.getmtime(filePath)
+				cached = cache["files"].get(filePath, None)
+				if cached and cached["mtime"] == mtime:
+					files[filePath] = cached
+				else:
+					moduleName = getModuleNameForFile(filePath, packageDir, packageName)
+					files[filePath] = {"mtime": mtime, "module": moduleName, "entries": indexFile(filePath, moduleName)}
+					parsedCount += 1
+
+	if parsedCount or len(files) != len(cache["files"]):
+		cache["files"] = files
+		saveIndexCache(cachePath, cache)
+
+	entries = []
+	for filePath in sorted(files.keys()): entries += files[filePath]["entries"]
+
+	#return; list (index entries), int (parsed files count)
+	return entries, parsedCount
+
+def getTrigrams(text = ""):
+	text = "  " + text + " "
+
+	#return; set (trigrams)
+	return set(text[k:k + 3] for k in range(len(text) - 2))
+
+def isSubsequence(query = "", text = ""):
+	textIter = iter(text)
+
+	#return; bool
+	return all(c in textIter for c in query)
+
+def getMatchScore(query = "", text = "", queryTrigrams = None):
+	"""Score a text against a query. 0.0 means no match.
+	Exact and prefix matches rank first, then substring matches, then subsequence and trigram (typo tolerant) matches.
+	"""
+
+	if not query: return 1.0
+	if query == text: return 4.0
+	if text.startswith(query): return 3.0 + float(len(query)) / len(text)
+	if query in text: return 2.0 + float(len(query)) / len(text)
+
+	queryTrigrams = queryTrigrams or getTrigrams(query)
+	textTrigrams = getTrigrams(text)
+	similarity = float(len(queryTrigrams & textTrigrams)) / len(queryTrigrams | textTrigrams)
+	if isSubsequence(query, text): return 1.0 + similarity
+	if similarity >= 0.25: return similarity
+
+	#return; float (score)
+	return 0.0
+
+def searchIndex(names = [], query = "", **kwargs):
+	"""Search the given names with a trigram/fuzzy matcher, returning matching names sorted by score.
+	"""
+
+	caseSensitive = kwargs.get("caseSensitive", False) #arg; comment = case-sensitive substring matching only
+	limit = kwargs.get("limit", None) #arg; comment = max number of results
+
+	if not query: return sorted(names)
+	if caseSensitive: return sorted([n for n in names if query in n])
+
+	query = query.lower()
+	queryTrigrams = getTrigrams(query)
+	scored = []
+	for name in names:
+		score = getMatchScore(query, name.lower(), queryTrigrams)
+		if score > 0.0: scored.append((-score, name))
+	results = [name for score, name in sorted(scored)]
+
+	#return; list (names)
+	return results[:limit] if limit else results
+
+def resolveEntry(entry = {}, reloadModule = False):
+	"""Import the entry's module and return its function object, or None if it can't be resolved.
+	"""
+
+	try:
+		module = importlib.import_module(entry["module"])
+		if reloadModule:
+			try: from importlib import reload
+			except ImportError: pass
+			module = reload(module)
+		return getattr(module, entry["name"], None)
+	except Exception:
+		return None
@@ -7,7 +7,9 @@ IMPORTANT: Any given custom library needs to follow the mns code structure conve
 The main process of this UI class is:
 	- Load the UI
 	- procedurally look through the given libraries and add any found python defenition into the UI list.
+	  Libraries are indexed statically (see defIndex), without importing them. The index is cached within the prefs directory, and re-parsed per changed file only.
 	- Uppon a 'UI creation' call (via the button or souble-click):
+		- Import (reload) the defenition's module
 		- Deconstruct the selected defenition into mandatory arguments and keyword arguments
 		- Build a new UI based on the parameters got.
 	- Uppon a 'Run' call:
@@ -40,12 +42,11 @@ Features:
 from maya import cmds
 import pymel.core as pm
 
-import importlib, pkgutil, sys, os, json, glob, imp, shutil, time, zipfile
+import sys, os, json, glob, imp, shutil, time, zipfile
 import inspect as ins
 from os import listdir
 from os.path import isfile, join, dirname, abspath
 from collections import OrderedDict
-from inspect import getmembers, isfunction
 
 #mns dependencies
 from ...core.globals import *
@@ -54,6 +55,8 @@ import mansur as mns
 from ...core import log as mnsLog
 from .. import dynUI as mnsDynUI
 reload(mnsDynUI)
+from . import defIndex as mnsDefIndex
+reload(mnsDefIndex)
 from ...core import UIUtils as mnsUIUtils
 from ...core import utility as mnsUtils
 from ...gui import gui as mnsGui
@@ -83,12 +86,14 @@ class MnsDefSearch(form_class, base_class):
 
 		mnsLog.log("initializing MnsDefSearch", svr = 0)
 		self.pinnedFilePath = None
+		self.indexFilePath = mnsUtils.locatePreferencesDirectory() + "/defSearchIndex.json"
 		self.initializePinnedDir()
 	
 		self.loadedWindows = {}
 		self.packages = [mns]
 		self.rawLib = []
 		self.library = []
+		self.entriesByName = {}
 		self.funList = []
 		self.pinnedFunList = []
 		self.pinnedFunDict = OrderedDict()
@@ -129,11 +134,16 @@ class MnsDefSearch(form_class, base_class):
 		"""
 
 		if self.lstvResults.currentItem() is not None:
-			index = self.library.index(self.lstvResults.currentItem().text())
-			module = sys.modules[self.rawLib[index][1].__module__]
-			reload (module)
+			entry = self.entriesByName[self.lstvResults.currentItem().text()]
+			if "function" in entry:
+				funcObj = getattr(reload(sys.modules[entry["function"].__module__]), entry["name"], entry["function"])
+			else:
+				funcObj = mnsDefIndex.resolveEntry(entry, reloadModule = True)
+			if funcObj is None:
+				mnsLog.log("Could not import " + entry["module"] + "." + entry["name"] + ".", svr = 2)
+				return
 
-			winName = self.rawLib[index][1].__name__
+			winName = funcObj.__name__
 			if self.devModeCbx.isChecked():
 				if pm.window(winName, exists = True): 
 					try:
@@ -141,14 +151,14 @@ class MnsDefSearch(form_class, base_class):
 					except:
 						pass
 				if winName in self.loadedWindows: del self.loadedWindows[winName]
-				win = mnsDynUI.MnsDynamicDefUI(self.rawLib[index][1])
+				win = mnsDynUI.MnsDynamicDefUI(funcObj)
 				win.loadUI()
 				self.loadedWindows.update({winName: win})
 			else:
 				if winName in self.loadedWindows:
 					self.loadedWindows[winName].loadUI()
 				else:
-					win = mnsDynUI.MnsDynamicDefUI(self.rawLib[index][1])
+					win = mnsDynUI.MnsDynamicDefUI(funcObj)
 					win.loadUI()
 					self.loadedWindows.update({winName: win})	
 
@@ -211,17 +221,15 @@ class MnsDefSearch(form_class, base_class):
 
 		#filter and add
 		if not pinnedOnly:
-			newItemList = []
-			for item in self.funList:
-				if self.cbxCase.isChecked():
-					if filterTxt in item:
-						if item not in pinnedFunList:
-							newItemList.append(item) 
-				else:
-					if(filterTxt.lower() in item.lower()):
-						if item not in pinnedFunList:
-							newItemList.append(item) 
+			newItemList = [item for item in mnsDefIndex.searchIndex(self.funList, filterTxt, caseSensitive = self.cbxCase.isChecked()) if item not in pinnedFunList]
 			self.lstvResults.addItems(newItemList)
+
+		#tooltips
+		for i in range(0,self.lstvResults.count()):
+			item = self.lstvResults.item(i)
+			if item.text() in self.entriesByName:
+				entry = self.entriesByName[item.text()]
+				item.setToolTip(entry["module"] + "." + entry["name"] + entry.get("signature", "") + ("\n" + entry["doc"] if entry.get("doc", "") else ""))
 		
 	def clearResults(self):
 		"""Clear Serach method trigger.
@@ -235,56 +243,25 @@ class MnsDefSearch(form_class, base_class):
 		"""
 		self.show()
 		
-	def import_submodules(self, package, recursive=True):
-		"""Recursive method to walk thorugh a given package and sub-packages to store all sub-directories within.
-		"""
-
-		if isinstance(package, str):
-			try:
-				package = importlib.import_module(package)
-			except:
-				pass
-
-		results = {}
-		for loader, name, is_pkg in pkgutil.walk_packages(package.__path__):
-			skip = 0
-			full_name = package.__name__ + '.' + name
-			try:
-				results[full_name] = importlib.import_module(full_name)
-			except:
-				skip = 1
-				#error1 = str(sys.exc_info())
-				#mnsLog.log(("Trying to import module errored" + error1), svr = 0)
-				pass
-
-			if recursive and is_pkg:
-				if skip != 1:
-					results.update(self.import_submodules(full_name))
-
-		#return;dict
-		return results
-
 	def addPackageToResults(self, package):   
 		"""Package addition method trigger.
+		The package is indexed statically (no import), using the on-disk index cache.
 		"""
 
-		pkgMods = self.import_submodules(package.__name__)
-		for mod in pkgMods:
-			functions_list = [o for o in getmembers(pkgMods[mod]) if isfunction(o[1])]
-			for fun in functions_list:
-				self.library.append(fun[0])
-				fun = fun + (mod,)
-				self.rawLib.append(fun)
+		entries, parsedCount = mnsDefIndex.updateIndex([(packageDir, package.__name__) for packageDir in package.__path__], self.indexFilePath)
+		if parsedCount: mnsLog.log("Indexed " + str(parsedCount) + " changed files in " + package.__name__, svr = 0)
+		for entry in entries:
+			self.library.append(entry["name"])
+			self.rawLib.append(entry)
 
 	def addModuleToResults(self, module): 
 		"""Module add method trigger.
 		"""
 
-		functions_list = [o for o in getmembers(module) if isfunction(o[1])]
+		functions_list = [o for o in ins.getmembers(module) if ins.isfunction(o[1])]
 		for fun in functions_list:
 			self.library.append(fun[0])
-			fun = fun + (module,)
-			self.rawLib.append(fun)
+			self.rawLib.append({"name": fun[0], "module": fun[1].__module__, "function": fun[1]})
 
 	def loadList(self):
 		"""Main list load method.
@@ -298,6 +275,8 @@ class MnsDefSearch(form_class, base_class):
 				if r not in self.funList:
 					self.funList.append(r)
 		self.funList = sorted(self.funList)
+		self.entriesByName = {}
+		for entry in reversed(self.rawLib): self.entriesByName[entry["name"]] = entry
 		timeF = pm.timerX(st = listLoadTimer)
 		mnsLog.log(('Loaded search library in ' + timeF.__str__() + ' seconds.'), svr = 1)
 		self.updateResults()
@@ -310,6 +289,7 @@ class MnsDefSearch(form_class, base_class):
 		self.lstvResults.clear()
 		self.funList = []
 		self.library = []
+		self.rawLib = []
 		self.loadList()
 
 	def importModules(self):
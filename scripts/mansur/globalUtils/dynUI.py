@@ -3,7 +3,8 @@ Supporting module for the 'defSearch' UI Class.
 This module build the base UI for any function UI build called from the defSerach UI.
 The build is based on a .ui base file, constructing an empty UI that will accomedate the dynamic UI elemnts requested.
 This module also holds the RunCmd. The run command will filter and get any elemnt value based on it's type and recompile an argument string to pass into the function requested.
-A template icon is created as well as an empty 'title' item to be changed after creation base on the function name requested."""
+A template icon is created as well as an empty 'title' item to be changed after creation base on the function name requested.
+Collapsible sections and the secondary (split) tab are drawn lazily- their content is only drawn when first expanded or shown. Values of rows that weren't drawn are read directly from their arguments."""
 
 #global dependencies
 
@@ -69,7 +70,7 @@ class MnsDynamicDefUI(form_class, base_class):
 		self.defenition = None 
 		self.arguments = [] 
 		self.optArguments = [] 
-		self.txtFields = () 
+		self.txtFields = []
 		self.attrComponentPairing = {}
 		self.defenitionName = ""
 		self.title = ""
@@ -84,6 +85,12 @@ class MnsDynamicDefUI(form_class, base_class):
 		self.dividerLayout = None
 		self.allCollapsible = []
 		self.widgetRelationships = {}
+		self.boolExclusives = []
+		self.boolFeildsByName = {}
+		self.argValueOverrides = {}
+		self.lazySections = {}
+		self.lazyTabEntries = []
+		self.splitTabIndex = None
 		self.rootGuide = ""
 		self.modArgs = {}
 
@@ -150,6 +157,8 @@ class MnsDynamicDefUI(form_class, base_class):
 				if not self.multiTypeEdit:
 					self.splitLayout = mnsUIUtils.buildTabForModuleParentDir(secondTabTitle, 1, self.mainTabWidget, modSet = True)
 					self.splitLayout.setAlignment(QtCore.Qt.AlignTop)
+					self.splitTabIndex = 1
+					self.mainTabWidget.currentChanged.connect(self.tabChangedTrigger)
 
 
 		self.fullList = self.arguments + self.optArguments
@@ -226,9 +235,10 @@ class MnsDynamicDefUI(form_class, base_class):
 		font.setBold(True)
 		self.titleLbl.setFont(font)
 		
-	def setCollapsibleWidgetsBehaviour(self):
+	def setCollapsibleWidgetsBehaviour(self, collapsibleWidgets = None):
+		if collapsibleWidgets is None: collapsibleWidgets = self.allCollapsible
 		if not mnsUtils.getMansurPrefs()["Global"]["collapsibleWidgetBehavior"]:
-			for colWid in self.allCollapsible:
+			for colWid in collapsibleWidgets:
 				if colWid:
 					QtCore.QObject.connect(colWid._title_frame, QtCore.SIGNAL('clicked()'), partial(self.toggleAllCollapsed, colWid))
 		
@@ -294,142 +304,219 @@ class MnsDynamicDefUI(form_class, base_class):
 	def destroyUI(self):
 		mnsUIUtils.recDeleteAllLayoutItems(self.mainVLayout)
 		mnsUIUtils.recDeleteAllLayoutItems(self.splitLayout)
-		self.txtFields = ()
+		self.txtFields = []
+		self.allCollapsible = []
+		self.widgetRelationships = {}
 
 	def boolAutoExlusiveTrig(self, triggerOrigin, exclutionGroup, boolFeildsByName, state):
 		for groupMemberName in exclutionGroup:
-			cbxObj =  boolFeildsByName[groupMemberName]
-			if cbxObj is not triggerOrigin:
-				cbxObj.blockSignals(True)
-				cbxObj.setChecked(False)
-				cbxObj.blockSignals(False)
+			if groupMemberName in boolFeildsByName:
+				cbxObj =  boolFeildsByName[groupMemberName]
+				if cbxObj is not triggerOrigin:
+					cbxObj.blockSignals(True)
+					cbxObj.setChecked(False)
+					cbxObj.blockSignals(False)
+			else:
+				#member wasn't drawn yet
+				self.argValueOverrides[groupMemberName] = False
 
-	def drawUI(self):
-		"""Main UI draw method.
+	def collectBoolExclusives(self):
+		"""Collect all bool-exclusive groups from the arguments list.
+		For backwards compatibility- if more than a single member of a group is on by default, all members but the first are turned off.
 		"""
 
 		boolExclusives = []
-		boolFeildsByName = {}
 		attributeListByName = {}
 		for arg in self.fullList:
 			attributeListByName[arg.name] = arg
+
+		for arg in self.fullList:
+			if arg.type == bool and arg.boolExclusive:
+				validatedList = []
+				for boolPair in arg.boolExclusive:
+					if boolPair in attributeListByName and attributeListByName[boolPair].type == bool:
+						validatedList.append(boolPair)
+				
+				if validatedList:
+					groupToAdd = [arg.name] + validatedList
+					
+					#make sure not to add the same group multiple times
+					previosulyAdded = False
+					for previousGroup in boolExclusives:
+						inPreviousGroup = [x for x in groupToAdd if x in previousGroup]
+						if inPreviousGroup:
+							previosulyAdded = True
+							break
+					if not previosulyAdded:
+						boolExclusives.append(groupToAdd)
+
+		for exclutionGroup in boolExclusives:
+			foundOnAttr = False
+			for attrName in exclutionGroup:
+				if not foundOnAttr and attributeListByName[attrName].default:
+					foundOnAttr = True
+				elif foundOnAttr:
+					self.argValueOverrides[attrName] = False
+
+		#return; list (bool exclusive groups)
+		return boolExclusives
+
+	def getLayoutEntries(self):
+		"""Build the top level layout entries from the arguments list.
+		Each entry is a single row drawn into the main or split layout. Collapsible dividers hold the rows within them as children.
+		"""
+
+		entries = []
+		currentDivider = None
+		for i in range(0,len(self.fullList)):
+			layoutKey = "main"
+			if self.split and i >= self.split: layoutKey = "split"
+
+			if "divider" in self.fullList[i].name.lower():
+				currentDivider = None
+				entry = {"index": i, "layout": layoutKey, "children": None}
+				if not self.fullList[i].simpleDivider:
+					entry["children"] = []
+					currentDivider = entry
+				entries.append(entry)
+			elif currentDivider:
+				currentDivider["children"].append(i)
+			else:
+				entries.append({"index": i, "layout": layoutKey, "children": None})
+
+		#return; list (layout entries)
+		return entries
+
+	def isEagerArgument(self, argIndex):
+		#side, color-override and scheme-override rows depend on each other, hence are always drawn up-front
+		argName = self.fullList[argIndex].name.lower()
+
+		#return; bool
+		return "side" in argName or "coloverride" in argName or "schemeoverride" in argName
+
+	def drawUI(self):
+		"""Main UI draw method.
+		Rows within collapsible sections are drawn upon the section's first expand, and the split tab is drawn when it is first shown.
+		"""
+
+		self.txtFields = [None] * len(self.fullList)
+		self.boolFeildsByName = {}
+		self.argValueOverrides = {}
+		self.lazySections = {}
+		self.lazyTabEntries = []
+		self.boolExclusives = self.collectBoolExclusives()
 		
 		self.drawTitle()
 
-		for i in range(0,len(self.fullList)):
-			if "divider" in self.fullList[i].name.lower(): self.dividerLayout = None
+		entries = self.getLayoutEntries()
+		tabEntries = [e for e in entries if e["layout"] == "split"]
+		if tabEntries and self.splitLayout and self.mainTabWidget.currentIndex() != self.splitTabIndex:
+			if not [i for e in tabEntries for i in [e["index"]] + (e["children"] or []) if self.isEagerArgument(i)]:
+				self.lazyTabEntries = tabEntries
+				entries = [e for e in entries if e["layout"] != "split"]
 
+		self.drawEntries(entries)
+
+	def drawEntries(self, entries = []):
+		"""Draw the given layout entries, and return the collapsible widgets created.
+		"""
+
+		newWidgets = []
+		newCollapsible = []
+		for entry in entries:
 			contentLayout = self.mainVLayout
+			if entry["layout"] == "split": contentLayout = self.splitLayout
+
+			newWidgets += self.drawArgument(entry["index"], contentLayout)
+			if entry["children"] is not None and self.dividerLayout:
+				dividerWidget = self.allCollapsible[-1]
+				newCollapsible.append(dividerWidget)
+				if [i for i in entry["children"] if self.isEagerArgument(i)]:
+					for i in entry["children"]: newWidgets += self.drawArgument(i, self.dividerLayout)
+				elif entry["children"]:
+					self.lazySections[dividerWidget] = (entry["children"], self.dividerLayout)
+					QtCore.QObject.connect(dividerWidget._title_frame, QtCore.SIGNAL('clicked()'), partial(self.drawSection, dividerWidget))
+			self.dividerLayout = None
+
+		self.setReadOnlyState(newWidgets)
+
+		#return; list (collapsible widgets)
+		return newCollapsible
+
+	def drawArgument(self, i, contentLayout):
+		"""Draw a single argument row into the given layout, and return the widgets created.
+		"""
 
-			if self.split:
-				if i >= self.split: contentLayout = self.splitLayout
-			if self.dividerLayout: 
-				contentLayout = self.dividerLayout
-			if self.fullList[i].name.lower() == "extraChannels".lower():
-				extraChannelsBox = mnsUIUtils.drawExtraChannelsBox(self.fullList[i], contentLayout)
-				self.txtFields = self.txtFields + (extraChannelsBox,)
-			elif self.fullList[i].name.lower() == "spaces".lower():
-				spacesBox = mnsUIUtils.drawSpacesBox(self.fullList[i], contentLayout)
-				self.txtFields = self.txtFields + (spacesBox,)
-			elif "path".lower() in self.fullList[i].name.lower():
-				txtField = mnsUIUtils.drawPathField(self.fullList[i], contentLayout)
-				self.txtFields = self.txtFields + (txtField,)
-			elif "constructscripts".lower() in self.fullList[i].name.lower():
-				txtField = mnsUIUtils.drawCustomScriptsSlot(self.fullList[i], contentLayout)
-				self.txtFields = self.txtFields + (txtField,)
-			elif "divider" in self.fullList[i].name.lower():
-				txtField, self.dividerLayout, dividerWidget = mnsUIUtils.drawHorizontalDevider(self.fullList[i], contentLayout)
-				self.allCollapsible.append(dividerWidget)
-				self.txtFields = self.txtFields + (txtField,)
-			elif "channelControl".lower() in self.fullList[i].name.lower():
-				chennelControl = mnsUIUtils.drawChannelControl(self.fullList[i], contentLayout, rootGuide = self.rootGuide)
-				self.txtFields = self.txtFields + (chennelControl,)
-			elif "schemeOverride".lower() in self.fullList[i].name.lower() :
-				colorScheme = mnsUIUtils.drawColorSchemeOverride(self.fullList[i], contentLayout, sideCB = self.sideCB, colOverride = self.colOverride, rigTop = self.rigTop)
-				self.txtFields = self.txtFields + (colorScheme,)	
-			elif "colorScheme".lower() in self.fullList[i].name.lower() :
-				colorScheme = mnsUIUtils.drawColorScheme(self.fullList[i], contentLayout)
-				self.txtFields = self.txtFields + (colorScheme,)
-			elif "color" in self.fullList[i].name.lower() and self.fullList[i].type is tuple and len(self.fullList[i].default) == 3:
-				colorBox = mnsUIUtils.drawColorBox(self.fullList[i], contentLayout)
-				self.txtFields = self.txtFields + (colorBox,)
-			elif "alpha" == self.fullList[i].name:
-				txtField = mnsUIUtils.drawButtonAndField(self.fullList[i], contentLayout, True)
-				self.txtFields = self.txtFields + (txtField,)
-			elif self.fullList[i].ob != [] and type(self.fullList[i].ob) is list and len(self.fullList[i].ob) > 0:
-				optionBox, lineEdit = mnsUIUtils.drawOptionBox(self.fullList[i], contentLayout)
-				if lineEdit:
-					self.widgetRelationships.update({optionBox: lineEdit})
-				self.txtFields = self.txtFields + (optionBox,)
-				if "side".lower() in self.fullList[i].name.lower():
-					self.sideCB = optionBox
-			elif self.fullList[i].type == str or self.fullList[i].type == list or self.fullList[i].type == tuple:
-				if self.fullList[i].type == list and self.fullList[i].multiRowList:
-					multiRowBox = mnsUIUtils.drawSpacesBox(self.fullList[i], contentLayout, genericList = True)
-					self.txtFields = self.txtFields + (multiRowBox,)
-				else:
-					txtField = mnsUIUtils.drawButtonAndField(self.fullList[i], contentLayout)
-					self.txtFields = self.txtFields + (txtField,)
-			elif self.fullList[i].type == int:
-				intSlider = mnsUIUtils.drawIntSpinner(self.fullList[i], contentLayout)
-				self.txtFields = self.txtFields + (intSlider,)
-			elif self.fullList[i].type == float:
-				floatSlider = mnsUIUtils.drawFloatScroll(self.fullList[i], contentLayout)
-				self.txtFields = self.txtFields + (floatSlider,)
-			elif self.fullList[i].type == bool:
-				if self.fullList[i].boolExclusive:
-					validatedList = []
-					for boolPair in self.fullList[i].boolExclusive:
-						if boolPair in attributeListByName and attributeListByName[boolPair].type == bool:
-							validatedList.append(boolPair)
-					
-					if validatedList:
-						groupToAdd = [self.fullList[i].name] + validatedList
-						
-						#make sure not to add the same group multiple times
-						previosulyAdded = False
-						for previousGroup in boolExclusives:
-							inPreviousGroup = [x for x in groupToAdd if x in previousGroup]
-							if inPreviousGroup:
-								previosulyAdded = True
-								break
-						if not previosulyAdded:
-							boolExclusives.append(groupToAdd)
-
-				bolChk = mnsUIUtils.drawBooleanChk(self.fullList[i], contentLayout)
-				self.txtFields = self.txtFields + (bolChk,)
-				boolFeildsByName[self.fullList[i].name] = bolChk
-				if "colOverride".lower() in self.fullList[i].name.lower():
-					self.colOverride = bolChk
+		newWidgets = []
+		if self.fullList[i].name.lower() == "extraChannels".lower():
+			self.txtFields[i] = mnsUIUtils.drawExtraChannelsBox(self.fullList[i], contentLayout)
+		elif self.fullList[i].name.lower() == "spaces".lower():
+			self.txtFields[i] = mnsUIUtils.drawSpacesBox(self.fullList[i], contentLayout)
+		elif "path".lower() in self.fullList[i].name.lower():
+			self.txtFields[i] = mnsUIUtils.drawPathField(self.fullList[i], contentLayout)
+		elif "constructscripts".lower() in self.fullList[i].name.lower():
+			self.txtFields[i] = mnsUIUtils.drawCustomScriptsSlot(self.fullList[i], contentLayout)
+		elif "divider" in self.fullList[i].name.lower():
+			txtField, self.dividerLayout, dividerWidget = mnsUIUtils.drawHorizontalDevider(self.fullList[i], contentLayout)
+			self.allCollapsible.append(dividerWidget)
+			self.txtFields[i] = txtField
+		elif "channelControl".lower() in self.fullList[i].name.lower():
+			self.txtFields[i] = mnsUIUtils.drawChannelControl(self.fullList[i], contentLayout, rootGuide = self.rootGuide)
+		elif "schemeOverride".lower() in self.fullList[i].name.lower() :
+			self.txtFields[i] = mnsUIUtils.drawColorSchemeOverride(self.fullList[i], contentLayout, sideCB = self.sideCB, colOverride = self.colOverride, rigTop = self.rigTop)
+		elif "colorScheme".lower() in self.fullList[i].name.lower() :
+			self.txtFields[i] = mnsUIUtils.drawColorScheme(self.fullList[i], contentLayout)
+		elif "color" in self.fullList[i].name.lower() and self.fullList[i].type is tuple and len(self.fullList[i].default) == 3:
+			self.txtFields[i] = mnsUIUtils.drawColorBox(self.fullList[i], contentLayout)
+		elif "alpha" == self.fullList[i].name:
+			self.txtFields[i] = mnsUIUtils.drawButtonAndField(self.fullList[i], contentLayout, True)
+		elif self.fullList[i].ob != [] and type(self.fullList[i].ob) is list and len(self.fullList[i].ob) > 0:
+			optionBox, lineEdit = mnsUIUtils.drawOptionBox(self.fullList[i], contentLayout)
+			if lineEdit:
+				self.widgetRelationships.update({optionBox: lineEdit})
+				newWidgets.append(lineEdit)
+			self.txtFields[i] = optionBox
+			if "side".lower() in self.fullList[i].name.lower():
+				self.sideCB = optionBox
+		elif self.fullList[i].type == str or self.fullList[i].type == list or self.fullList[i].type == tuple:
+			if self.fullList[i].type == list and self.fullList[i].multiRowList:
+				self.txtFields[i] = mnsUIUtils.drawSpacesBox(self.fullList[i], contentLayout, genericList = True)
 			else:
-				txtField = mnsUIUtils.drawButtonAndFieldUnknown(self.fullList[i], contentLayout)
-				self.txtFields = self.txtFields + (txtField,)
-
-			self.attrComponentPairing.update({self.fullList[i].name: self.txtFields[-1]})
-
-		if boolExclusives:
-			for exclutionGroup in boolExclusives:
-				if set(exclutionGroup).issubset(boolFeildsByName.keys()):
-					#group fully validated, execture boolExlusive behaviour
-					#backwards compatibility- first, if any are on, make sure the others are off
-					foundOnAttr = False
-					for attrName in exclutionGroup:
-						if not foundOnAttr and boolFeildsByName[attrName].isChecked():
-							foundOnAttr = True
-						elif foundOnAttr:
-							boolFeildsByName[attrName].setChecked(False)
-
-					#now set the trigger
-					for attrName in exclutionGroup:
-						boolFeildsByName[attrName].toggled.connect(partial(self.boolAutoExlusiveTrig, boolFeildsByName[attrName], exclutionGroup, boolFeildsByName))
-
-		#read only mode
-		if self.readOnly:
-			roWidgets = self.txtFields
-			for k in self.widgetRelationships.keys():
-				roWidgets += (self.widgetRelationships[k],)
+				self.txtFields[i] = mnsUIUtils.drawButtonAndField(self.fullList[i], contentLayout)
+		elif self.fullList[i].type == int:
+			self.txtFields[i] = mnsUIUtils.drawIntSpinner(self.fullList[i], contentLayout)
+		elif self.fullList[i].type == float:
+			self.txtFields[i] = mnsUIUtils.drawFloatScroll(self.fullList[i], contentLayout)
+		elif self.fullList[i].type == bool:
+			bolChk = mnsUIUtils.drawBooleanChk(self.fullList[i], contentLayout)
+			if self.fullList[i].name in self.argValueOverrides:
+				bolChk.blockSignals(True)
+				bolChk.setChecked(self.argValueOverrides.pop(self.fullList[i].name))
+				bolChk.blockSignals(False)
+			self.txtFields[i] = bolChk
+			self.boolFeildsByName[self.fullList[i].name] = bolChk
+			if "colOverride".lower() in self.fullList[i].name.lower():
+				self.colOverride = bolChk
+
+			#bool exclusive behaviour
+			for exclutionGroup in self.boolExclusives:
+				if self.fullList[i].name in exclutionGroup:
+					bolChk.toggled.connect(partial(self.boolAutoExlusiveTrig, bolChk, exclutionGroup, self.boolFeildsByName))
+		else:
+			self.txtFields[i] = mnsUIUtils.drawButtonAndFieldUnknown(self.fullList[i], contentLayout)
+
+		self.attrComponentPairing.update({self.fullList[i].name: self.txtFields[i]})
+		newWidgets.append(self.txtFields[i])
+
+		#return; list (widgets)
+		return newWidgets
+
+	def setReadOnlyState(self, widgets = []):
+		"""Disable the given widgets (and all buttons), in read only mode.
+		"""
 
-			for component in roWidgets:
+		if self.readOnly:
+			for component in widgets:
 				if component:
 					if type(component) is list:
 						for c in component:
@@ -439,6 +526,36 @@ class MnsDynamicDefUI(form_class, base_class):
 			for button in self.findChildren(QtWidgets.QPushButton):
 				button.setEnabled(False)
 
+	def drawSection(self, dividerWidget):
+		"""Draw a lazy collapsible section's content (upon its first expand).
+		"""
+
+		if dividerWidget in self.lazySections:
+			indices, sectionLayout = self.lazySections.pop(dividerWidget)
+			newWidgets = []
+			for i in indices: newWidgets += self.drawArgument(i, sectionLayout)
+			self.setReadOnlyState(newWidgets)
+
+	def tabChangedTrigger(self, index):
+		if index == self.splitTabIndex: self.drawSplitTab()
+
+	def drawSplitTab(self):
+		"""Draw the lazy split tab's content (upon it first being shown).
+		"""
+
+		if self.lazyTabEntries:
+			tabEntries = self.lazyTabEntries
+			self.lazyTabEntries = []
+			newCollapsible = self.drawEntries(tabEntries)
+			self.setCollapsibleWidgetsBehaviour(newCollapsible)
+
+	def drawAll(self):
+		"""Draw all lazy content- the split tab and all collapsible sections.
+		"""
+
+		self.drawSplitTab()
+		for dividerWidget in list(self.lazySections.keys()): self.drawSection(dividerWidget)
+
 	def runCmd(self):
 		"""Main method run command trigger.
 		"""
@@ -476,7 +593,13 @@ class MnsDynamicDefUI(form_class, base_class):
 
 		sendVals = []
 		for i in range(0,len(self.fullList)):
-			if self.fullList[i].name.lower() == "spaces".lower():
+			if self.txtFields[i] is None:
+				#row wasn't drawn- get the value from the argument
+				if self.fullList[i].name in self.argValueOverrides:
+					sendVals.append(mnsUIUtils.getArgumentModelValue(self.fullList[i], value = self.argValueOverrides[self.fullList[i].name]))
+				else:
+					sendVals.append(mnsUIUtils.getArgumentModelValue(self.fullList[i]))
+			elif self.fullList[i].name.lower() == "spaces".lower():
 				send = []
 				currentItems =  [str(self.txtFields[i].item(k).text()) for k in range(self.txtFields[i].count())]
 				if currentItems:
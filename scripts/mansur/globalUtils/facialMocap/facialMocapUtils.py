@@ -5,15 +5,13 @@
 
 
 from maya import cmds
+from maya import mel
 import pymel.core as pm
 
 from pymel.core import datatypes as dt
 from maya import OpenMaya
-
-try:
-	import cPickle as pickle
-except ImportError:
-	import pickle
+from maya.api import OpenMaya as om
+import array, time
 
 try:
 	from six import string_types #2018 and up
@@ -34,7 +32,11 @@ from ...core import string as mnsString
 from ...core import utility as mnsUtils
 from ...core import UIUtils as mnsUIUtils
 from ...core import nodes as mnsNodes
+from ...core import animUtility as mnsAnimUtils
 from ...core.globals import *
+from . import poseBlendEvaluator as mnsPoseBlendEvaluator
+from . import mocapTakeReader as mnsMocapTakeReader
+from . import fmdFormat as mnsFMDFormat
 
 dialog_form_class, dialog_base_class = mnsUIUtils.buildFormBaseClassForUI(os.path.dirname(__file__), "importPrefixesDialog.ui")
 class ImportPrefixesDialog(QtWidgets.QDialog, dialog_form_class):
@@ -241,84 +243,262 @@ def isTransformChanged(targetTransform):
 
 	return False
 
+#############################
+######## POSE MATRIX ########
+#############################
+
+poseChannelDefaults = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0]
+
+def getPbNodeFn(pbNode):
+	mSel = om.MSelectionList()
+	mSel.add(pm.PyNode(pbNode).name())
+
+	#return; MFnDependencyNode
+	return om.MFnDependencyNode(mSel.getDependNode(0))
+
+def readPoseTargets(pbNode):
+	"""Read all target transforms connected to the given poseBlend node, along with their channels (t/r/s and custom attributes), current values and default values.
+	Values are stored in flat (targets x channels) arrays, where all targets are padded to the same channel count.
+	"""
+
+	pbNode = mnsUtils.checkIfObjExistsAndSet(pbNode)
+	poseTargets = {"pbNode": None, "targets": [], "targetIndices": {}, "elements": [], "plugs": [], "customCounts": [], "channelCount": len(poseChannelDefaults), "values": array.array("d"), "defaults": array.array("d"), "settable": array.array("b")}
+	if not pbNode: return poseTargets
+
+	poseTargets["pbNode"] = pbNode.name()
+	fnNode = getPbNodeFn(pbNode)
+	targetPlug = fnNode.findPlug("target", False)
+	targetTransformAttr = fnNode.attribute("targetTransform")
+
+	for logicalIndex in targetPlug.getExistingArrayAttributeIndices():
+		sources = targetPlug.elementByLogicalIndex(logicalIndex).child(targetTransformAttr).connectedTo(True, False)
+		if sources and sources[0].node().hasFn(om.MFn.kDagNode):
+			targetName = om.MFnDagNode(sources[0].node()).fullPathName()
+			poseTargets["targetIndices"][targetName] = len(poseTargets["targets"])
+			poseTargets["targets"].append(targetName)
+			poseTargets["elements"].append(logicalIndex)
+			poseTargets["plugs"].append([targetName + "." + channel for channel in mnsAnimUtils.transformChannels] + [targetName + "." + cAttr.attrName(longName = True) for cAttr in getTransformCustomAttrs(targetName)])
+
+	poseTargets["customCounts"] = [len(plugs) - len(poseChannelDefaults) for plugs in poseTargets["plugs"]]
+	poseTargets["channelCount"] = len(poseChannelDefaults) + max([0] + poseTargets["customCounts"])
+
+	#read all current values in one pass
+	mSel = om.MSelectionList()
+	for plugs in poseTargets["plugs"]:
+		for plugName in plugs: mSel.add(plugName)
+
+	plugIndex = 0
+	for plugs in poseTargets["plugs"]:
+		for k in range(poseTargets["channelCount"]):
+			if k < len(plugs):
+				mPlug = mSel.getPlug(plugIndex)
+				plugIndex += 1
+				poseTargets["values"].append(mnsAnimUtils.getScalarFromPlug(mPlug))
+				poseTargets["settable"].append(mPlug.isFreeToChange() == om.MPlug.kFreeToChange)
+				poseTargets["defaults"].append(mnsAnimUtils.getDefaultFromPlug(mPlug) if k >= len(poseChannelDefaults) else poseChannelDefaults[k])
+			else:
+				poseTargets["values"].append(0.0)
+				poseTargets["settable"].append(False)
+				poseTargets["defaults"].append(0.0)
+
+	#return; dict (pose targets)
+	return poseTargets
+
+def getTargetValues(poseTargets, values, targetIndex):
+	start = targetIndex * poseTargets["channelCount"]
+
+	#return; array (target channel values)
+	return values[start:start + len(poseTargets["plugs"][targetIndex])]
+
+def isTargetChanged(poseTargets, targetIndex, values = None):
+	"""Vectorized version of isTransformChanged- compare the given target's values against its defaults.
+	"""
+
+	values = getTargetValues(poseTargets, values or poseTargets["values"], targetIndex)
+	defaults = getTargetValues(poseTargets, poseTargets["defaults"], targetIndex)
+
+	#return; bool
+	return any(round(value, 2) != round(defaults[k], 2) for k, value in enumerate(values))
+
+def getChangedTargets(poseTargets, values = None):
+	#return; list (target indices)
+	return [targetIndex for targetIndex in range(len(poseTargets["targets"])) if isTargetChanged(poseTargets, targetIndex, values)]
+
+def writePoseTargetsValues(poseTargets, values, targetIndices = None):
+	"""Write the given (targets x channels) values into the target transforms, in a single batched call.
+	Channels that aren't free to change (locked or connected) are skipped.
+	"""
+
+	if targetIndices is None: targetIndices = range(len(poseTargets["targets"]))
+
+	melCmds = []
+	for targetIndex in targetIndices:
+		start = targetIndex * poseTargets["channelCount"]
+		for k, plugName in enumerate(poseTargets["plugs"][targetIndex]):
+			if poseTargets["settable"][start + k]: melCmds.append("setAttr " + mnsUtils.melString(plugName) + " " + repr(float(values[start + k])) + ";")
+
+	if melCmds: mel.eval("\n".join(melCmds))
+
+def readPoseMatrix(pbNode, poseTargets = None):
+	"""Read all stored poses of the given poseBlend node into an in-memory pose matrix.
+	The pose matrix holds a flat (poses x targets x channels) array, with a pose name to index map, and a (poses x targets) mask of stored entries.
+	"""
+
+	poseMatrix = poseTargets or readPoseTargets(pbNode)
+	poseMatrix.update({"poses": [], "poseIndices": {}, "data": array.array("d"), "mask": array.array("b"), "poseElements": {}, "poseSlots": []})
+	if not poseMatrix["pbNode"]: return poseMatrix
+
+	fnNode = getPbNodeFn(poseMatrix["pbNode"])
+	targetPlug = fnNode.findPlug("target", False)
+	targetPoseAttr = fnNode.attribute("targetPose")
+	targetPoseNameAttr = fnNode.attribute("targetPoseName")
+	poseAttrs = [fnNode.attribute("poseTranslate"), fnNode.attribute("poseRotate"), fnNode.attribute("poseScale")]
+	customAttributeAttr = fnNode.attribute("customAttribute")
+
+	for targetIndex, logicalIndex in enumerate(poseMatrix["elements"]):
+		posePlug = targetPlug.elementByLogicalIndex(logicalIndex).child(targetPoseAttr)
+		poseSlots = []
+		for poseElement in posePlug.getExistingArrayAttributeIndices():
+			elementPlug = posePlug.elementByLogicalIndex(poseElement)
+			poseName = elementPlug.child(targetPoseNameAttr).asString()
+			poseSlots.append((poseElement, poseName))
+			if not poseName: continue
+
+			values = []
+			for poseAttr in poseAttrs:
+				compoundPlug = elementPlug.child(poseAttr)
+				values += [mnsAnimUtils.getScalarFromPlug(compoundPlug.child(k)) for k in range(3)]
+
+			customPlug = elementPlug.child(customAttributeAttr)
+			for customIndex in customPlug.getExistingArrayAttributeIndices():
+				if customIndex >= poseMatrix["channelCount"] - len(poseChannelDefaults): break
+				while len(values) <= len(poseChannelDefaults) + customIndex: values.append(poseMatrix["defaults"][targetIndex * poseMatrix["channelCount"] + len(values)])
+				values[len(poseChannelDefaults) + customIndex] = customPlug.elementByLogicalIndex(customIndex).asDouble()
+
+			poseIndex = addPoseToMatrix(poseMatrix, poseName)
+			setPoseMatrixEntry(poseMatrix, poseIndex, targetIndex, values)
+			poseMatrix["poseElements"][(poseIndex, targetIndex)] = poseElement
+		poseMatrix["poseSlots"].append(poseSlots)
+
+	#return; dict (pose matrix)
+	return poseMatrix
+
+def addPoseToMatrix(poseMatrix, poseName):
+	if not poseName in poseMatrix["poseIndices"]:
+		poseMatrix["poseIndices"][poseName] = len(poseMatrix["poses"])
+		poseMatrix["poses"].append(poseName)
+		poseMatrix["data"].extend(poseMatrix["defaults"])
+		poseMatrix["mask"].extend([0] * len(poseMatrix["targets"]))
+
+	#return; int (pose index)
+	return poseMatrix["poseIndices"][poseName]
+
+def getPoseMatrixEntry(poseMatrix, poseIndex, targetIndex):
+	start = (poseIndex * len(poseMatrix["targets"]) + targetIndex) * poseMatrix["channelCount"]
+
+	#return; array (channel values)
+	return poseMatrix["data"][start:start + poseMatrix["channelCount"]]
+
+def setPoseMatrixEntry(poseMatrix, poseIndex, targetIndex, values):
+	start = (poseIndex * len(poseMatrix["targets"]) + targetIndex) * poseMatrix["channelCount"]
+	for k, value in enumerate(values[:poseMatrix["channelCount"]]): poseMatrix["data"][start + k] = value
+	poseMatrix["mask"][poseIndex * len(poseMatrix["targets"]) + targetIndex] = 1
+
+def getNextPoseElement(poseMatrix, targetIndex):
+	poseSlots = poseMatrix["poseSlots"][targetIndex]
+	if len(poseSlots) == 1 and not poseSlots[0][1]: return poseSlots[0][0]
+	usedElements = [slot[0] for slot in poseSlots] + [poseMatrix["poseElements"][key] for key in poseMatrix["poseElements"] if key[1] == targetIndex]
+
+	#return; int (targetPose logical index)
+	return max(usedElements) + 1 if usedElements else 0
+
+def writePoseMatrix(poseMatrix, poseNames = None):
+	"""Write the given poses (all poses by default) of the pose matrix back into the poseBlend node, in a single batched call.
+	Only stored entries (see the matrix mask) are written. New entries are allocated a targetPose element.
+	"""
+
+	poseNames = poseNames or poseMatrix["poses"]
+	targetCount = len(poseMatrix["targets"])
+
+	melCmds = []
+	for poseName in poseNames:
+		if not poseName in poseMatrix["poseIndices"]: continue
+		poseIndex = poseMatrix["poseIndices"][poseName]
+
+		for targetIndex in range(targetCount):
+			if not poseMatrix["mask"][poseIndex * targetCount + targetIndex]: continue
+			if not (poseIndex, targetIndex) in poseMatrix["poseElements"]:
+				poseMatrix["poseElements"][(poseIndex, targetIndex)] = getNextPoseElement(poseMatrix, targetIndex)
+				poseMatrix["poseSlots"][targetIndex] = [slot for slot in poseMatrix["poseSlots"][targetIndex] if slot[1]]
+
+			plugPrefix = poseMatrix["pbNode"] + ".target[" + str(poseMatrix["elements"][targetIndex]) + "].targetPose[" + str(poseMatrix["poseElements"][(poseIndex, targetIndex)]) + "]"
+			values = getPoseMatrixEntry(poseMatrix, poseIndex, targetIndex)
+			melCmds.append("setAttr -type \"string\" " + mnsUtils.melString(plugPrefix + ".targetPoseName") + " " + mnsUtils.melString(poseName) + ";")
+			for k, poseAttrName in enumerate(["poseTranslate", "poseRotate", "poseScale"]):
+				melCmds.append("setAttr " + mnsUtils.melString(plugPrefix + "." + poseAttrName) + " " + " ".join([repr(float(v)) for v in values[k * 3:k * 3 + 3]]) + ";")
+
+			customCount = poseMatrix["customCounts"][targetIndex]
+			if customCount:
+				melCmds.append("setAttr " + mnsUtils.melString(plugPrefix + ".customAttribute[0:" + str(customCount - 1) + "]") + " " + " ".join([repr(float(v)) for v in values[len(poseChannelDefaults):len(poseChannelDefaults) + customCount]]) + ";")
+
+	if melCmds: mel.eval("\n".join(melCmds))
+
+def getPoseStorageFromValues(poseTargets, values, targetIndices = []):
+	"""Convert the given targets' values into a pose storage dict, as used by loadPose- {targetName: {attrName: value}}.
+	"""
+
+	storage = {}
+	for targetIndex in targetIndices:
+		targetValues = getTargetValues(poseTargets, values, targetIndex)
+		storage[poseTargets["targets"][targetIndex].split("|")[-1]] = dict((plugName.split(".")[-1], targetValues[k]) for k, plugName in enumerate(poseTargets["plugs"][targetIndex]))
+
+	#return; dict (pose storage)
+	return storage
+
 def storePose(pbNode, poseName):
 	pbNode = mnsUtils.checkIfObjExistsAndSet(pbNode)
 	if pbNode and poseName:
-		for attrIdx in range(pbNode.target.numElements()):
-			inputAttr = pbNode.target[attrIdx].targetTransform.listConnections(s = True, d = False, p = False)
-			if inputAttr:
-				targetTransform = inputAttr[0]
-				#check if there is an existing storage for this pose name
-				existingPoseAttr = None
-				for poseAttrIdx in range(pbNode.target[attrIdx].targetPose.numElements()):
-					targetPoseName = pbNode.target[attrIdx].targetPose[poseAttrIdx].targetPoseName.get()
-					if targetPoseName == poseName:
-						existingPoseAttr = pbNode.target[attrIdx].targetPose[poseAttrIdx]
-						break
-
-				if isTransformChanged(targetTransform) or existingPoseAttr:
-					#store pose
-					targetAttr = pbNode.target[attrIdx].targetPose
-					targetCustomAttrs = getTransformCustomAttrs(targetTransform)
-		
-					if not existingPoseAttr: #new pose
-						if targetAttr.numElements() == 1 and not targetAttr[0].targetPoseName.get():
-							nextAvailableIndex = 0
-						else:
-							nextAvailableIndex = targetAttr.numElements()
-
-						targetAttr[nextAvailableIndex].targetPoseName.set(poseName)
-						targetAttr[nextAvailableIndex].poseTranslate.set(targetTransform.t.get())
-						targetAttr[nextAvailableIndex].poseRotate.set(targetTransform.r.get())
-						targetAttr[nextAvailableIndex].poseScale.set(targetTransform.s.get())
-
-						for i, cAttr in enumerate(targetCustomAttrs):
-							targetAttr[nextAvailableIndex].customAttribute[i].set(cAttr.get())
-
-					else: #existing pose update
-						existingPoseAttr.poseTranslate.set(targetTransform.t.get())
-						existingPoseAttr.poseRotate.set(targetTransform.r.get())
-						existingPoseAttr.poseScale.set(targetTransform.s.get())
-
-						for i, cAttr in enumerate(targetCustomAttrs):
-							existingPoseAttr.customAttribute[i].set(cAttr.get())
+		poseMatrix = readPoseMatrix(pbNode)
+		existingPose = poseName in poseMatrix["poseIndices"]
+		poseIndex = addPoseToMatrix(poseMatrix, poseName)
+		targetCount = len(poseMatrix["targets"])
+
+		for targetIndex in range(targetCount):
+			#store the pose for changed targets, or update an existing storage for this pose name
+			if isTargetChanged(poseMatrix, targetIndex) or (existingPose and poseMatrix["mask"][poseIndex * targetCount + targetIndex]):
+				setPoseMatrixEntry(poseMatrix, poseIndex, targetIndex, getTargetValues(poseMatrix, poseMatrix["values"], targetIndex))
+
+		writePoseMatrix(poseMatrix, [poseName])
 						
-def resetPose(pbNode):
+def resetPose(pbNode, **kwargs):
+	poseTargets = kwargs.get("poseTargets", None) #arg; comment = pre-read pose targets (see readPoseTargets), to avoid re-reading the node
+
 	pbNode = mnsUtils.checkIfObjExistsAndSet(pbNode)
 	if pbNode:
-		for attrIdx in range(pbNode.target.numElements()):
-			inputAttr = pbNode.target[attrIdx].targetTransform.listConnections(s = True, d = False, p = False)
-			if inputAttr:
-				targetTransform = inputAttr[0]
-				for channelName in "trs":
-					for axisName in "xyz":
-						attr = targetTransform.attr(channelName + axisName)
-						try:
-							attr.set(attr.getDefault())
-						except:
-							pass
-				
-				targetCustomAttrs = getTransformCustomAttrs(targetTransform)
-				for cAttr in targetCustomAttrs:
-					try:
-						cAttr.set(cAttr.getDefault())
-					except:
-						pass
+		poseTargets = poseTargets or readPoseTargets(pbNode)
+		writePoseTargetsValues(poseTargets, poseTargets["defaults"])
 
 def loadPose(pbNode, poseStorage):
 	if pbNode and poseStorage:
-		resetPose(pbNode)
+		poseTargets = readPoseTargets(pbNode)
+		values = array.array("d", poseTargets["defaults"])
 
-		toDel = []
 		for nodeName in poseStorage.keys():
 			targetTransform = mnsUtils.checkIfObjExistsAndSet(nodeName)
-			if targetTransform:
-				targetTransform.setMatrix(poseStorage[nodeName]["matrix"])
-
-				for cAttrName in poseStorage[nodeName]["customAttribues"].keys():
-					if targetTransform.hasAttr(cAttrName):
-						targetTransform.attr(cAttrName).set(poseStorage[nodeName]["customAttribues"][cAttrName])
-		pm.delete(toDel)
+			if targetTransform and targetTransform.longName() in poseTargets["targetIndices"]:
+				targetIndex = poseTargets["targetIndices"][targetTransform.longName()]
+				start = targetIndex * poseTargets["channelCount"]
+				for k, plugName in enumerate(poseTargets["plugs"][targetIndex]):
+					attrName = plugName.split(".")[-1]
+					if attrName in poseStorage[nodeName]: values[start + k] = poseStorage[nodeName][attrName]
+			elif targetTransform:
+				#not a target of this node
+				for attrName in poseStorage[nodeName]:
+					if targetTransform.hasAttr(attrName):
+						try: targetTransform.attr(attrName).set(poseStorage[nodeName][attrName])
+						except: pass
+
+		writePoseTargetsValues(poseTargets, values)
 
 def getMirrorTransform(sourceTransformName, **kwargs):
 	leftPrefix = kwargs.get("leftPrefix", "l_")
@@ -354,70 +534,76 @@ def mirrorPose(targetTransform, mirrorTransform):
 			except:
 				pass
 				
+def getMirrorPoseValues(poseTargets, targetIndex, mirrorIndex, values, parentMatrices):
+	"""In memory version of mirrorPose- return the mirror target's channel values, mirroring the target's pose (from the given values).
+	The parent matrices are expected to be evaluated at rest pose.
+	"""
+
+	targetName, mirrorName = poseTargets["targets"][targetIndex], poseTargets["targets"][mirrorIndex]
+	targetDef, mirrorDef = mnsAnimUtils.getNodeDefForDecompose(targetName), mnsAnimUtils.getNodeDefForDecompose(mirrorName)
+	targetChannels = dict((mnsAnimUtils.transformChannels[k], v) for k, v in enumerate(getTargetValues(poseTargets, values, targetIndex)[:len(poseChannelDefaults)]))
+	mirrorParentInverse = parentMatrices[mirrorName].inverse()
+	reflectionMatrix_YZ = om.MMatrix([-1.0,0.0,0.0,0.0, 0.0,1.0,0.0,0.0, 0.0,0.0,1.0,0.0, 0.0,0.0,0.0,1.0])
+
+	zeroTargetMatrix = mnsAnimUtils.composeLocalMatrix({}, targetDef) * parentMatrices[targetName]
+	reflectionReferenceRotation, dummy = mnsAnimUtils.decomposeLocalMatrix(zeroTargetMatrix * reflectionMatrix_YZ * mirrorParentInverse, mirrorDef)
+	targetMatrix = mnsAnimUtils.composeLocalMatrix(targetChannels, targetDef) * parentMatrices[targetName]
+	mirrorChannels, dummy = mnsAnimUtils.decomposeLocalMatrix(targetMatrix * reflectionMatrix_YZ * mirrorParentInverse, mirrorDef)
+	for chan in "XYZ":
+		mirrorChannels["rotate" + chan] -= reflectionReferenceRotation["rotate" + chan]
+
+	#return; list (mirror t/r/s values)
+	return [mirrorChannels[channel] for channel in mnsAnimUtils.transformChannels]
+
 def copyPose(pbNode, flip = False, **kwargs):
 	leftPrefix = kwargs.get("leftPrefix", "l_")
 	rightPrefix = kwargs.get("rightPrefix", "r_")
 
 	storage = {}
-	localPoseStore = {}
 	pbNode = mnsUtils.checkIfObjExistsAndSet(pbNode)
 	if pbNode:
+		poseTargets = readPoseTargets(pbNode)
+		currentValues = poseTargets["values"]
+		changedTargets = getChangedTargets(poseTargets)
+
 		if flip:
-			#first store pose for end of process recovery
-			localPoseStore = copyPose(pbNode)
-
-			#locally store changed matricies
-			localStorage = {}
-			for attrIdx in range(pbNode.target.numElements()):
-				inputAttr = pbNode.target[attrIdx].targetTransform.listConnections(s = True, d = False, p = False)
-				if inputAttr:
-					targetTransform = inputAttr[0]
-					if isTransformChanged(targetTransform):
-						targetCustomAttrs = getTransformCustomAttrs(targetTransform)
-						localStorage[targetTransform] = {"matrix": targetTransform.getMatrix(), "customAttribues": {}}
-						
-						for cAttr in targetCustomAttrs:
-							localStorage[targetTransform]["customAttribues"][cAttr.attrName()] = cAttr.get()
-
-			#zeroAll
-			resetPose(pbNode)
-
-			#get mirror data and collect
-			for targetTransform in localStorage.keys():
-				mirrorTransform = mnsUtils.checkIfObjExistsAndSet(getMirrorTransform(targetTransform, **kwargs))
-				targetTransform = mnsUtils.checkIfObjExistsAndSet(targetTransform)
-				if targetTransform and mirrorTransform:
-					storage[mirrorTransform.nodeName()] = {"matrix": None, "customAttribues": {}}
-
-					if targetTransform in localStorage.keys():
-						targetMatrix = localStorage[targetTransform]["matrix"]
-						targetTransform.setMatrix(targetMatrix)
-						mirrorPose(targetTransform, mirrorTransform)
-						storage[mirrorTransform.nodeName()]["matrix"] = mirrorTransform.getMatrix()
-
-						targetCustomAttrs = localStorage[targetTransform]["customAttribues"]
-						for cAttr in targetCustomAttrs:
-							if mirrorTransform.hasAttr(cAttr):
-								storage[mirrorTransform.nodeName()]["customAttribues"][cAttr] = localStorage[targetTransform]["customAttribues"][cAttr]
-
-						pm.makeIdentity(targetTransform)
-						pm.makeIdentity(mirrorTransform)
-			
-			#restore pose
-			loadPose(pbNode, localPoseStore)
+			#collect mirror pairs
+			mirrorPairs = []
+			for targetIndex in changedTargets:
+				mirrorTransform = mnsUtils.checkIfObjExistsAndSet(getMirrorTransform(poseTargets["targets"][targetIndex].split("|")[-1], **kwargs))
+				if mirrorTransform and mirrorTransform.longName() in poseTargets["targetIndices"]:
+					mirrorPairs.append((targetIndex, poseTargets["targetIndices"][mirrorTransform.longName()]))
+
+			if mirrorPairs:
+				#zeroAll, and collect the rest parent matrices in one pass
+				resetPose(pbNode, poseTargets = poseTargets)
+				parents = {}
+				for pair in mirrorPairs:
+					for targetName in [poseTargets["targets"][k] for k in pair]:
+						parents[targetName] = (cmds.listRelatives(targetName, p = True, f = True) or [None])[0]
+				parentNames = list(dict.fromkeys([p for p in parents.values() if p]))
+				parentWorlds = dict(zip(parentNames, [mnsAnimUtils.getMatrixFromPlug(plug) for plug in mnsAnimUtils.getWorldMatrixPlugs(parentNames)]))
+				parentMatrices = dict((targetName, parentWorlds[parents[targetName]] if parents[targetName] else om.MMatrix()) for targetName in parents)
+
+				#restore pose
+				writePoseTargetsValues(poseTargets, currentValues)
+
+				#mirror in memory
+				mirrorValues = array.array("d", poseTargets["defaults"])
+				for targetIndex, mirrorIndex in mirrorPairs:
+					start = mirrorIndex * poseTargets["channelCount"]
+					for k, value in enumerate(getMirrorPoseValues(poseTargets, targetIndex, mirrorIndex, currentValues, parentMatrices)): mirrorValues[start + k] = value
+
+					#custom attributes are copied by name
+					mirrorAttrs = [plugName.split(".")[-1] for plugName in poseTargets["plugs"][mirrorIndex]]
+					targetValues = getTargetValues(poseTargets, currentValues, targetIndex)
+					for k, plugName in enumerate(poseTargets["plugs"][targetIndex][len(poseChannelDefaults):]):
+						attrName = plugName.split(".")[-1]
+						if attrName in mirrorAttrs: mirrorValues[start + mirrorAttrs.index(attrName)] = targetValues[len(poseChannelDefaults) + k]
+
+				storage = getPoseStorageFromValues(poseTargets, mirrorValues, [pair[1] for pair in mirrorPairs])
 		else:
-			for attrIdx in range(pbNode.target.numElements()):
-				inputAttr = pbNode.target[attrIdx].targetTransform.listConnections(s = True, d = False, p = False)
-				if inputAttr:
-					targetTransform = inputAttr[0]
-					if isTransformChanged(targetTransform):
-						targetCustomAttrs = getTransformCustomAttrs(targetTransform)
-						storage[targetTransform.nodeName()] = {"matrix": None, "customAttribues": {}}
-						transformStore = targetTransform.getMatrix()
-						storage[targetTransform.nodeName()]["matrix"] = transformStore
-
-						for cAttr in targetCustomAttrs:
-							storage[targetTransform.nodeName()]["customAttribues"][cAttr.attrName()] = cAttr.get()
+			storage = getPoseStorageFromValues(poseTargets, currentValues, changedTargets)
 	return storage
 
 def collectInputDataFromPbNode(pbNode):
@@ -484,6 +670,188 @@ def collectTargetDataFromPbNode(pbNode):
 												"targetPoses": targetPoses}
 	return targetData										
 
+def getPbNodeSourcePlugs(pbNode):
+	"""Return the source plugs connected to the given poseBlend node, as {poseName: plug name}.
+	"""
+
+	sourcePlugs = {}
+	pbNode = mnsUtils.checkIfObjExistsAndSet(pbNode)
+	if pbNode:
+		for attrIdx in range(pbNode.data.numElements()):
+			inputAttr = pbNode.data[attrIdx].poseValue.listConnections(s = True, d = False, p = True)
+			if inputAttr: sourcePlugs[pbNode.data[attrIdx].poseName.get()] = inputAttr[0].name(fullDagPath = True)
+
+	#return; dict (poseName: plug name)
+	return sourcePlugs
+
+def evaluatePbNodeOffline(pbNode, frames = [], **kwargs):
+	"""Evaluate the given poseBlend definition for the given frames, outside of the DG (see poseBlendEvaluator).
+	The source values are sampled through time-specific DG contexts, unless passed in.
+	Returns the pose targets (see readPoseTargets), and a {plugName: array (value per frame)} dict for all target channels.
+	"""
+
+	sourceValues = kwargs.get("sourceValues", None) #arg; comment = {poseName: sequence (value per frame)}. Recorded source values to evaluate, instead of sampling the source attributes.
+
+	pbNode = mnsUtils.checkIfObjExistsAndSet(pbNode)
+	poseTargets = readPoseTargets(pbNode)
+	channelValues = {}
+	if not pbNode or not poseTargets["targets"]: return poseTargets, channelValues
+
+	if sourceValues is None:
+		sourcePlugs = getPbNodeSourcePlugs(pbNode)
+		sampledValues = mnsAnimUtils.sampleAttrValues(list(sourcePlugs.values()), frames)
+		sourceValues = dict((poseName, sampledValues[sourcePlugs[poseName]]) for poseName in sourcePlugs)
+
+	#the definition data is keyed by namespace-less target names
+	targetNames = dict((mnsUtils.removeNamespaceFromString(targetName.split("|")[-1]), targetName) for targetName in poseTargets["targets"])
+	customAttrNames = dict((targetKey, [plugName.split(".")[-1] for plugName in poseTargets["plugs"][poseTargets["targetIndices"][targetNames[targetKey]]][len(poseChannelDefaults):]]) for targetKey in targetNames)
+	customRestValues = dict((targetKey, getTargetValues(poseTargets, poseTargets["defaults"], poseTargets["targetIndices"][targetNames[targetKey]])[len(poseChannelDefaults):]) for targetKey in targetNames)
+	definition = mnsPoseBlendEvaluator.buildEvaluatorDefinition(collectInputDataFromPbNode(pbNode), collectTargetDataFromPbNode(pbNode), customAttrNames = customAttrNames, customRestValues = customRestValues)
+
+	for k, values in enumerate(mnsPoseBlendEvaluator.evaluateFrames(definition, sourceValues)):
+		targetKey, channelName = definition["channels"][k]
+		if targetKey in targetNames: channelValues[targetNames[targetKey] + "." + channelName] = values
+
+	#return; dict (pose targets), dict (plugName: array (values per frame))
+	return poseTargets, channelValues
+
+def bakePbNodeOffline(pbNode, rangeMin = 0, rangeMax = 0, **kwargs):
+	"""Bake the given poseBlend definition into its target transforms, over the given range (inclusive), without playing the scene.
+	The definition is evaluated offline (see evaluatePbNodeOffline), the node's outputs are disconnected, and the result is written as bulk keys per channel.
+	"""
+
+	skipStatic = kwargs.get("skipStatic", True) #arg; comment = skip channels that stay at their rest value throughout the range
+	sourceValues = kwargs.get("sourceValues", None) #arg; comment = {poseName: sequence (value per frame)}. Recorded source values to evaluate, instead of sampling the source attributes.
+
+	pbNode = mnsUtils.checkIfObjExistsAndSet(pbNode)
+	if pbNode and rangeMax >= rangeMin:
+		startTime = time.time()
+		frames = mnsAnimUtils.getFramesForRange(rangeMin, rangeMax + 1)
+		poseTargets, channelValues = evaluatePbNodeOffline(pbNode, frames, sourceValues = sourceValues)
+		if not channelValues: return
+
+		connectOutputs(pbNode, mode = 0)
+
+		plugKeys = {}
+		for targetIndex, targetName in enumerate(poseTargets["targets"]):
+			for k, plugName in enumerate(poseTargets["plugs"][targetIndex]):
+				values = channelValues.get(plugName, None)
+				if not values: continue
+				restValue = poseTargets["defaults"][targetIndex * poseTargets["channelCount"] + k]
+				if skipStatic and max(abs(v - restValue) for v in values) < 0.0001: continue
+				if mnsAnimUtils.isPlugKeyable(plugName): plugKeys[plugName] = (frames[:len(values)], values)
+		mnsAnimUtils.setKeysOnPlugs(plugKeys)
+
+		mnsLog.log("Baked " + pbNode.nodeName() + " offline- " + str(len(plugKeys)) + " channels, " + str(len(frames)) + " frames, in " + str(round(time.time() - startTime, 2)) + "s.", svr = 1)
+
+		#return; list (keyed plug names)
+		return list(plugKeys.keys())
+
+def getMocapTakeColumnMapping(columns = [], **kwargs):
+	"""Map the given mocap take columns to source attributes.
+	Columns are matched (case insensitive) against the given poseBlend node's source attributes, and against the given host node's keyable attributes.
+	Before matching, the column's source prefix is removed, and the target prefix is added.
+	"""
+
+	pbNode = kwargs.get("pbNode", None) #arg; comment = poseBlend node, which source attributes to map to
+	hostNode = kwargs.get("hostNode", None) #arg; comment = node which keyable attributes to map to
+	columnMap = kwargs.get("columnMap", {}) #arg; comment = explicit {column: plug name} mapping. Overrides the automatic mapping.
+	sourcePrefix = kwargs.get("sourcePrefix", "") #arg; comment = prefix to remove from the column names
+	targetPrefix = kwargs.get("targetPrefix", "") #arg; comment = prefix to add to the column names
+
+	candidates = {}
+	hostNode = mnsUtils.checkIfObjExistsAndSet(hostNode)
+	if hostNode:
+		for attrName in cmds.listAttr(hostNode.longName(), k = True, s = True) or []:
+			candidates[attrName.lower()] = hostNode.longName() + "." + attrName
+	if pbNode:
+		sourcePlugs = getPbNodeSourcePlugs(pbNode)
+		for poseName in sourcePlugs:
+			candidates[sourcePlugs[poseName].split(".")[-1].lower()] = sourcePlugs[poseName]
+			candidates[poseName.lower()] = sourcePlugs[poseName]
+
+	mapping = {}
+	for column in columns:
+		attrName = column.strip()
+		if sourcePrefix and attrName.startswith(sourcePrefix): attrName = attrName[len(sourcePrefix):]
+		attrName = targetPrefix + attrName
+
+		plugName = columnMap.get(column, None) or candidates.get(attrName.lower(), None)
+		if plugName and cmds.objExists(plugName): mapping[column] = plugName
+
+	#return; dict (column: plug name)
+	return mapping
+
+def importMocapTake(filePath = "", **kwargs):
+	"""Import a facial mocap take (CSV/JSON, see mocapTakeReader) as keys on source attributes.
+	The take is streamed in chunks, resampled to the scene's frame-rate, and written as bulk keys per channel, keeping the memory bounded for long takes.
+	Any existing animation on the mapped attributes is replaced.
+	Mapping kwargs are passed to getMocapTakeColumnMapping.
+	"""
+
+	startFrame = kwargs.get("startFrame", None) #arg; comment = the scene frame of the take's first sample. Default to the playback start.
+	sourceFps = kwargs.get("sourceFps", 60.0) #arg; comment = the take's frame-rate, used for timecode and frame columns, and for takes without a time column
+	chunkSize = kwargs.get("chunkSize", 5000) #arg; comment = number of frames to buffer before writing keys
+	tangentType = kwargs.get("tangentType", "linear") #arg; comment = in and out tangent type for the imported keys
+
+	returnData = {"mapping": {}, "unmapped": [], "frames": 0, "curves": []}
+	if not filePath or not os.path.isfile(filePath):
+		mnsLog.log("Couldn't find the specified take file.", svr = 2)
+		return returnData
+
+	startTime = time.time()
+	if startFrame is None: startFrame = pm.playbackOptions(q = True, min = True)
+	sceneFps = mel.eval("currentTimeUnitToFPS()")
+
+	takeInfo = mnsMocapTakeReader.getTakeInfo(filePath)
+	mapping = getMocapTakeColumnMapping(takeInfo["columns"], **kwargs)
+	returnData["mapping"] = mapping
+	returnData["unmapped"] = [c for c in takeInfo["columns"] if not c in mapping]
+	if not mapping:
+		mnsLog.log("Couldn't map any of the take's columns to source attributes. Aborting.", svr = 2)
+		return returnData
+
+	columns = list(mapping.keys())
+	curves, keyCounts = {}, {}
+	samples = mnsMocapTakeReader.iterSamples(filePath, columns, sourceFps = sourceFps)
+	for frames, channels in mnsMocapTakeReader.iterChunks(mnsMocapTakeReader.iterResampled(samples, sceneFps), chunkSize):
+		sceneFrames = [startFrame + frame for frame in frames]
+		for k, column in enumerate(columns):
+			if not column in curves:
+				curves[column] = mnsAnimUtils.setKeysBulk(mapping[column], sceneFrames, channels[k], tangentType = None, merge = False)
+				keyCounts[column] = len(sceneFrames)
+			elif curves[column]:
+				keyCounts[column] = mnsAnimUtils.appendKeysBulk(curves[column], sceneFrames, channels[k], startIndex = keyCounts[column])
+		returnData["frames"] += len(frames)
+
+	returnData["curves"] = [c for c in curves.values() if c]
+	if returnData["curves"] and tangentType: cmds.keyTangent(returnData["curves"], itt = tangentType, ott = tangentType)
+
+	mnsLog.log("Imported mocap take \'" + filePath + "\'- " + str(len(mapping)) + " channels, " + str(returnData["frames"]) + " frames, in " + str(round(time.time() - startTime, 2)) + "s.", svr = 1)
+	if returnData["unmapped"]: mnsLog.log("Unmapped take columns: " + ", ".join(returnData["unmapped"]), svr = 0)
+
+	#return; dict (mapping, unmapped columns, frame count, anim curves)
+	return returnData
+
+def importMocapTakeFromFile(pbNode = None):
+	"""Import a mocap take into the given poseBlend node's source attributes, using a file dialog and the prefixes dialog.
+	"""
+
+	filePath = QtWidgets.QFileDialog.getOpenFileName(mnsUIUtils.get_maya_window(), "Import Mocap Take", None, "Mocap Take (*.csv *.json *.jsonl *.ndjson)")
+	if filePath and filePath[0]:
+		prefixes = ImportPrefixesDialog().getResults()
+		if not prefixes:
+			mnsLog.log("Mocap take import canceled.", svr = 1)
+			return None
+		sourcePrefix, targetPrefix = prefixes
+
+		returnData = importMocapTake(filePath[0], pbNode = pbNode, sourcePrefix = sourcePrefix, targetPrefix = targetPrefix)
+		if returnData["curves"]:
+			pm.confirmDialog(title = 'Success', message = "Imported " + str(returnData["frames"]) + " frames into " + str(len(returnData["curves"])) + " source attributes.", defaultButton = 'OK')
+
+		#return; dict (see importMocapTake)
+		return returnData
+
 def exportPBData(pbNode):
 	sourceData = collectInputDataFromPbNode(pbNode)
 	targetData = collectTargetDataFromPbNode(pbNode)
@@ -498,25 +866,27 @@ def exportPBData(pbNode):
 		if filename: 
 			filename = filename[0]
 			if filename.endswith(".mnsFMD"):
-					fh = open(filename, 'wb')
-					pickle.dump(exportData, fh, pickle.HIGHEST_PROTOCOL)
-					fh.close()
+					mnsFMDFormat.writeFMDFile(filename, exportData)
 					mnsLog.log("Exported Facial Mocap Data Succesfully to: \'" + filename + "\'.", svr = 1)
 					#dialog
 					pm.confirmDialog( title='Success', message="Exported Facial Mocap Data Succesfully to: \'" + filename + "\'.", defaultButton='OK')
 			else:
 				mnsLog.log("Invalid file name. Aborting.", svr = 1)
 
-def collectFMDataFromFile(filePath = None):
+def collectFMDataFromFile(filePath = None, **kwargs):
+	"""Read an FMD file (see fmdFormat). Legacy pickled files are supported.
+	kwargs are passed to fmdFormat.readFMDFile, to allow partial loads (sources only, or a subset of targets).
+	"""
+
 	filePath = filePath or QtWidgets.QFileDialog.getOpenFileName(mnsUIUtils.get_maya_window(), "Import Facial Mocap Data", None, "Mns Facial Mocap Data (*.mnsFMD)")
 	if filePath: 
 		if not isinstance(filePath, string_types): filePath = filePath[0]
 		if filePath.endswith(".mnsFMD"):
 			if os.path.isfile(filePath):
-				fh = open(filePath, 'rb')
-				returnData = pickle.load(fh)
-				fh.close()
-				return returnData
+				try:
+					return mnsFMDFormat.readFMDFile(filePath, **kwargs)
+				except (ValueError, mnsFMDFormat.legacyPickle.UnpicklingError) as e:
+					mnsLog.log("Failed to read the FMD file- " + str(e), svr = 2)
 			else:
 				mnsLog.log("Couldn't find the specified FMD file.", svr = 1)
 		else:
@@ -578,27 +948,16 @@ def importFMDataFromFile():
 			connectTargetTransformsToPbNode(pbNode, targetTransforms)
 			infoReturn.append(["Successfully found target transforms and connected them.", True])
 
-			for ctrl in targetTransforms:
-				ctrlKey = mnsUtils.removeNamespaceFromString(ctrl.nodeName())
-				if ctrlKey in targetData.keys(): 
-					outCons = ctrl.message.listConnections(s = False, d = True, p = True, t= "mnsPoseBlend")
-					if outCons:
-						targetAttr = outCons[0].parent()
-						if "targetPoses" in targetData[ctrlKey].keys():
-							for k, targetPoseKey in enumerate(targetData[ctrlKey]["targetPoses"]):
-								pT =  targetData[ctrlKey]["targetPoses"][targetPoseKey]["poseTranslate"]
-								pR =  targetData[ctrlKey]["targetPoses"][targetPoseKey]["poseRotate"]
-								pS =  targetData[ctrlKey]["targetPoses"][targetPoseKey]["poseScale"]
-
-								targetAttr.targetPose[k].targetPoseName.set(targetPoseKey)
-								targetAttr.targetPose[k].poseTranslate.set(pT)
-								targetAttr.targetPose[k].poseRotate.set(pR)
-								targetAttr.targetPose[k].poseScale.set(pS)
-
-								customAttributesAttr = targetAttr.targetPose[k].customAttribute
-								customAttributes =  targetData[ctrlKey]["targetPoses"][targetPoseKey]["poseCustomAttributes"]
-								for i, attrValue in enumerate(customAttributes):
-									customAttributesAttr[i].set(attrValue)
+			#write all poses in one batched pass
+			poseMatrix = readPoseMatrix(pbNode)
+			for targetIndex, targetName in enumerate(poseMatrix["targets"]):
+				ctrlKey = mnsUtils.removeNamespaceFromString(targetName.split("|")[-1])
+				if ctrlKey in targetData.keys() and "targetPoses" in targetData[ctrlKey].keys():
+					for targetPoseKey in targetData[ctrlKey]["targetPoses"]:
+						targetPose = targetData[ctrlKey]["targetPoses"][targetPoseKey]
+						poseValues = list(targetPose["poseTranslate"]) + list(targetPose["poseRotate"]) + list(targetPose["poseScale"]) + list(targetPose["poseCustomAttributes"])[:poseMatrix["customCounts"][targetIndex]]
+						setPoseMatrixEntry(poseMatrix, addPoseToMatrix(poseMatrix, targetPoseKey), targetIndex, poseValues)
+			writePoseMatrix(poseMatrix)
 		else:
 			infoReturn.append(["[ERROR] Couldn't find target transforms.", False])
 
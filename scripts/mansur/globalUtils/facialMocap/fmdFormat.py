@@ -0,0 +1,335 @@
+"""=== Author: Assaf Ben Zur ===
+Facial Mocap Data (.mnsFMD) file format.
+A versioned binary container, replacing the legacy pickled definition dicts:
+	- Magic ("MNSFMD") and version (uint16), followed by the header length (uint32).
+	- A JSON header- schema info, the definition name, the source data, a pose-name table, and a block table per target.
+	- A data section of dense little-endian float64 arrays, one block per target, of (stored poses x channels) values- translate, rotate, scale and custom attributes.
+Target blocks are located through the header, allowing partial loads (sources only, or a subset of targets) without reading the whole file.
+Legacy pickle files are still readable, through a restricted unpickler which only allows plain builtin data types, and PyMel vectors and matrices (rebuilt as plain tuples, without importing PyMel).
+This module doesn't depend on Maya.
+"""
+
+#global dependencies
+import os, sys, json, struct, array, time, tempfile, random
+
+try:
+	import cPickle as pickle
+except ImportError:
+	import pickle
+
+#the pure python unpickler is used for legacy files, as it can be subclassed in both python 2 and 3
+import pickle as legacyPickle
+
+FMD_MAGIC = b"MNSFMD"
+FMD_VERSION = 2
+FMD_TRANSFORM_CHANNELS = 9
+
+FMD_LEGACY_SAFE_TYPES = {"dict", "list", "tuple", "set", "frozenset", "str", "unicode", "bytes", "int", "long", "float", "bool", "complex", "object"}
+FMD_LEGACY_DATA_TYPES = {"Vector", "FloatVector", "Point", "FloatPoint", "Matrix", "FloatMatrix"}
+
+def getFlatNumbers(data):
+	#return; list (all numbers within the given nested data)
+	if isinstance(data, bool): return []
+	if isinstance(data, (int, float)): return [float(data)]
+	if isinstance(data, dict): data = list(data.values())
+	if isinstance(data, (list, tuple)): return [v for d in data for v in getFlatNumbers(d)]
+	return []
+
+class MnsLegacyDataArray(list):
+	"""Stand-in for pickled PyMel datatypes (Vector, Point, Matrix), collecting their numeric values.
+	Supports both the reduce (cls(*args)) and new-object (cls.__new__(cls, *args) + state) pickle paths.
+	"""
+
+	def __new__(cls, *args, **kwargs):
+		instance = list.__new__(cls)
+		instance.extend(getFlatNumbers(args))
+		return instance
+
+	def __init__(self, *args, **kwargs):
+		pass
+
+	def __setstate__(self, state):
+		if not self: self.extend(getFlatNumbers(state))
+
+def legacyReconstructor(cls, base, state = None):
+	#copy_reg._reconstructor replacement, for protocol 0/1 pickles- only allowed for the PyMel datatypes stand-in
+	if cls is not MnsLegacyDataArray: raise legacyPickle.UnpicklingError("Forbidden reconstruction in legacy mnsFMD file.")
+	return MnsLegacyDataArray(state)
+
+class MnsLegacyFMDUnpickler(legacyPickle.Unpickler):
+	"""Restricted unpickler for legacy (pickled) FMD files.
+	Only plain builtin data types and PyMel vectors/matrices are allowed- any other global lookup is rejected, preventing code execution from a pickled file.
+	"""
+
+	def find_class(self, module, name):
+		if module in ("builtins", "__builtin__") and name in FMD_LEGACY_SAFE_TYPES:
+			return legacyPickle.Unpickler.find_class(self, module, name)
+		if module.startswith("pymel.") and module.endswith(".datatypes") and name in FMD_LEGACY_DATA_TYPES:
+			return MnsLegacyDataArray
+		if module in ("copy_reg", "copyreg") and name == "_reconstructor":
+			return legacyReconstructor
+		raise legacyPickle.UnpicklingError("Forbidden type in legacy mnsFMD file- " + module + "." + name + ".")
+
+def getPlainLegacyData(data):
+	"""Convert the PyMel datatype stand-ins within the loaded legacy data into plain tuples.
+	"""
+
+	if isinstance(data, MnsLegacyDataArray): return tuple(data)
+	if isinstance(data, dict): return dict((k, getPlainLegacyData(v)) for k, v in data.items())
+	if isinstance(data, list): return [getPlainLegacyData(v) for v in data]
+	if isinstance(data, tuple): return tuple(getPlainLegacyData(v) for v in data)
+
+	#return; any (plain data)
+	return data
+
+def loadLegacyFMDFile(filePath = ""):
+	with open(filePath, "rb") as f: fmData = MnsLegacyFMDUnpickler(f).load()
+	if type(fmData) is not dict: raise legacyPickle.UnpicklingError("Invalid legacy mnsFMD file.")
+
+	#return; dict (facial mocap data)
+	return getPlainLegacyData(fmData)
+
+def isLegacyFMDFile(filePath = ""):
+	with open(filePath, "rb") as f: magic = f.read(len(FMD_MAGIC))
+
+	#return; bool
+	return magic != FMD_MAGIC
+
+def packTargetData(targetName, targetData, poseIndices):
+	"""Pack a single target's poses into a dense (poses x channels) float array.
+	"""
+
+	targetPoses = targetData.get("targetPoses", {})
+	poseNames = list(targetPoses.keys())
+	customLengths = [len(targetPoses[p].get("poseCustomAttributes", [])) for p in poseNames]
+	channelCount = FMD_TRANSFORM_CHANNELS + max([0] + customLengths)
+
+	values = array.array("d")
+	for k, poseName in enumerate(poseNames):
+		poseData = targetPoses[poseName]
+		poseValues = list(poseData["poseTranslate"]) + list(poseData["poseRotate"]) + list(poseData["poseScale"]) + list(poseData.get("poseCustomAttributes", []))
+		values.extend([float(v) for v in poseValues] + [0.0] * (channelCount - len(poseValues)))
+
+	blockInfo = {"name": targetName, "transformName": targetData.get("targetTransformName", targetName), "poses": [poseIndices[p] for p in poseNames], "channels": channelCount}
+	if len(set(customLengths)) > 1: blockInfo["customLengths"] = customLengths
+
+	#return; dict (block info), array (values)
+	return blockInfo, values
+
+def unpackTargetData(blockInfo, values, poseNames):
+	"""Unpack a target block back into the legacy target data dict structure.
+	"""
+
+	channelCount = blockInfo["channels"]
+	customLengths = blockInfo.get("customLengths", [channelCount - FMD_TRANSFORM_CHANNELS] * len(blockInfo["poses"]))
+
+	targetPoses = {}
+	for k, poseIndex in enumerate(blockInfo["poses"]):
+		poseValues = values[k * channelCount:(k + 1) * channelCount]
+		poseName = poseNames[poseIndex]
+		targetPoses[poseName] = {"targetPoseName": poseName,
+									"poseTranslate": tuple(poseValues[0:3]),
+									"poseRotate": tuple(poseValues[3:6]),
+									"poseScale": tuple(poseValues[6:9]),
+									"poseCustomAttributes": list(poseValues[FMD_TRANSFORM_CHANNELS:FMD_TRANSFORM_CHANNELS + customLengths[k]])}
+
+	#return; dict (target data)
+	return {"targetTransformName": blockInfo["transformName"], "targetPoses": targetPoses}
+
+def getJsonSafeSourceData(sourceData = {}):
+	returnData = {}
+	for poseName in sourceData:
+		returnData[poseName] = dict((key, float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else str(value)) for key, value in sourceData[poseName].items())
+
+	#return; dict (source data)
+	return returnData
+
+def writeFMDFile(filePath = "", fmData = {}):
+	"""Write the given facial mocap data (as collected by facialMocapUtils- sourceData, targetData and definitionName) into an .mnsFMD file.
+	"""
+
+	targetData = fmData.get("targetData", {})
+	poseNames = []
+	for targetName in targetData:
+		for poseName in targetData[targetName].get("targetPoses", {}):
+			if not poseName in poseNames: poseNames.append(poseName)
+	poseIndices = dict((poseName, k) for k, poseName in enumerate(poseNames))
+
+	blocks, blockValues = [], []
+	offset = 0
+	for targetName in targetData:
+		blockInfo, values = packTargetData(targetName, targetData[targetName], poseIndices)
+		blockInfo["offset"] = offset
+		offset += len(values) * values.itemsize
+		blocks.append(blockInfo)
+		blockValues.append(values)
+
+	header = {"schema": "mnsFMD", "version": FMD_VERSION, "byteOrder": "little", "valueType": "float64", "definitionName": fmData.get("definitionName", ""),
+				"sourceData": getJsonSafeSourceData(fmData.get("sourceData", {})), "poses": poseNames, "targets": blocks}
+	headerBytes = json.dumps(header).encode("utf-8")
+
+	with open(filePath, "wb") as f:
+		f.write(FMD_MAGIC)
+		f.write(struct.pack("<HI", FMD_VERSION, len(headerBytes)))
+		f.write(headerBytes)
+		for values in blockValues:
+			if sys.byteorder == "big": values.byteswap()
+			values.tofile(f)
+
+def readFMDHeader(fileHandle):
+	fileHandle.seek(0)
+	if fileHandle.read(len(FMD_MAGIC)) != FMD_MAGIC: raise ValueError("Not an mnsFMD file.")
+	version, headerLength = struct.unpack("<HI", fileHandle.read(6))
+	if version > FMD_VERSION: raise ValueError("Unsupported mnsFMD version- " + str(version) + ".")
+	header = json.loads(fileHandle.read(headerLength).decode("utf-8"))
+	header["dataStart"] = len(FMD_MAGIC) + 6 + headerLength
+
+	#return; dict (header)
+	return header
+
+def readFMDFile(filePath = "", **kwargs):
+	"""Read an .mnsFMD file (or a legacy pickled file) into the facial mocap data dict structure- sourceData, targetData and definitionName.
+	"""
+
+	sources = kwargs.get("sources", True) #arg; comment = load the source data
+	targets = kwargs.get("targets", None) #arg; comment = target names to load. Pass an empty list to skip all targets. Default to all targets.
+
+	if isLegacyFMDFile(filePath):
+		fmData = loadLegacyFMDFile(filePath)
+		if not sources: fmData["sourceData"] = {}
+		if targets is not None: fmData["targetData"] = dict((t, fmData["targetData"][t]) for t in fmData.get("targetData", {}) if t in targets)
+		fmData["version"] = 1
+		return fmData
+
+	fmData = {"definitionName": "", "sourceData": {}, "targetData": {}}
+	with open(filePath, "rb") as f:
+		header = readFMDHeader(f)
+		fmData["definitionName"] = header["definitionName"]
+		fmData["version"] = header["version"]
+		if sources: fmData["sourceData"] = header["sourceData"]
+
+		for blockInfo in header["targets"]:
+			if targets is not None and not blockInfo["name"] in targets: continue
+
+			values = array.array("d")
+			f.seek(header["dataStart"] + blockInfo["offset"])
+			values.fromfile(f, len(blockInfo["poses"]) * blockInfo["channels"])
+			if sys.byteorder == "big": values.byteswap()
+			fmData["targetData"][blockInfo["name"]] = unpackTargetData(blockInfo, values, header["poses"])
+
+	#return; dict (facial mocap data)
+	return fmData
+
+def getFMDFileInfo(filePath = ""):
+	"""Read the file's header only- definition name, version, source names and target names.
+	"""
+
+	if isLegacyFMDFile(filePath):
+		fmData = readFMDFile(filePath)
+		return {"definitionName": fmData.get("definitionName", ""), "version": 1, "sources": list(fmData.get("sourceData", {}).keys()), "targets": list(fmData.get("targetData", {}).keys())}
+
+	with open(filePath, "rb") as f: header = readFMDHeader(f)
+
+	#return; dict (file info)
+	return {"definitionName": header["definitionName"], "version": header["version"], "sources": list(header["sourceData"].keys()), "targets": [b["name"] for b in header["targets"]]}
+
+def createBenchmarkFMData(targetCount = 150, poseCount = 52, customCount = 2):
+	"""Create a synthetic facial mocap definition of the given size, for benchmarking.
+	"""
+
+	poseNames = ["pose" + str(k) for k in range(poseCount)]
+	sourceData = dict((p, {"poseName": p, "inputAttrPoseName": p, "inputAttrName": "source." + p, "poseWeight": 1.0, "poseMinimum": 0.0, "poseMaximum": 1.0}) for p in poseNames)
+	targetData = {}
+	for t in range(targetCount):
+		targetName = "target" + str(t) + "_ctrl"
+		targetData[targetName] = {"targetTransformName": targetName, "targetPoses": dict((p, {"targetPoseName": p,
+																							"poseTranslate": tuple(random.random() for k in range(3)),
+																							"poseRotate": tuple(random.random() * 90.0 for k in range(3)),
+																							"poseScale": tuple(1.0 + random.random() * 0.1 for k in range(3)),
+																							"poseCustomAttributes": [random.random() for k in range(customCount)]}) for p in poseNames)}
+
+	#return; dict (facial mocap data)
+	return {"definitionName": "benchmark_pb", "sourceData": sourceData, "targetData": targetData}
+
+class MnsBenchmarkVector(tuple):
+	"""Pickles as pymel.core.datatypes.Vector- the type legacy files hold the pose translate, rotate and scale values as.
+	"""
+
+	def __reduce__(self):
+		return (MnsBenchmarkVector, (tuple(self),))
+
+def getLegacyBenchmarkData(fmData = {}):
+	"""Convert the synthetic data into the legacy layout, with the pose transform values held as PyMel vectors (or stand-ins, when PyMel isn't loaded).
+	"""
+
+	vectorType = getattr(sys.modules.get("pymel.core.datatypes", None), "Vector", None)
+	if vectorType is None:
+		MnsBenchmarkVector.__module__ = "pymel.core.datatypes"
+		MnsBenchmarkVector.__name__ = MnsBenchmarkVector.__qualname__ = "Vector"
+		vectorType = MnsBenchmarkVector
+
+	legacyData = dict(fmData)
+	legacyData["targetData"] = {}
+	for targetName, targetData in fmData["targetData"].items():
+		targetPoses = {}
+		for poseName, poseData in targetData["targetPoses"].items():
+			targetPoses[poseName] = dict(poseData)
+			for channel in ["poseTranslate", "poseRotate", "poseScale"]: targetPoses[poseName][channel] = vectorType(poseData[channel])
+		legacyData["targetData"][targetName] = {"targetTransformName": targetData["targetTransformName"], "targetPoses": targetPoses}
+
+	#return; dict (legacy facial mocap data), type (vector type)
+	return legacyData, vectorType
+
+def dumpLegacyBenchmarkData(filePath, legacyData, vectorType):
+	#the stand-in vector type is registered under the pymel module path only while pickling
+	fakeModules = []
+	if vectorType is MnsBenchmarkVector:
+		import types
+		for moduleName in ["pymel", "pymel.core", "pymel.core.datatypes"]:
+			if not moduleName in sys.modules:
+				sys.modules[moduleName] = types.ModuleType(moduleName)
+				fakeModules.append(moduleName)
+		sys.modules["pymel.core.datatypes"].Vector = MnsBenchmarkVector
+
+	try:
+		with open(filePath, "wb") as f: pickle.dump(legacyData, f, pickle.HIGHEST_PROTOCOL)
+	finally:
+		for moduleName in fakeModules: del sys.modules[moduleName]
+
+def benchmarkFMDFormat(targetCount = 150, poseCount = 52, customCount = 2, iterations = 5):
+	"""Benchmark the .mnsFMD format against the legacy pickle format, for a synthetic definition of the given size.
+	The legacy files hold the pose transform values as (pickled) PyMel vectors, as exported by the legacy exportPBData.
+	Returns the file sizes and the average export, full import and partial (sources only) import times.
+	"""
+
+	fmData = createBenchmarkFMData(targetCount, poseCount, customCount)
+	legacyData, vectorType = getLegacyBenchmarkData(fmData)
+	tempDir = tempfile.mkdtemp(prefix = "mnsFMDBenchmark_")
+	legacyPath, fmdPath = os.path.join(tempDir, "legacy.mnsFMD"), os.path.join(tempDir, "packed.mnsFMD")
+
+	def timeIt(method):
+		startTime = time.time()
+		for k in range(iterations): method()
+		return (time.time() - startTime) / iterations
+
+	def writeLegacy():
+		dumpLegacyBenchmarkData(legacyPath, legacyData, vectorType)
+
+	results = {"targets": targetCount, "poses": poseCount, "customAttributes": customCount,
+				"legacyExport": timeIt(writeLegacy),
+				"fmdExport": timeIt(lambda: writeFMDFile(fmdPath, fmData)),
+				"legacyImport": timeIt(lambda: readFMDFile(legacyPath)),
+				"fmdImport": timeIt(lambda: readFMDFile(fmdPath)),
+				"fmdSourcesOnlyImport": timeIt(lambda: readFMDFile(fmdPath, targets = [])),
+				"legacySize": os.path.getsize(legacyPath),
+				"fmdSize": os.path.getsize(fmdPath)}
+
+	for filePath in [legacyPath, fmdPath]: os.remove(filePath)
+	os.rmdir(tempDir)
+
+	#return; dict (benchmark results)
+	return results
+
+if __name__ == "__main__":
+	for benchmarkSize in [(50, 52, 0), (150, 52, 2), (500, 100, 4)]:
+		print(benchmarkFMDFormat(*benchmarkSize))
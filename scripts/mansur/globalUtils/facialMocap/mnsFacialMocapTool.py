@@ -130,6 +130,10 @@ class MnsFacialMocapTool(form_class, base_class):
 		deleteAction.setIcon(QtGui.QIcon(QtGui.QPixmap(GLOB_guiIconsDir + "/mayaResource/deleteClip.png")))
 		deleteAction.triggered.connect(self.deletePbNode)
 
+		bakeAction = menu.addAction(self.tr("Bake Offline (Playback Range)"))
+		bakeAction.setIcon(QtGui.QIcon(QtGui.QPixmap(GLOB_guiIconsDir + "/mayaResource/bakeAnimation.png")))
+		bakeAction.triggered.connect(self.bakePbNodeOffline)
+
 		menu.exec_(currentLstWidget.viewport().mapToGlobal(position))
 
 	def sourceAttrsMenu(self, position):
@@ -151,6 +155,10 @@ class MnsFacialMocapTool(form_class, base_class):
 		clearAction = menu.addAction(self.tr("Clear"))  
 		clearAction.triggered.connect(lambda: self.removeSelectedSourceAttrs(mode = 1))
 
+		importTakeAction = menu.addAction(self.tr("Import Mocap Take (CSV/JSON)"))
+		importTakeAction.setIcon(QtGui.QIcon(QtGui.QPixmap(GLOB_guiIconsDir + "/mayaResource/autoKeyframe.png")))
+		importTakeAction.triggered.connect(lambda: mnsFacialMocapUtils.importMocapTakeFromFile(self.getSelectedPbNode()))
+
 		menu.exec_(currentLstWidget.viewport().mapToGlobal(position))
 
 	def createMenu(self, position):
@@ -583,6 +591,13 @@ class MnsFacialMocapTool(form_class, base_class):
 				pm.delete(currentSelectedPBNode)
 				self.initializeView()
 
+	def bakePbNodeOffline(self):
+		currentSelectedPBNode = self.getSelectedPbNode()
+		if currentSelectedPBNode:
+			reply = QtWidgets.QMessageBox.question(None, 'Are you sure?', "This action will disconnect the selected poseBlend Node's outputs, and bake its result into the target transforms over the playback range.<br>Are you sure you want to continue?", QtWidgets.QMessageBox.Yes, QtWidgets.QMessageBox.No)
+			if reply == QtWidgets.QMessageBox.Yes:
+				mnsFacialMocapUtils.bakePbNodeOffline(currentSelectedPBNode, int(pm.playbackOptions(q = True, min = True)), int(pm.playbackOptions(q = True, max = True)))
+
 	#sources list
 	def getSelectedSourceAttrs(self):
 		selectedItems = self.sourceAttrs_lst.selectedItems()
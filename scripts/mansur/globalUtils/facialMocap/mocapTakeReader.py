@@ -0,0 +1,145 @@
+"""=== Author: Assaf Ben Zur ===
+Streaming facial mocap take reader.
+This module reads facial mocap takes (i.e. Live Link Face / ARKit CSV exports) sample by sample, and resamples them to a target frame rate, without holding the whole take in memory.
+Supported formats:
+	.csv- A header row, followed by a row per sample. The sample time is read from a "Timecode" (HH:MM:SS:FF[.sub]), "Time" (seconds) or "Frame" column, or from the row index.
+	.jsonl/.ndjson- A JSON object per line, keyed by column names. The sample time is read from the same keys as in CSV.
+	.json- A list of JSON objects as above, or a dict with a "frames" list (and optional "fps"). These are loaded as a whole, hence aren't memory bounded.
+This module doesn't depend on Maya.
+"""
+
+#global dependencies
+import os, csv, json
+
+timecodeColumnNames = ["timecode"]
+timeColumnNames = ["time", "timestamp", "seconds"]
+frameColumnNames = ["frame", "frames"]
+
+def parseTimecode(timecode = "", fps = 60.0):
+	"""Convert an HH:MM:SS:FF[.sub] timecode string into seconds.
+	"""
+
+	tokens = str(timecode).strip().replace(";", ":").split(":")
+	if len(tokens) != 4: return float(timecode)
+
+	#return; float (seconds)
+	return int(tokens[0]) * 3600.0 + int(tokens[1]) * 60.0 + int(tokens[2]) + float(tokens[3]) / fps
+
+def getTimeColumn(columns = []):
+	"""Return the time column name and its type ("timecode", "time", "frame") from the given columns, or (None, None) if there is no time column.
+	"""
+
+	for columnType, names in [("timecode", timecodeColumnNames), ("time", timeColumnNames), ("frame", frameColumnNames)]:
+		for column in columns:
+			if column.strip().lower() in names: return column, columnType
+
+	#return; string (column name), string (column type)
+	return None, None
+
+def getSampleTime(value, columnType = None, sampleIndex = 0, fps = 60.0):
+	if columnType == "timecode": return parseTimecode(value, fps)
+	elif columnType == "time": return float(value)
+	elif columnType == "frame": return float(value) / fps
+
+	#return; float (seconds)
+	return sampleIndex / float(fps)
+
+def toFloat(value, default = 0.0):
+	try: return float(value)
+	except (TypeError, ValueError): return default
+
+def iterRecords(filePath = ""):
+	"""Yield the take's records as {column: value} dicts, one by one.
+	"""
+
+	extension = os.path.splitext(filePath)[-1].lower()
+	if extension == ".csv":
+		with open(filePath, "r") as f:
+			for record in csv.DictReader(f):
+				yield record
+	elif extension in [".jsonl", ".ndjson"]:
+		with open(filePath, "r") as f:
+			for line in f:
+				line = line.strip()
+				if line: yield json.loads(line)
+	elif extension == ".json":
+		with open(filePath, "r") as f: data = json.load(f)
+		for record in (data.get("frames", []) if isinstance(data, dict) else data):
+			yield record
+
+def getTakeInfo(filePath = ""):
+	"""Read the take's header (first record only), returning its value columns, time column and frame-rate (when stored in a JSON take).
+	"""
+
+	info = {"columns": [], "timeColumn": None, "timeColumnType": None, "fps": None}
+	extension = os.path.splitext(filePath)[-1].lower()
+	if extension == ".json":
+		with open(filePath, "r") as f: data = json.load(f)
+		if isinstance(data, dict): info["fps"] = data.get("fps", None)
+
+	for record in iterRecords(filePath):
+		info["timeColumn"], info["timeColumnType"] = getTimeColumn(list(record.keys()))
+		info["columns"] = [c for c in record.keys() if c != info["timeColumn"]]
+		break
+
+	#return; dict (take info)
+	return info
+
+def iterSamples(filePath = "", columns = [], **kwargs):
+	"""Yield (time (seconds, relative to the first sample), values) tuples for the given columns, one sample at a time.
+	Missing or invalid values hold the previous sample's value.
+	"""
+
+	sourceFps = kwargs.get("sourceFps", 60.0) #arg; comment = the take's frame-rate, used for timecode and frame columns, and for takes without a time column
+
+	info = getTakeInfo(filePath)
+	sourceFps = float(info["fps"] or sourceFps)
+	previousValues = [0.0] * len(columns)
+	startTime = None
+
+	for sampleIndex, record in enumerate(iterRecords(filePath)):
+		sampleTime = getSampleTime(record.get(info["timeColumn"], None), info["timeColumnType"], sampleIndex, sourceFps)
+		if startTime is None: startTime = sampleTime
+
+		values = [toFloat(record.get(column, None), previousValues[k]) for k, column in enumerate(columns)]
+		previousValues = values
+		yield sampleTime - startTime, values
+
+def iterResampled(samples, targetFps = 30.0):
+	"""Resample a (time, values) samples stream to the target frame-rate, using linear interpolation.
+	Yields (frame index (relative to the first sample), values) tuples.
+	"""
+
+	previous = None
+	frameIndex = 0
+	for sampleTime, values in samples:
+		if previous and sampleTime <= previous[0]: continue
+
+		while frameIndex / float(targetFps) <= sampleTime + 0.000001:
+			frameTime = frameIndex / float(targetFps)
+			if previous is None or frameTime <= previous[0]:
+				yield frameIndex, list(values if previous is None else previous[1])
+			else:
+				blend = min((frameTime - previous[0]) / (sampleTime - previous[0]), 1.0)
+				yield frameIndex, [previous[1][k] + (v - previous[1][k]) * blend for k, v in enumerate(values)]
+			frameIndex += 1
+
+		previous = (sampleTime, values)
+
+def iterChunks(resampled, chunkSize = 5000):
+	"""Group a resampled stream into chunks of up to chunkSize frames.
+	Yields (frame indices, [values per frame for each column]) tuples.
+	"""
+
+	frames = []
+	channels = None
+	for frameIndex, values in resampled:
+		if channels is None: channels = [[] for k in range(len(values))]
+		frames.append(frameIndex)
+		for k, value in enumerate(values): channels[k].append(value)
+
+		if len(frames) >= chunkSize:
+			yield frames, channels
+			frames, channels = [], [[] for k in range(len(values))]
+
+	if frames: yield frames, channels
@@ -0,0 +1,130 @@
+"""=== Author: Assaf Ben Zur ===
+Offline pose-blend evaluator.
+This module evaluates a mnsPoseBlend definition outside of the DG, based on the definition data collected by facialMocapUtils (collectInputDataFromPbNode and collectTargetDataFromPbNode, or an FMD file).
+Every pose is stored as a delta from the target transforms' rest values, and the output per frame is the rest values, plus the sum of all pose deltas, multiplied by the pose weights.
+A pose weight is the source value, normalized between the pose minimum and maximum (clamped), multiplied by the pose weight.
+This module doesn't depend on Maya, and uses numpy when available.
+"""
+
+#global dependencies
+import array
+
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+transformChannelNames = ["translateX", "translateY", "translateZ", "rotateX", "rotateY", "rotateZ", "scaleX", "scaleY", "scaleZ"]
+transformRestValues = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0]
+
+def buildEvaluatorDefinition(sourceData = {}, targetData = {}, **kwargs):
+	"""Build an evaluator definition from the given pose-blend source data and target data.
+	The definition holds a flat channel layout for all targets, the rest values per channel, and a (poses x channels) delta table.
+	"""
+
+	targets = kwargs.get("targets", None) #arg; comment = targets to evaluate, in order. Default to all targets in targetData.
+	customAttrNames = kwargs.get("customAttrNames", {}) #arg; comment = {targetName: [custom attribute names]}. Custom attribute channels are named by their index otherwise.
+	customRestValues = kwargs.get("customRestValues", {}) #arg; comment = {targetName: [custom attribute default values]}. Custom attribute channels rest at 0.0 otherwise.
+
+	definition = {"poses": [], "poseIndices": {}, "weights": [], "minimums": [], "maximums": [], "targets": [], "channels": [], "targetChannels": {}, "rest": array.array("d"), "deltas": []}
+
+	for poseName in sourceData:
+		definition["poseIndices"][poseName] = len(definition["poses"])
+		definition["poses"].append(poseName)
+		definition["weights"].append(float(sourceData[poseName].get("poseWeight", 1.0)))
+		definition["minimums"].append(float(sourceData[poseName].get("poseMinimum", 0.0)))
+		definition["maximums"].append(float(sourceData[poseName].get("poseMaximum", 1.0)))
+
+	#channel layout
+	targets = [t for t in (targets or targetData.keys()) if t in targetData]
+	for targetName in targets:
+		targetPoses = targetData[targetName].get("targetPoses", {})
+		customCount = max([0] + [len(targetPoses[p].get("poseCustomAttributes", [])) for p in targetPoses])
+		customNames = list(customAttrNames.get(targetName, []))[:customCount]
+		customNames += ["customAttribute" + str(k) for k in range(len(customNames), customCount)]
+
+		definition["targets"].append(targetName)
+		definition["targetChannels"][targetName] = list(range(len(definition["channels"]), len(definition["channels"]) + len(transformChannelNames) + customCount))
+		definition["channels"] += [(targetName, channelName) for channelName in transformChannelNames + customNames]
+		customRest = [float(v) for v in list(customRestValues.get(targetName, []))[:customCount]]
+		definition["rest"].extend(transformRestValues + customRest + [0.0] * (customCount - len(customRest)))
+
+	#pose deltas
+	for poseName in definition["poses"]:
+		deltas = array.array("d", [0.0] * len(definition["channels"]))
+		for targetName in definition["targets"]:
+			poseData = targetData[targetName].get("targetPoses", {}).get(poseName, None)
+			if not poseData: continue
+
+			values = list(poseData["poseTranslate"]) + list(poseData["poseRotate"]) + list(poseData["poseScale"]) + list(poseData.get("poseCustomAttributes", []))
+			for k, channelIndex in enumerate(definition["targetChannels"][targetName]):
+				if k < len(values): deltas[channelIndex] = float(values[k]) - definition["rest"][channelIndex]
+		definition["deltas"].append(deltas)
+
+	#return; dict (evaluator definition)
+	return definition
+
+def getPoseWeight(value, weight = 1.0, minimum = 0.0, maximum = 1.0):
+	if maximum == minimum:
+		normalized = 1.0 if value >= maximum else 0.0
+	else:
+		normalized = min(max((value - minimum) / (maximum - minimum), 0.0), 1.0)
+
+	#return; float
+	return normalized * weight
+
+def getSourceFrameCount(sourceValues = {}):
+	#return; int (frame count)
+	return max([0] + [len(values) for values in sourceValues.values()])
+
+def evaluateFrames(definition = {}, sourceValues = {}):
+	"""Evaluate the definition for all frames of the given source values.
+	sourceValues is a dict of {poseName: sequence (value per frame)}. Missing poses are evaluated as 0.0.
+	Returns a (channels x frames) list of arrays, matching the definition's channel layout.
+	"""
+
+	frameCount = getSourceFrameCount(sourceValues)
+	channelCount = len(definition["channels"])
+	if not frameCount or not channelCount: return [array.array("d") for k in range(channelCount)]
+
+	if np is not None:
+		values = np.zeros((frameCount, len(definition["poses"])))
+		for poseName in sourceValues:
+			if poseName in definition["poseIndices"]: values[:len(sourceValues[poseName]), definition["poseIndices"][poseName]] = np.asarray(sourceValues[poseName], dtype = float)
+
+		minimums, maximums = np.array(definition["minimums"]), np.array(definition["maximums"])
+		ranges = maximums - minimums
+		normalized = np.where(ranges != 0.0, np.clip((values - minimums) / np.where(ranges != 0.0, ranges, 1.0), 0.0, 1.0), (values >= maximums).astype(float))
+		weights = normalized * np.array(definition["weights"])
+
+		deltas = np.array([list(d) for d in definition["deltas"]]).reshape(len(definition["poses"]), channelCount)
+		output = np.array(definition["rest"]) + weights.dot(deltas)
+
+		#return; list (array per channel)
+		return [array.array("d", output[:, k].tolist()) for k in range(channelCount)]
+
+	output = [array.array("d", [definition["rest"][k]] * frameCount) for k in range(channelCount)]
+	for poseIndex, poseName in enumerate(definition["poses"]):
+		deltas = definition["deltas"][poseIndex]
+		activeChannels = [k for k in range(channelCount) if deltas[k] != 0.0]
+		if not activeChannels: continue
+
+		#missing or short sources are evaluated as 0.0, matching the numpy path
+		poseValues = list(sourceValues.get(poseName, []))[:frameCount]
+		poseValues += [0.0] * (frameCount - len(poseValues))
+		for frameIndex, value in enumerate(poseValues):
+			weight = getPoseWeight(value, definition["weights"][poseIndex], definition["minimums"][poseIndex], definition["maximums"][poseIndex])
+			if not weight: continue
+			for k in activeChannels: output[k][frameIndex] += weight * deltas[k]
+
+	return output
+
+def evaluateFrame(definition = {}, poseValues = {}):
+	"""Evaluate the definition for a single frame.
+	poseValues is a dict of {poseName: value}.
+	"""
+
+	output = evaluateFrames(definition, dict((poseName, [poseValues[poseName]]) for poseName in poseValues))
+
+	#return; dict ((targetName, channelName): value)
+	return dict((definition["channels"][k], values[0] if values else definition["rest"][k]) for k, values in enumerate(output))
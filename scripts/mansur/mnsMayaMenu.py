@@ -20,8 +20,6 @@ else:
 	import shiboken2
 
 from .core import globals as mnsGlobals
-if mnsGlobals.GLOB_pyVer > 2:
-	from importlib import reload
 
 #Qt
 if int(cmds.about(version = True)) > 2024:
@@ -34,34 +32,26 @@ else:
 #internal
 from .core import UIUtils as mnsUIUtils
 from .core import utility as mnsUtils
-from .globalUtils.defSearch import defSearch as mnsDefSearch
-reload(mnsDefSearch)
-from .globalUtils import dynUI as mnsDynUI
-reload(mnsDynUI)
-from .preferences import preferences as mnsPrefs
-from .block.picker2 import picker2 as mnsPicker
-from .block.picker2 import plgSettings as mnsPlgSettings
-from .block import blockBuildUI as mnsBlkBuildUI
-from .block.moduleVisUI import moduleVisUI as mnsModuleVisUI
-reload(mnsModuleVisUI)
-from .block.cnsTool import cnsTool as mnsCnsTool
-reload(mnsCnsTool)
-from .block.volumeJointsUI import volumeJointsUI as mnsVolJntUI
-reload(mnsVolJntUI)
-from .block.LODsTool import LODsTool as mnsLODsTool
-reload(mnsLODsTool)
-from .block.characterDefenition import characterDefenitionUI as mnsCharDef
-reload(mnsCharDef)
-from .block.springTool import mnsSpringTool
-reload(mnsSpringTool)
-from .block.spacesTool import mnsSpacesTool
-reload(mnsSpacesTool)
-from .globalUtils.facialMocap import mnsFacialMocapTool
-reload(mnsFacialMocapTool)
-from .globalUtils.animationExporter import mnsAnimationExporter as mnsAnimExporter
-reload(mnsAnimExporter)
-from .globalUtils.jointRadiusTool import mnsJointRadiusTool
-reload(mnsJointRadiusTool)
+from .core import lazyLoader as mnsLazyLoader
+
+#tools- loaded upon first use
+def mnsLazy(moduleName):
+	#return; MnsLazyModule
+	return mnsLazyLoader.MnsLazyModule(__name__.rsplit(".", 1)[0] + "." + moduleName, mnsGlobals.GLOB_mnsDevMode)
+
+mnsDefSearch = mnsLazy("globalUtils.defSearch.defSearch")
+mnsPrefs = mnsLazy("preferences.preferences")
+mnsPicker = mnsLazy("block.picker2.picker2")
+mnsBlkBuildUI = mnsLazy("block.blockBuildUI")
+mnsModuleVisUI = mnsLazy("block.moduleVisUI.moduleVisUI")
+mnsCnsTool = mnsLazy("block.cnsTool.cnsTool")
+mnsVolJntUI = mnsLazy("block.volumeJointsUI.volumeJointsUI")
+mnsLODsTool = mnsLazy("block.LODsTool.LODsTool")
+mnsSpringTool = mnsLazy("block.springTool.mnsSpringTool")
+mnsSpacesTool = mnsLazy("block.spacesTool.mnsSpacesTool")
+mnsFacialMocapTool = mnsLazy("globalUtils.facialMocap.mnsFacialMocapTool")
+mnsAnimExporter = mnsLazy("globalUtils.animationExporter.mnsAnimationExporter")
+mnsJointRadiusTool = mnsLazy("globalUtils.jointRadiusTool.mnsJointRadiusTool")
 
 #Qt
 if int(cmds.about(version = True)) > 2024:
@@ -91,7 +81,7 @@ def createMenuItems(menuWidget = None, parentWid = mnsUIUtils.get_maya_window())
 	if menuWidget and parentWid:
 		action = menuWidget.addAction(parentWid.tr("Block Builder"))
 		action.setIcon(QtGui.QIcon(QtGui.QPixmap(mnsGlobals.GLOB_guiIconsDir + "/logo/block_t5_noText.png")))
-		action.triggered.connect(mnsBlkBuildUI.loadBlock)
+		action.triggered.connect(mnsBlkBuildUI.mnsDeferredCall("loadBlock"))
 
 		######   block tools   #########
 		menuWidget.addSeparator()
@@ -101,23 +91,23 @@ def createMenuItems(menuWidget = None, parentWid = mnsUIUtils.get_maya_window())
 
 		action = blockMenu.addAction(parentWid.tr("Volume Joints UI"))
 		action.setIcon(QtGui.QIcon(QtGui.QPixmap(mnsGlobals.GLOB_guiIconsDir + "/menu/volJointsUI.png")))
-		action.triggered.connect(mnsVolJntUI.loadVolumeJointsUI)
+		action.triggered.connect(mnsVolJntUI.mnsDeferredCall("loadVolumeJointsUI"))
 
 		action = blockMenu.addAction(parentWid.tr("LODs Tool"))
 		action.setIcon(QtGui.QIcon(QtGui.QPixmap(mnsGlobals.GLOB_guiIconsDir + "/menu/lodsToolIcon.png")))
-		action.triggered.connect(mnsLODsTool.loadLodsTool)
+		action.triggered.connect(mnsLODsTool.mnsDeferredCall("loadLodsTool"))
 
 		action = blockMenu.addAction(parentWid.tr("Dynamic UI Creator"))
 		action.setIcon(QtGui.QIcon(QtGui.QPixmap(mnsGlobals.GLOB_guiIconsDir + "/menu/defSearchIcon.png")))
-		action.triggered.connect(mnsDefSearch.loadDefSearch)
+		action.triggered.connect(mnsDefSearch.mnsDeferredCall("loadDefSearch"))
 
 		action = blockMenu.addAction(parentWid.tr("Joint Radius"))
 		action.setIcon(QtGui.QIcon(QtGui.QPixmap(mnsGlobals.GLOB_guiIconsDir + "/menu/jointRadiusIcon.png")))
-		action.triggered.connect(mnsJointRadiusTool.loadJointRadiusTool)
+		action.triggered.connect(mnsJointRadiusTool.mnsDeferredCall("loadJointRadiusTool"))
 
 		action = blockMenu.addAction(parentWid.tr("Preferences"))
 		action.setIcon(QtGui.QIcon(QtGui.QPixmap(mnsGlobals.GLOB_guiIconsDir + "/menu/preferences.png")))
-		action.triggered.connect(mnsPrefs.loadPreferences)
+		action.triggered.connect(mnsPrefs.mnsDeferredCall("loadPreferences"))
 
 		action = blockMenu.addAction(parentWid.tr("Reload Block"))
 		action.setIcon(QtGui.QIcon(QtGui.QPixmap(mnsGlobals.GLOB_guiIconsDir + "/menu/direction.png")))
@@ -131,31 +121,31 @@ def createMenuItems(menuWidget = None, parentWid = mnsUIUtils.get_maya_window())
 
 		action = animMenu.addAction(parentWid.tr("Picker"))
 		action.setIcon(QtGui.QIcon(QtGui.QPixmap(mnsGlobals.GLOB_guiIconsDir + "/menu/pickerIcon.png")))
-		action.triggered.connect(mnsPicker.loadPicker)
+		action.triggered.connect(mnsPicker.mnsDeferredCall("loadPicker"))
 
 		action = animMenu.addAction(parentWid.tr("Control Visibility UI"))
 		action.setIcon(QtGui.QIcon(QtGui.QPixmap(mnsGlobals.GLOB_guiIconsDir + "/menu/moduleVisUI.png")))
-		action.triggered.connect(mnsModuleVisUI.loadModuleVisUI)
+		action.triggered.connect(mnsModuleVisUI.mnsDeferredCall("loadModuleVisUI"))
 
 		action = animMenu.addAction(parentWid.tr("CNS Tool"))
 		action.setIcon(QtGui.QIcon(QtGui.QPixmap(mnsGlobals.GLOB_guiIconsDir + "/menu/cnsTool.png")))
-		action.triggered.connect(mnsCnsTool.loadCnsTool)
+		action.triggered.connect(mnsCnsTool.mnsDeferredCall("loadCnsTool"))
 
 		action = animMenu.addAction(parentWid.tr("Spring Tool"))
 		action.setIcon(QtGui.QIcon(QtGui.QPixmap(mnsGlobals.GLOB_guiIconsDir + "/menu/springToolIcon.png")))
-		action.triggered.connect(mnsSpringTool.loadSpringTool)
+		action.triggered.connect(mnsSpringTool.mnsDeferredCall("loadSpringTool"))
 
 		action = animMenu.addAction(parentWid.tr("Spaces/IK-FK Tool"))
 		action.setIcon(QtGui.QIcon(QtGui.QPixmap(mnsGlobals.GLOB_guiIconsDir + "/menu/spacesToolIcon.png")))
-		action.triggered.connect(mnsSpacesTool.loadSpacesTool)
+		action.triggered.connect(mnsSpacesTool.mnsDeferredCall("loadSpacesTool"))
 
 		action = animMenu.addAction(parentWid.tr("Facial Mocap Tool (Beta)"))
 		action.setIcon(QtGui.QIcon(QtGui.QPixmap(mnsGlobals.GLOB_guiIconsDir + "/menu/facial-recognition.png")))
-		action.triggered.connect(mnsFacialMocapTool.loadFacialMocapTool)
+		action.triggered.connect(mnsFacialMocapTool.mnsDeferredCall("loadFacialMocapTool"))
 
 		action = animMenu.addAction(parentWid.tr("Game Exporter"))
 		action.setIcon(QtGui.QIcon(QtGui.QPixmap(mnsGlobals.GLOB_guiIconsDir + "/menu/gameExporter.png")))
-		action.triggered.connect(mnsAnimExporter.loadAnimationExporter)
+		action.triggered.connect(mnsAnimExporter.mnsDeferredCall("loadAnimationExporter"))
 
 		######   About   #########
 		menuWidget.addSeparator()
@@ -247,7 +237,7 @@ class mnsMayaQtWindow(QtWidgets.QMainWindow):
 		#add title
 		createLogoTitle(self.menuObj, self)
 		createMenuItems(self.menuObj, self)
-		mnsUtils.reloadLib()
+		if mnsGlobals.GLOB_mnsDevMode: mnsUtils.reloadLib()
 
 	def eventFilter(self, source, event):
 		"""Override event filter to catch the tear off to override it's event.
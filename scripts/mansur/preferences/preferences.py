@@ -6,7 +6,7 @@ Handeling is semi-procedural, drawing and retreiving all setting procedurally, a
 """
 
 #global dependencies
-import os, datetime, time, inspect, json
+import os, datetime, time, inspect
 
 
 from maya import cmds
@@ -151,12 +151,9 @@ class MnsPreferences(form_class, base_class):
 
 	def saveSetting(self):
 		if self.currentPrefs:
-			settingsFile = mnsUtils.getMansurPrefsFromFile(returnFileDirectory = True)
-			with open(settingsFile , 'w') as outfile:  
-				json.dump(self.currentPrefs, outfile)
-				mnsUtils.updateMansurPrefs()
-				mnsUIUtils.readGuiStyle()
-				pm.confirmDialog( title='Settings saved.', message="Settings saved successfully!", defaultButton='OK')
+			mnsUtils.updateMansurPrefs(self.currentPrefs)
+			mnsUIUtils.readGuiStyle()
+			pm.confirmDialog( title='Settings saved.', message="Settings saved successfully!", defaultButton='OK')
 
 	def restoreDefaults(self):
 		reply = QtWidgets.QMessageBox.question(self, 'Factory Defaults Restore', 'Are you sure you want to resote all defaults?', QtWidgets.QMessageBox.Yes, QtWidgets.QMessageBox.No)